@@ -0,0 +1,73 @@
+"""
+Times GDocDataParser.ingest_team_dataframe on a synthetic drop log.
+
+    python scripts/bench_gdoc_ingest.py --rows 100000 --repeat 5
+
+Rows mix item names that hit every catalog category (pets, jars, mega rares, drop
+exclusions) with plain drops, and player names in two spellings, so the
+normalization and classification paths are exercised as on a real sheet. Prints the
+best and median ingest time and a hash of the resulting hunt_metrics.json, so runs
+before and after a change can be compared for identical output.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "hunt_stats"))
+
+import pandas as pd
+from parsers.GDoc.GDocDataParser import GDocDataParser
+
+ITEMS = ["Dragon bones", "Pet snakeling", "Jar", "jar of dirt", "Twisted bow", "Bounty Daily", "Challenge 3",
+         "Abyssal whip", "Tumeken's shadow", "Scythe of Vitur (uncharged)", "Elder maul", "Kodai insignia",
+         "Petal garland", "Rune, full helm"]
+PLAYERS = [f"Player {i}" for i in range(300)] + [f"player_{i}" for i in range(0, 300, 7)]
+POINTS = [0, 0.5, 1, 2.5, 10, 0.1, 0.3]
+
+
+def make_drop_log(rows: int, seed: int) -> pd.DataFrame:
+    """A team block as it comes off the sheet, before clean_team_dataframe."""
+    rng = random.Random(seed)
+    return pd.DataFrame(
+        [
+            ["Boss", rng.choice(ITEMS), rng.choice(PLAYERS),
+             f"{rng.randint(0, 5_000_000):,}" if rng.random() > 0.05 else "",
+             str(rng.choice(POINTS + [rng.random() * 20]))]
+            for _ in range(rows)
+        ],
+        columns=["Content", "Item", "Player", "Coins", "Points"],
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    df = make_drop_log(args.rows, args.seed)
+    timings = []
+    # GDocDataParser creates its hunt directory; keep it out of the real data directory
+    with tempfile.TemporaryDirectory() as base_dir:
+        for _ in range(args.repeat):
+            parser = GDocDataParser(gdoc=None, hunt_edition="bench", base_dir=base_dir)
+            clean = parser.clean_team_dataframe(df)
+            start = time.perf_counter()
+            parser.ingest_team_dataframe(clean, "Team Red")
+            timings.append(time.perf_counter() - start)
+
+    output = json.dumps(parser.build_metrics().to_json(parser.name_index.display_name))
+    print(f"ingest_team_dataframe, {args.rows:,} rows, {args.repeat} runs: "
+          f"best {min(timings) * 1000:.0f} ms, median {statistics.median(timings) * 1000:.0f} ms")
+    print(f"output sha256 {hashlib.sha256(output.encode()).hexdigest()[:16]}")
+
+
+if __name__ == "__main__":
+    main()
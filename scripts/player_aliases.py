@@ -0,0 +1,45 @@
+"""
+Reviews the fuzzy name matches WOMDataParser keeps as pending for a hunt.
+
+    python scripts/player_aliases.py 14                      # list pending matches
+    python scripts/player_aliases.py 14 --confirm "air xirn"
+    python scripts/player_aliases.py 14 --confirm-all
+    python scripts/player_aliases.py 14 --reject "air xirn"
+
+A confirmed match becomes an alias in the hunt's player_index.json, so later runs
+resolve the sheet name to its WOM player exactly. A rejected one is never applied
+again.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "hunt_stats"))
+
+from HuntPaths import hunt_dir
+from PlayerNameIndex import PlayerNameIndex
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("hunt_edition")
+    arg_parser.add_argument("--confirm", action="append", default=[], metavar="NAME")
+    arg_parser.add_argument("--confirm-all", action="store_true")
+    arg_parser.add_argument("--reject", action="append", default=[], metavar="NAME")
+    args = arg_parser.parse_args()
+
+    index = PlayerNameIndex.load(str(hunt_dir(args.hunt_edition) / "player_index.json"))
+    confirm = list(index.pending) if args.confirm_all else args.confirm
+    for name in confirm:
+        print(f"Confirmed '{name}' -> '{index.confirm_alias(name)}'")
+    for name in args.reject:
+        index.reject_alias(name)
+        print(f"Rejected the match for '{name}'")
+    index.save()
+
+    for name, proposal in sorted(index.pending.items(), key=lambda item: -item[1]["score"]):
+        print(f"Pending: '{name}' -> '{proposal['match']}' ({proposal['score']:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,6 @@
 import logging
-import discord
 import pandas as pd
 from typing import Dict
-import logging
 from discord.ext.commands import Bot
 from src.hunt_stats.parsers.GDoc.GDocDataRetriever import GDocDataRetriever
 import json
@@ -11,7 +9,6 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 '''
-TODO - add logic to make channel creation idempotent
 TODO - write channel and role IDs created to the config dict and file
 TODO - write channel cleanup logic
 TODO - write role cleanup logic
@@ -91,71 +88,6 @@ class BingoConfigParser:
             self.voice_channels.append(f"{self.team_name_prefix}-{name}-voice")
             self.roles.append(f"{self.team_name_prefix}-{name}")
 
-    async def create_text_channel(self, channel_name: str) -> None:
-        # Create the text channel
-        guild = self.discord_bot.guilds[0]
-        channel_name = f"{self.team_name_prefix}-{channel_name}"
-        await guild.create_text_channel(name=channel_name)
-
-    async def create_voice_channel(self, channel_name: str) -> None:
-        guild = self.discord_bot.guilds[0]
-        channel_name = f"{self.team_name_prefix}-{channel_name}"
-        await guild.create_voice_channel(name=channel_name)
-    
-    async def create_role_with_color(self, team_name: str, hex_color: str):
-        guild = self.discord_bot.guilds[0]
-
-        # Convert hex string to discord.Color
-        try:
-            # Remove # if present
-            hex_color = hex_color.lstrip("#")
-            color_int = int(hex_color, 16)
-            color = discord.Color(color_int)
-        except ValueError:
-            logger.info(f"Invalid hex color: {hex_color}. Using default color.")
-            color = discord.Color.default()
-        
-        # Create the role
-        role_name = f"{self.team_name_prefix}-{team_name}"
-        role = await guild.create_role(name=role_name,color=color,mentionable=True)
-        logger.info(f"Created role: {role.name} with color {hex_color}")
-
-    async def assign_participant_roles(self) -> None:
-        """
-        Assigns the corresponding team role to each participant
-        based on the nested config dict. Stores the assigned Role
-        object under each participant's entry.
-        """
-        guild = self.discord_bot.guilds[0]
-
-        for username, data in self.config.items():
-            discord_id = data.get("discord_id")
-            role_name = data.get("role_name")
-
-            if not discord_id or not role_name:
-                logger.warning(f"Skipping {username}: missing discord_id or role_name")
-                continue
-
-            # Fetch the role object by name
-            role = discord.utils.get(guild.roles, name=role_name)
-            if not role:
-                logger.warning(f"Role '{role_name}' not found in guild to assign to {username}")
-                continue
-
-            # Fetch the member object by Discord ID
-            member = guild.get_member(int(discord_id))
-            if not member:
-                logger.warning(f"Member with ID {discord_id} not found in guild for {username}")
-                continue
-
-            try:
-                await member.add_roles(role, reason="Assigning Bingo Team role")
-                # Store the role object under participant entry for later reference
-                self.config[username]["role_obj"] = role
-                logger.info(f"Assigned role '{role_name}' to {username}")
-            except Exception as e:
-                logger.error(f"Failed to assign role '{role_name}' to {username}: {e}", exc_info=e)
-
     def save_config_as_json(self, fp: str) -> None:
         """
         Saves self.config as a JSON file.
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+import discord
+from src.commands.BingoConfigParser import BingoConfigParser
+
+logger = logging.getLogger(__name__)
+
+# Calls in flight at once while applying; discord.py still handles the rate limit buckets
+MAX_CONCURRENT_CALLS = 4
+# Staff who can see every team channel, alongside the team itself
+STAFF_ROLES = ["General", "Captain", "Lieutenant"]
+BINGO_ROLE = "Bingo"
+
+ROLE_ACTIONS = ("create_role", "edit_role")
+
+
+def parse_color(hex_color) -> discord.Color:
+    """'#ff0000' -> discord.Color, or the default color if it can't be read."""
+    try:
+        return discord.Color(int(str(hex_color).lstrip("#"), 16))
+    except ValueError:
+        logger.info(f"Invalid hex color: {hex_color}. Using default color.")
+        return discord.Color.default()
+
+
+def channel_key(name: str) -> str:
+    """
+    What a channel is matched on. Discord lowercases text channel names and replaces
+    or drops spaces and punctuation ("O'Neil chat" is stored as "oneil-chat"), so
+    only letters and digits are compared.
+    """
+    return "".join(char for char in name.casefold() if char.isalnum())
+
+
+@dataclass
+class ProvisionAction:
+    """One Discord REST call. run() gets role name -> Role, including roles created earlier in the apply."""
+    kind: str  # create_role, edit_role, create_/edit_text_channel, create_/edit_voice_channel, add_roles
+    name: str
+    summary: str
+    run: Callable[[dict[str, discord.Role]], Awaitable[object]]
+
+
+@dataclass
+class ProvisionPlan:
+    actions: list[ProvisionAction] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.actions)
+
+    def summaries(self, *kinds: str) -> list[str]:
+        return [action.summary for action in self.actions if action.kind in kinds]
+
+
+class BingoProvisioner:
+    """
+    Brings a guild in line with a loaded BingoConfigParser: one role per team (plus
+    the Bingo role), optionally a private text and voice channel per team, and every
+    participant holding their roles.
+
+    plan() diffs that against the guild's cached roles, channels and members without
+    making any calls, and only plans what's missing or different, so running it again
+    on an unchanged config plans nothing. apply() makes the planned calls: roles first,
+    since channels and members refer to them, then channels (created with their
+    permission overwrites in the same call) and member role assignments, at most
+    MAX_CONCURRENT_CALLS at a time.
+    """
+
+    def __init__(self, guild: discord.Guild, parser: BingoConfigParser, channels: bool = False) -> None:
+        self.guild = guild
+        self.parser = parser
+        self.channels = channels
+
+    # -------------------------
+    # Desired state
+    # -------------------------
+    def team_roles(self) -> dict[str, discord.Color]:
+        """Team role name -> color, taken from the team's first participant."""
+        roles = {}
+        for data in self.parser.config.values():
+            if data["role_name"] not in roles:
+                roles[data["role_name"]] = parse_color(data.get("color", "#000000"))
+        return roles
+
+    def channel_overwrites(self, roles: dict[str, discord.Role], team_role: str) -> dict:
+        """Only the team, the staff and the bot can see a team's channels."""
+        overwrites = {
+            self.guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            self.guild.me: discord.PermissionOverwrite(view_channel=True),
+        }
+        for role_name in STAFF_ROLES + [team_role]:
+            if role_name in roles:
+                overwrites[roles[role_name]] = discord.PermissionOverwrite(view_channel=True)
+        return overwrites
+
+    # -------------------------
+    # Planning
+    # -------------------------
+    def plan(self) -> ProvisionPlan:
+        plan = ProvisionPlan()
+        roles = {role.name: role for role in self.guild.roles}
+        team_roles = self.team_roles()
+
+        self.plan_role(plan, roles, BINGO_ROLE, color=None)
+        for role_name, color in team_roles.items():
+            self.plan_role(plan, roles, role_name, color)
+
+        if self.channels:
+            for role_name in team_roles:
+                self.plan_channel(plan, roles, f"{role_name}-chat", role_name, voice=False)
+                self.plan_channel(plan, roles, f"{role_name}-voice", role_name, voice=True)
+
+        for username, data in self.parser.config.items():
+            self.plan_member(plan, roles, username, data)
+
+        logger.info(f"[BingoProvisioner] Planned {len(plan.actions)} calls")
+        return plan
+
+    def plan_role(self, plan: ProvisionPlan, roles: dict[str, discord.Role], role_name: str, color) -> None:
+        role = roles.get(role_name)
+        if role is None:
+            async def create(_roles, role_name=role_name, color=color):
+                return await self.guild.create_role(
+                    name=role_name, color=color or discord.Color.default(), mentionable=True, reason="Bingo setup"
+                )
+            plan.actions.append(ProvisionAction("create_role", role_name, f"{role_name} (create)", create))
+        elif color is not None and role.color != color:
+            async def edit(_roles, role=role, color=color):
+                return await role.edit(color=color, reason="Bingo setup")
+            plan.actions.append(ProvisionAction("edit_role", role_name, f"{role_name} (update color)", edit))
+
+    def plan_channel(self, plan: ProvisionPlan, roles: dict[str, discord.Role], channel_name: str,
+                     team_role: str, voice: bool) -> None:
+        channels = self.guild.voice_channels if voice else self.guild.text_channels
+        channel = next((c for c in channels if channel_key(c.name) == channel_key(channel_name)), None)
+        kind = "voice_channel" if voice else "text_channel"
+
+        if channel is None:
+            async def create(roles, channel_name=channel_name, team_role=team_role):
+                overwrites = self.channel_overwrites(roles, team_role)
+                if voice:
+                    return await self.guild.create_voice_channel(name=channel_name, overwrites=overwrites, reason="Bingo setup")
+                return await self.guild.create_text_channel(name=channel_name, overwrites=overwrites, reason="Bingo setup")
+            plan.actions.append(ProvisionAction(f"create_{kind}", channel_name, f"{channel_name} (create)", create))
+        # A team role that doesn't exist yet can't be in the overwrites either
+        elif team_role not in roles or channel.overwrites != self.channel_overwrites(roles, team_role):
+            async def edit(roles, channel=channel, team_role=team_role):
+                return await channel.edit(overwrites=self.channel_overwrites(roles, team_role), reason="Bingo setup")
+            plan.actions.append(ProvisionAction(f"edit_{kind}", channel_name, f"{channel_name} (update permissions)", edit))
+
+    def plan_member(self, plan: ProvisionPlan, roles: dict[str, discord.Role], username: str, data: dict) -> None:
+        try:
+            member = self.guild.get_member(int(data.get("discord_id")))
+        except (TypeError, ValueError):
+            member = None
+        if member is None:
+            logger.warning(f"Member with ID {data.get('discord_id')} not found in guild for {username}")
+            return
+
+        held = {role.name for role in member.roles}
+        missing = [role_name for role_name in (BINGO_ROLE, data["role_name"]) if role_name not in held]
+        if missing:
+            # Every missing role in one call
+            async def add(roles, member=member, missing=missing):
+                return await member.add_roles(*(roles[role_name] for role_name in missing), reason="Assigning Bingo Team role")
+            plan.actions.append(ProvisionAction("add_roles", username, f"{username} ({', '.join(missing)})", add))
+
+    # -------------------------
+    # Applying
+    # -------------------------
+    async def apply(self, plan: ProvisionPlan) -> list[ProvisionAction]:
+        """Make the planned calls. Returns the actions that failed."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+        roles = {role.name: role for role in self.guild.roles}
+        failed = []
+
+        async def run(action: ProvisionAction):
+            async with semaphore:
+                try:
+                    return await action.run(roles)
+                except (discord.HTTPException, KeyError) as e:
+                    # KeyError: a role this depends on failed to be created
+                    logger.error(f"[BingoProvisioner] {action.kind} {action.name} failed: {e}")
+                    failed.append(action)
+
+        role_actions = [action for action in plan.actions if action.kind in ROLE_ACTIONS]
+        for action, role in zip(role_actions, await asyncio.gather(*(run(action) for action in role_actions))):
+            if role is not None:
+                roles[action.name] = role
+
+        await asyncio.gather(*(run(action) for action in plan.actions if action.kind not in ROLE_ACTIONS))
+        logger.info(f"[BingoProvisioner] Applied {len(plan.actions) - len(failed)}/{len(plan.actions)} calls")
+        return failed
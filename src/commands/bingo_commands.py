@@ -4,48 +4,50 @@ import logging
 import asyncio
 from discord import Interaction, utils
 from discord.ext.commands import Bot
-import asyncio
-from discord import Interaction
+from concurrent.futures import ThreadPoolExecutor
 from src.hunt_stats.parsers.GDoc.GDocDataRetriever import GDocDataRetriever
 from src.commands.BingoConfigParser import BingoConfigParser
+from src.commands.BingoProvisioner import BingoProvisioner, ProvisionPlan
 
 logger = logging.getLogger(__name__)
 
+# Sheet loads block (HTTP + pandas), so they run on a small pool of their own instead of
+# the event loop. The pool caps how many run at once however many commands come in.
+GDOC_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gdoc")
+GDOC_LOAD_TIMEOUT_SECONDS = 60.0
+
 DISCORD_SETUP_SUMMARY_TEMPLATE = """\
 Discord Setup Summary
 =====================
 
-Roles to be Created:
+Role Changes:
 {roles}
 
-Text Channels to be Created:
+Text Channel Changes:
 {text_channels}
 
-Voice Channels to be Created:
+Voice Channel Changes:
 {voice_channels}
 
 User Role Assignments:
 {user_roles}
 """
 
-async def send_bingo_verify_message(discord_bot, parser, interaction: Interaction, channels: bool) -> bool:
+async def send_bingo_verify_message(discord_bot, plan: ProvisionPlan, interaction: Interaction) -> bool:
     """
-    Sends an ephemeral verification message showing roles/channels from the parser.
+    Sends an ephemeral verification message showing the planned role/channel/member changes.
     Lets the user react with ✅ to confirm or ❌ to cancel.
     """
     timeout = 120.0
-    # Format the summary
-    roles_str = "\n".join(f"- {r}" for r in parser.roles)
-    text_channels_str = "\n".join(f"- {c}" for c in parser.text_channels)
-    voice_channels_str = "\n".join(f"- {v}" for v in parser.voice_channels)
-    user_roles_str = "\n".join(
-        f"- {username} ({data['team_name']})" for username, data in parser.config.items()
-    )
 
-    # if command called with channels flag as False, don't display them
-    if not channels:
-        text_channels_str = "None"
-        voice_channels_str = "None"
+    def section(*kinds: str) -> str:
+        return "\n".join(f"- {summary}" for summary in plan.summaries(*kinds)) or "None"
+
+    # Format the summary
+    roles_str = section("create_role", "edit_role")
+    text_channels_str = section("create_text_channel", "edit_text_channel")
+    voice_channels_str = section("create_voice_channel", "edit_voice_channel")
+    user_roles_str = section("add_roles")
 
     summary_message = DISCORD_SETUP_SUMMARY_TEMPLATE.format(
         roles=roles_str,
@@ -54,13 +56,12 @@ async def send_bingo_verify_message(discord_bot, parser, interaction: Interactio
         user_roles=user_roles_str
     )
 
-    # Send ephemeral message
-    await interaction.response.send_message(
+    # The command has already been deferred, so the summary goes out as a followup
+    msg = await interaction.followup.send(
         f"```{summary_message}```\nReact with ✅ to confirm, ❌ to cancel.",
-        ephemeral=True
+        ephemeral=True,
+        wait=True
     )
-
-    msg = await interaction.original_message()
     await msg.add_reaction("✅")
     await msg.add_reaction("❌")
 
@@ -96,6 +97,27 @@ async def check_user_roles(interaction: discord.Interaction, authorized_roles: l
         await interaction.followup.send("You do not have permission to use this command.", ephemeral=True)
         return False
 
+def load_bingo_parser(discord_bot: Bot, sheet_id: str) -> BingoConfigParser:
+    """Blocking: read the 'Bot Config' sheet and work out the roles and channels it needs."""
+    retriever = GDocDataRetriever(sheet_id=sheet_id)
+    parser = BingoConfigParser(discord_bot=discord_bot, gdoc_retriever=retriever)
+    parser.load_bingo_config()
+    parser.parse_team_names()
+    parser.generate_channel_and_role_names()
+    return parser
+
+async def load_bingo_parser_async(discord_bot: Bot, sheet_id: str) -> BingoConfigParser:
+    """
+    load_bingo_parser on GDOC_EXECUTOR, so the event loop keeps serving heartbeats and
+    other commands while the sheet loads. Raises asyncio.TimeoutError after
+    GDOC_LOAD_TIMEOUT_SECONDS. On timeout or cancellation the caller stops waiting right
+    away; a load already running can't be interrupted, so it finishes on its worker
+    (each Google request is capped by the client's HTTP timeout) and its result is dropped.
+    """
+    loop = asyncio.get_running_loop()
+    load = loop.run_in_executor(GDOC_EXECUTOR, load_bingo_parser, discord_bot, sheet_id)
+    return await asyncio.wait_for(load, timeout=GDOC_LOAD_TIMEOUT_SECONDS)
+
 async def bingo_setup(interaction: discord.Interaction, discord_bot: Bot, sheet_id: str, channels: bool) -> None:
     '''
     - generate a list of the channels and roles / roles being assigned to which users being created, and ask user to verify it is correct by reacting with a checkmark?
@@ -121,23 +143,41 @@ async def bingo_setup(interaction: discord.Interaction, discord_bot: Bot, sheet_
     
     # First checks if it can pull the GDoc data
     try:
-        retriever = GDocDataRetriever(sheet_id=SHEET_ID)
-        parser = BingoConfigParser(retriever)
-        parser.load_bingo_config()
+        parser = await load_bingo_parser_async(discord_bot=discord_bot, sheet_id=sheet_id)
+    except asyncio.TimeoutError:
+        logger.error(f"[BingoCommands Setup] Timed out loading GDoc config for sheet ID: {sheet_id}")
+        await interaction.followup.send(f"Timed out reading the Google Sheet with sheet ID: {sheet_id}", ephemeral=True)
+        return
     except Exception as e:
         logger.error(f"[BingoCommands Setup] Error retrieving and parsing GDoc config", exc_info=e)
-        interaction.followup.send(f"Unable to access the Google Sheet with sheet ID: {sheet_id}", ephemeral=True)
+        await interaction.followup.send(f"Unable to access the Google Sheet with sheet ID: {sheet_id}", ephemeral=True)
+        return
+
+    if not parser.config:
+        # Retrieval and parsing errors are logged and leave the config empty
+        await interaction.followup.send(f"No bingo config could be read from the Google Sheet with sheet ID: {sheet_id}", ephemeral=True)
+        return
+
+    # Diff the config against the guild; an unchanged config plans nothing
+    provisioner = BingoProvisioner(guild=guild, parser=parser, channels=channels)
+    plan = provisioner.plan()
+    if not plan:
+        await interaction.followup.send("✅ The server already matches the bingo config.", ephemeral=True)
+        return
+
+    # Generate and send verification message
+    confirmed = await send_bingo_verify_message(discord_bot=discord_bot, plan=plan, interaction=interaction)
 
-    if channels:
-        # Generate and send verification message
-        confirmed = await send_bingo_verify_message(discord_bot=discord_bot, parser=parser, interaction=interaction, channels=channels)
-        
     if confirmed:
         # If verified, create channels and roles
-        ...
-    else:
-        # abort
-        ...
+        failed = await provisioner.apply(plan)
+        if failed:
+            await interaction.followup.send(
+                f"⚠️ {len(failed)} of {len(plan.actions)} changes failed: " + ", ".join(action.summary for action in failed),
+                ephemeral=True
+            )
+        else:
+            await interaction.followup.send(f"✅ Bingo setup complete ({len(plan.actions)} changes).", ephemeral=True)
 
 async def bingo_cleanup(interaction: discord.Interaction, discord_bot: Bot) -> None:
     '''
@@ -0,0 +1,192 @@
+from bisect import bisect_left, insort
+from HuntMetrics import HuntMetrics, PlayerMetrics, TeamMetrics, TeamBest
+from RateEngine import RateEngine, RateMetric, RATE_METRICS, field_reader
+
+# TeamTotals field -> the PlayerMetrics attribute path it sums
+TOTAL_FIELDS = {
+    "total_drops": "total_drops",
+    "total_points": "total_points",
+    "total_coins": "total_coins",
+    "total_pets": "boss_pets",
+    "total_jars": "jars",
+    "total_mega_rares": "mega_rares",
+    "total_cox": "wom.cox",
+    "total_tob": "wom.tob",
+    "total_toa": "wom.toa",
+    "total_raids": "wom.raids",
+    "total_ehb": "wom.ehb",
+    "total_xp": "wom.xp_gained",
+}
+
+CLUE_TIERS = ("beginner", "easy", "medium", "hard", "elite", "master")
+
+
+class HuntAggregator:
+    """
+    Keeps team totals, per-EHB rates and team bests for a HuntMetrics up to date as
+    players change, without rebuilding every team.
+
+    Each player's contribution to its team totals is remembered, so an update
+    subtracts the old contribution and adds the new one. Each team also keeps one
+    sorted ranking per rate, so a player's rate moves with one bisect instead of a
+    scan of the roster. An update costs O(changed players), not O(all players).
+    """
+
+    def __init__(self, hunt: HuntMetrics, rates: list[RateMetric] = RATE_METRICS, top_k: int = 3):
+        self.hunt = hunt
+        self.rate_engine = RateEngine(rates)
+        self.top_k = top_k
+        self.readers = [field_reader(path) for path in TOTAL_FIELDS.values()]
+
+        # (team, player) -> numbers last added to the team totals
+        self.contributions: dict[tuple[str, str], tuple] = {}
+        # team -> rate -> [(-value, roster position, player), ...] sorted best first
+        self.rankings: dict[str, dict[str, list[tuple]]] = {}
+        # team -> player -> roster position, so ties keep going to the earlier player
+        self.roster: dict[str, dict[str, int]] = {}
+        self.next_position: dict[str, int] = {}
+        self.rebuild()
+
+    # -------------------------
+    # Full rebuild
+    # -------------------------
+    def rebuild(self) -> None:
+        self.contributions.clear()
+        self.rankings.clear()
+        self.roster.clear()
+        self.next_position.clear()
+
+        for team_name, team in self.hunt.teams.items():
+            self._reset_totals(team)
+            self.roster[team_name] = {player_name: i for i, player_name in enumerate(team.players)}
+            self.next_position[team_name] = len(team.players)
+            self.rankings[team_name] = {name: [] for name, _, _ in self.rate_engine.columns}
+
+            for player_name, player in team.players.items():
+                player.rates = self.rate_engine.player_rates(player)
+                self.contributions[(team_name, player_name)] = self.contribution(player)
+
+            # Column sums, in roster order, so a rebuild adds up exactly like a fresh scan
+            contributions = [self.contributions[(team_name, player_name)] for player_name in team.players]
+            if contributions:
+                self._add(team, tuple(sum(column) for column in zip(*contributions)), 1)
+
+            position = self.roster[team_name]
+            for name, ranking in self.rankings[team_name].items():
+                ranking.extend((-player.rates[name], position[player_name], player_name)
+                               for player_name, player in team.players.items())
+                ranking.sort()
+            self._write_bests(team_name)
+
+    # -------------------------
+    # Incremental updates
+    # -------------------------
+    def update_player(self, team_name: str, player_name: str, player: PlayerMetrics) -> None:
+        """Add or replace one player and fold the difference into their team."""
+        team = self._ensure_team(team_name)
+        key = (team_name, player_name)
+
+        old = team.players.get(player_name)
+        if old is not None:
+            self._add(team, self.contributions[key], -1)
+            self._unrank(team_name, player_name, old)
+        else:
+            self.roster[team_name][player_name] = self.next_position[team_name]
+            self.next_position[team_name] += 1
+
+        team.players[player_name] = player
+        player.rates = self.rate_engine.player_rates(player)
+        contribution = self.contribution(player)
+        self._add(team, contribution, 1)
+        self.contributions[key] = contribution
+        self._rank(team_name, player_name, player)
+        self._write_bests(team_name)
+
+    def remove_player(self, team_name: str, player_name: str) -> None:
+        team = self.hunt.teams[team_name]
+        player = team.players.pop(player_name)
+        self._add(team, self.contributions.pop((team_name, player_name)), -1)
+        self._unrank(team_name, player_name, player)
+        del self.roster[team_name][player_name]
+        self._write_bests(team_name)
+
+    def apply(self, latest: HuntMetrics) -> list[tuple[str, str]]:
+        """
+        Fold a freshly parsed HuntMetrics into the running one. Only players whose
+        inputs differ from what was last seen are touched. Returns the (team, player)
+        pairs that changed.
+        """
+        changed = []
+        for team_name, player_name, player in latest.players():
+            team = self.hunt.teams.get(team_name)
+            current = team.players.get(player_name) if team is not None else None
+            if current is not None:
+                # Rates are ours to fill in; compare only the parsed inputs
+                player.rates = current.rates
+                if player == current:
+                    continue
+            self.update_player(team_name, player_name, player)
+            changed.append((team_name, player_name))
+
+        for team_name, team in list(self.hunt.teams.items()):
+            latest_team = latest.teams.get(team_name)
+            for player_name in list(team.players):
+                if latest_team is None or player_name not in latest_team.players:
+                    self.remove_player(team_name, player_name)
+                    changed.append((team_name, player_name))
+        return changed
+
+    # -------------------------
+    # Helpers
+    # -------------------------
+    def contribution(self, player: PlayerMetrics) -> tuple:
+        clues = player.wom.clues if player.wom is not None and player.wom.clues else {}
+        return (
+            *(read(player) for read in self.readers),
+            clues.get("total", 0),
+            *(clues.get(tier, 0) for tier in CLUE_TIERS),
+        )
+
+    def _ensure_team(self, team_name: str) -> TeamMetrics:
+        if team_name not in self.hunt.teams:
+            team = self.hunt.teams[team_name] = TeamMetrics()
+            self._reset_totals(team)
+            self.roster[team_name] = {}
+            self.next_position[team_name] = 0
+            self.rankings[team_name] = {name: [] for name, _, _ in self.rate_engine.columns}
+        return self.hunt.teams[team_name]
+
+    @staticmethod
+    def _reset_totals(team: TeamMetrics) -> None:
+        totals = team.totals
+        for field in TOTAL_FIELDS:
+            setattr(totals, field, 0.0 if field in ("total_points", "total_coins", "total_ehb") else 0)
+        totals.total_clues = 0
+        totals.clues_breakdown = {tier: 0 for tier in CLUE_TIERS}
+
+    @staticmethod
+    def _add(team: TeamMetrics, contribution: tuple, sign: int) -> None:
+        totals = team.totals
+        for field, value in zip(TOTAL_FIELDS, contribution):
+            setattr(totals, field, getattr(totals, field) + sign * value)
+        totals.total_clues += sign * contribution[len(TOTAL_FIELDS)]
+        for tier, value in zip(CLUE_TIERS, contribution[len(TOTAL_FIELDS) + 1:]):
+            totals.clues_breakdown[tier] += sign * value
+
+    def _rank(self, team_name: str, player_name: str, player: PlayerMetrics) -> None:
+        position = self.roster[team_name][player_name]
+        for name, ranking in self.rankings[team_name].items():
+            insort(ranking, (-player.rates[name], position, player_name))
+
+    def _unrank(self, team_name: str, player_name: str, player: PlayerMetrics) -> None:
+        position = self.roster[team_name][player_name]
+        for name, ranking in self.rankings[team_name].items():
+            del ranking[bisect_left(ranking, (-player.rates[name], position, player_name))]
+
+    def _write_bests(self, team_name: str) -> None:
+        bests = self.hunt.teams[team_name].totals.bests
+        for name, ranking in self.rankings[team_name].items():
+            if ranking:
+                bests[name] = [TeamBest(player=player, value=-value) for value, _, player in ranking[:self.top_k]]
+            else:
+                bests.pop(name, None)
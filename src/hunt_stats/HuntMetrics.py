@@ -0,0 +1,307 @@
+"""
+Typed hunt metrics. Every value is kept as a raw number from ingestion to output;
+strings like "1,482.5" are only produced by the compatibility writer (to_json), which
+emits the same JSON shape hunt_metrics.json has always had, and only parsed back by
+from_json when loading an existing file.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+def parse_number(value) -> float:
+    """Read a number that may have been written as a comma-formatted string."""
+    if value is None:
+        return 0.0
+    if isinstance(value, str):
+        return float(value.replace(",", "") or 0)
+    return value
+
+
+@dataclass(slots=True)
+class ItemRecord:
+    item: str | None = None
+    value: float = 0.0
+
+
+@dataclass(slots=True)
+class BossKills:
+    boss: str
+    kills: int
+
+
+@dataclass(slots=True)
+class TeamBest:
+    player: str
+    value: float
+
+
+@dataclass(slots=True)
+class WOMMetrics:
+    # Unset fields stay None and are left out of the JSON, as before
+    ehb: float | None = None
+    boss_kills: int | None = None
+    raids: int | None = None
+    cox: int | None = None
+    tob: int | None = None
+    toa: int | None = None
+    barrows: int | None = None
+    clues: dict[str, int] | None = None
+    xp_gained: int | None = None
+    most_killed_boss: BossKills | None = None
+    # Registry groups without a field of their own: {group: {category: total}}
+    categories: dict[str, dict[str, int]] | None = None
+
+
+@dataclass(slots=True)
+class PlayerMetrics:
+    total_drops: int = 0
+    total_points: float = 0.0
+    total_coins: float = 0.0
+    boss_pets: int = 0
+    jars: int = 0
+    mega_rares: int = 0
+    most_expensive_drop: ItemRecord = field(default_factory=ItemRecord)
+    most_points_item: ItemRecord = field(default_factory=ItemRecord)
+    # Item catalog categories without a field of their own: {category: count}, non-zero only
+    item_counts: dict[str, int] = field(default_factory=dict)
+    wom: WOMMetrics | None = None
+    # Rate name -> value, filled in by RateEngine (e.g. "points_per_ehb")
+    rates: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ehb(self) -> float:
+        if self.wom is None or self.wom.ehb is None:
+            return 0.0
+        return self.wom.ehb
+
+    def merge(self, other: "PlayerMetrics") -> None:
+        """Fold another spelling's drops into this player. WOM data is per account, so ours wins if set."""
+        self.total_drops += other.total_drops
+        self.total_points += other.total_points
+        self.total_coins += other.total_coins
+        self.boss_pets += other.boss_pets
+        self.jars += other.jars
+        self.mega_rares += other.mega_rares
+        if other.most_expensive_drop.value > self.most_expensive_drop.value:
+            self.most_expensive_drop = other.most_expensive_drop
+        if other.most_points_item.value > self.most_points_item.value:
+            self.most_points_item = other.most_points_item
+        for category, count in other.item_counts.items():
+            self.item_counts[category] = self.item_counts.get(category, 0) + count
+        if self.wom is None:
+            self.wom = other.wom
+
+
+@dataclass(slots=True)
+class TeamTotals:
+    total_drops: int = 0
+    total_points: float = 0.0
+    total_coins: float = 0.0
+    # Filled in by HuntStats; None until then
+    total_pets: int | None = None
+    total_jars: int | None = None
+    total_mega_rares: int | None = None
+    total_cox: int | None = None
+    total_tob: int | None = None
+    total_toa: int | None = None
+    total_raids: int | None = None
+    total_ehb: float | None = None
+    total_clues: int | None = None
+    clues_breakdown: dict[str, int] | None = None
+    total_xp: int | None = None
+    # Rate name -> the team's top players for that rate, best first
+    bests: dict[str, list[TeamBest]] = field(default_factory=dict)
+    most_killed_boss: BossKills | None = None
+
+
+@dataclass(slots=True)
+class TeamMetrics:
+    players: dict[str, PlayerMetrics] = field(default_factory=dict)
+    totals: TeamTotals = field(default_factory=TeamTotals)
+
+
+@dataclass(slots=True)
+class HuntMetrics:
+    teams: dict[str, TeamMetrics] = field(default_factory=dict)
+
+    def players(self):
+        """Yield (team_name, player_name, player) for every player in every team."""
+        for team_name, team in self.teams.items():
+            for player_name, player in team.players.items():
+                yield team_name, player_name, player
+
+    # -------------------------
+    # Compatibility writer
+    # -------------------------
+    def to_json(self, display_name: Callable[[str], str] | None = None) -> dict:
+        """display_name maps a player key (e.g. a normalized name) to the name written out."""
+        display_name = display_name or str
+        return {
+            team_name: {
+                "team_totals": _team_totals_to_json(team.totals, display_name),
+                "players": {display_name(name): _player_to_json(player) for name, player in team.players.items()},
+            }
+            for team_name, team in self.teams.items()
+        }
+
+    def save(self, path: str, display_name: Callable[[str], str] | None = None) -> None:
+        """Write the compatibility JSON atomically, so readers never see a half-written file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(display_name), f, indent=2)
+        os.replace(tmp_path, path)
+
+    # -------------------------
+    # Compatibility reader
+    # -------------------------
+    @classmethod
+    def from_json(cls, data: dict) -> "HuntMetrics":
+        return cls(teams={
+            team_name: TeamMetrics(
+                players={name: _player_from_json(p) for name, p in team_data.get("players", {}).items()},
+                totals=_team_totals_from_json(team_data.get("team_totals", {})),
+            )
+            for team_name, team_data in data.items()
+        })
+
+    @classmethod
+    def load(cls, path: str) -> "HuntMetrics":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_json(json.load(f))
+
+
+# -------------------------
+# JSON helpers
+# -------------------------
+PLAYER_FIELDS = ("total_drops", "total_points", "total_coins", "boss_pets", "jars", "mega_rares",
+                 "most_expensive_drop", "most_points_item", "item_counts", "wom")
+
+# best_points_per_ehb has always been written with a plain round(); the other bests use ",.2f"
+PLAIN_BESTS = {"points_per_ehb"}
+
+
+def _boss_kills_to_json(boss_kills: BossKills) -> dict:
+    return {"boss": boss_kills.boss, "kills": boss_kills.kills}
+
+
+def _wom_to_json(wom: WOMMetrics) -> dict:
+    output = {}
+    for key in WOMMetrics.__slots__:
+        value = getattr(wom, key)
+        if value is None:
+            continue
+        if isinstance(value, BossKills):
+            value = _boss_kills_to_json(value)
+        elif isinstance(value, dict):
+            value = dict(value)
+        output[key] = value
+    return output
+
+
+def _player_to_json(player: PlayerMetrics) -> dict:
+    output = {
+        "total_drops": player.total_drops,
+        "total_points": f"{player.total_points:,.1f}",
+        "total_coins": f"{player.total_coins:,.0f}",
+        "boss_pets": player.boss_pets,
+        "jars": player.jars,
+        "mega_rares": player.mega_rares,
+        "most_expensive_drop": {
+            "item": player.most_expensive_drop.item,
+            "value": f"{player.most_expensive_drop.value:,.0f}"
+        },
+        "most_points_item": {
+            "item": player.most_points_item.item,
+            "points": f"{player.most_points_item.value:,.1f}"
+        }
+    }
+    item_counts = {category: count for category, count in player.item_counts.items() if count}
+    if item_counts:
+        output["item_counts"] = item_counts
+    if player.wom is not None:
+        output["wom"] = _wom_to_json(player.wom)
+    for name, value in player.rates.items():
+        output[name] = round(value, 2)
+    return output
+
+
+def _team_totals_to_json(totals: TeamTotals, display_name: Callable[[str], str] = str) -> dict:
+    output = {
+        "total_drops": totals.total_drops,
+        "total_points": f"{totals.total_points:,.1f}",
+        "total_coins": f"{totals.total_coins:,.0f}",
+    }
+    for key in ("total_pets", "total_jars", "total_mega_rares", "total_cox", "total_tob", "total_toa",
+                "total_raids", "total_ehb", "total_clues", "clues_breakdown", "total_xp"):
+        value = getattr(totals, key)
+        if value is None:
+            continue
+        if key == "total_ehb":
+            value = round(value, 4)
+        elif isinstance(value, dict):
+            value = dict(value)
+        output[key] = value
+
+    for name, ranking in totals.bests.items():
+        if not ranking:
+            continue
+        best = ranking[0]
+        value = round(best.value, 2) if name in PLAIN_BESTS else f"{best.value:,.2f}"
+        output[f"best_{name}"] = f"{display_name(best.player)} ({value})"
+    if totals.most_killed_boss is not None:
+        output["most_killed_boss"] = _boss_kills_to_json(totals.most_killed_boss)
+    return output
+
+
+def _boss_kills_from_json(data: dict | None) -> BossKills | None:
+    if not data:
+        return None
+    return BossKills(boss=data["boss"], kills=data["kills"])
+
+
+def _team_best_from_json(value: str) -> TeamBest:
+    player, _, number = value.rpartition(" (")
+    return TeamBest(player=player, value=parse_number(number.rstrip(")")))
+
+
+def _player_from_json(data: dict) -> PlayerMetrics:
+    expensive = data.get("most_expensive_drop", {})
+    points_item = data.get("most_points_item", {})
+    wom = data.get("wom")
+    if wom is not None:
+        wom = WOMMetrics(**{key: value for key, value in wom.items() if key in WOMMetrics.__slots__})
+        wom.most_killed_boss = _boss_kills_from_json(wom.most_killed_boss)
+
+    return PlayerMetrics(
+        total_drops=data.get("total_drops", 0),
+        total_points=parse_number(data.get("total_points")),
+        total_coins=parse_number(data.get("total_coins")),
+        boss_pets=data.get("boss_pets", 0),
+        jars=data.get("jars", 0),
+        mega_rares=data.get("mega_rares", 0),
+        most_expensive_drop=ItemRecord(expensive.get("item"), parse_number(expensive.get("value"))),
+        most_points_item=ItemRecord(points_item.get("item"), parse_number(points_item.get("points"))),
+        item_counts=dict(data.get("item_counts", {})),
+        wom=wom,
+        rates={key: value for key, value in data.items() if key not in PLAYER_FIELDS},
+    )
+
+
+def _team_totals_from_json(data: dict) -> TeamTotals:
+    totals = TeamTotals(
+        total_drops=data.get("total_drops", 0),
+        total_points=parse_number(data.get("total_points")),
+        total_coins=parse_number(data.get("total_coins")),
+        bests={
+            key.removeprefix("best_"): [_team_best_from_json(value)]
+            for key, value in data.items() if key.startswith("best_") and value
+        },
+        most_killed_boss=_boss_kills_from_json(data.get("most_killed_boss")),
+    )
+    for key in ("total_pets", "total_jars", "total_mega_rares", "total_cox", "total_tob", "total_toa",
+                "total_raids", "total_ehb", "total_clues", "clues_breakdown", "total_xp"):
+        if key in data:
+            setattr(totals, key, data[key])
+    return totals
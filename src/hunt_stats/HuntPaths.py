@@ -0,0 +1,18 @@
+"""
+Where hunt data lives on disk. Every path is built from this file's directory rather
+than the working directory, so the bot (run from src/), the scripts and the parsers'
+own example runs all read and write the same files.
+"""
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def hunt_dir(hunt_edition: str, data_dir: Path | None = None) -> Path:
+    """One hunt's directory, e.g. data/Hunt-14."""
+    return Path(data_dir or DATA_DIR) / f"Hunt-{hunt_edition}"
+
+
+def gdoc_cache_dir(data_dir: Path | None = None) -> Path:
+    """Where GDocResponseCache keeps its per-spreadsheet files."""
+    return Path(data_dir or DATA_DIR) / "gdoc_cache"
@@ -0,0 +1,187 @@
+import json
+import os
+import re
+from HuntMetrics import HuntMetrics
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+def normalize_name(name: str) -> str:
+    """RuneScape names treat case, spaces, underscores and hyphens alike: "Air_Xiron" -> "air xiron"."""
+    return _SEPARATORS.sub(" ", name).strip().casefold()
+
+
+class PlayerNameIndex:
+    """
+    Persistent map from a normalized player name to how each source spells or keys
+    that player:
+
+        {"air xiron": {"wom_id": 123, "display_name": "Air_Xiron", "gdoc_name": "Air Xiron",
+                       "file_key": "Air_Xiron"}}
+
+    Every stage looks players up through normalize_name, so nothing has to be
+    renamed on disk and differently-cased spellings land on the same player. The
+    index only grows: entries are added or updated as new spellings turn up, and
+    the file is rewritten only when something changed.
+
+    Aliases map a sheet name that differs from the WOM name (e.g. "air xiron" ->
+    "airxiron") once a match is confirmed, so later runs resolve it exactly. Fuzzy
+    matches are never confirmed on their own: they are kept as pending, with their
+    score, until someone confirms or rejects them (scripts/player_aliases.py).
+    Confident ones are also applied for the current run only, as run aliases that
+    are never saved.
+    """
+
+    FIELDS = ("wom_id", "display_name", "gdoc_name", "file_key")
+
+    def __init__(self, filepath: str | None = None, players: dict[str, dict] | None = None,
+                 aliases: dict[str, str] | None = None, pending: dict[str, dict] | None = None,
+                 rejected: dict[str, str] | None = None):
+        self.filepath = filepath
+        self.players: dict[str, dict] = players or {}
+        self.aliases: dict[str, str] = aliases or {}
+        # Sheet key -> {"match": WOM key, "score": 0-1}, awaiting confirmation
+        self.pending: dict[str, dict] = pending or {}
+        # Sheet key -> the WOM key it was confirmed not to be
+        self.rejected: dict[str, str] = rejected or {}
+        # Unconfirmed matches applied to this run; not saved
+        self.run_aliases: dict[str, str] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, filepath: str) -> "PlayerNameIndex":
+        if not os.path.exists(filepath):
+            return cls(filepath)
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(filepath, data.get("players", {}), data.get("aliases", {}), data.get("pending", {}),
+                   data.get("rejected", {}))
+
+    def save(self) -> None:
+        if not self.dirty or self.filepath is None:
+            return
+        tmp_path = f"{self.filepath}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"players": self.players, "aliases": self.aliases, "pending": self.pending,
+                       "rejected": self.rejected}, f, indent=2)
+        os.replace(tmp_path, self.filepath)
+        self.dirty = False
+
+    # -------------------------
+    # Updates
+    # -------------------------
+    def record(self, name: str, **fields) -> str:
+        """Note how a source spells `name` and return its normalized key."""
+        key = normalize_name(name)
+        entry = self.players.get(key)
+        if entry is None:
+            entry = self.players[key] = dict.fromkeys(self.FIELDS)
+            self.dirty = True
+        for field, value in fields.items():
+            # The first spelling seen for a source sticks, so the index doesn't flip between variants
+            if value is not None and entry[field] is None:
+                entry[field] = value
+                self.dirty = True
+        return key
+
+    def add_alias(self, name: str, wom_name: str) -> None:
+        """Confirm that `name` (e.g. a sheet spelling) is the WOM player `wom_name`."""
+        key, target = normalize_name(name), normalize_name(wom_name)
+        if key != target and self.aliases.get(key) != target:
+            self.aliases[key] = target
+            self.dirty = True
+        if self.pending.pop(key, None) is not None:
+            self.dirty = True
+
+    def propose_alias(self, name: str, wom_name: str, score: float) -> bool:
+        """
+        Keep a fuzzy match as pending until it is confirmed. Returns False, recording
+        nothing, if the name is already confirmed or this pairing was rejected.
+        """
+        key, target = normalize_name(name), normalize_name(wom_name)
+        if key in self.aliases or self.rejected.get(key) == target:
+            return False
+        proposal = {"match": target, "score": round(score, 4)}
+        if self.pending.get(key) != proposal:
+            self.pending[key] = proposal
+            self.dirty = True
+        return True
+
+    def apply_for_run(self, name: str, wom_name: str) -> None:
+        """Resolve `name` to `wom_name` until this index is reloaded; nothing is saved."""
+        self.run_aliases[normalize_name(name)] = normalize_name(wom_name)
+
+    def confirm_alias(self, name: str) -> str:
+        """Promote `name`'s pending match to an alias; returns the WOM key it now resolves to."""
+        key = normalize_name(name)
+        if key not in self.pending:
+            raise KeyError(f"No pending match for '{name}'")
+        target = self.pending[key]["match"]
+        self.add_alias(key, target)
+        return target
+
+    def reject_alias(self, name: str) -> None:
+        """Drop `name`'s pending match; the same pairing is not proposed or applied again."""
+        key = normalize_name(name)
+        if key not in self.pending:
+            raise KeyError(f"No pending match for '{name}'")
+        self.rejected[key] = self.pending.pop(key)["match"]
+        self.dirty = True
+
+    def add_participants(self, participations: list[dict]) -> None:
+        for p in participations:
+            player = p.get("player")
+            if player and player.get("displayName"):
+                self.record(player["displayName"], wom_id=player.get("id"), display_name=player["displayName"])
+
+    def add_file_keys(self, file_keys) -> dict[str, str]:
+        """Record player file keys; returns file key -> normalized key."""
+        return {file_key: self.record(file_key, file_key=file_key) for file_key in file_keys}
+
+    def rekey_players(self, hunt: HuntMetrics) -> None:
+        """
+        Key every team's players by normalized name, recording the spelling each one
+        came in with. Two spellings of one player are merged rather than dropped.
+        """
+        for team in hunt.teams.values():
+            if all(normalize_name(name) == name for name in team.players):
+                # Already keyed, but the names are still the sheet's spelling
+                for name in team.players:
+                    self.record(name, gdoc_name=name)
+                continue
+            players = {}
+            for name, player in team.players.items():
+                key = self.record(name, gdoc_name=name)
+                if key in players:
+                    players[key].merge(player)
+                else:
+                    players[key] = player
+            team.players = players
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def resolve(self, name: str) -> str:
+        """The normalized key WOM data for `name` is stored under, following any alias."""
+        key = normalize_name(name)
+        return self.aliases.get(key) or self.run_aliases.get(key, key)
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) in self.players
+
+    def get(self, name: str) -> dict | None:
+        return self.players.get(self.resolve(name))
+
+    def display_name(self, key: str) -> str:
+        """
+        How the player stored under normalized `key` is written out: the sheet's spelling
+        for anyone on the sheet, WOM's only for players the sheet never named.
+        """
+        entry = self.players.get(key)
+        if entry is None:
+            return key
+        return entry["gdoc_name"] or entry["display_name"] or key
+
+    def file_key(self, name: str) -> str | None:
+        entry = self.get(name)
+        return entry["file_key"] if entry else None
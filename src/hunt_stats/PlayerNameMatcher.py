@@ -0,0 +1,87 @@
+import heapq
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+# Matches at or above this (with the same digits) are applied to the run; every match
+# is kept as pending until it is confirmed
+AUTO_ACCEPT_SCORE = 0.85
+MIN_REPORT_SCORE = 0.6
+# Candidates per name that get a full edit-distance score, picked by shared trigrams
+SHORTLIST_SIZE = 5
+
+_DIGITS = re.compile(r"\d+")
+
+
+@dataclass(slots=True)
+class NameMatch:
+    name: str
+    match: str
+    score: float
+    confident: bool
+
+
+def compact(name: str) -> str:
+    return name.replace(" ", "")
+
+
+def trigrams(name: str) -> set[str]:
+    """Trigrams of the name with separators dropped, padded so short names and word edges still count."""
+    padded = f"  {compact(name)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerNameMatcher:
+    """
+    Fuzzy matching of normalized player names against a fixed set of candidates
+    (e.g. WOM participants nobody has claimed). Candidates are indexed by trigram,
+    so each name only looks at the few candidates it shares the most trigrams
+    with, and only those get an edit-distance score (0-1, separators ignored).
+
+    Names whose digits differ ("zezima1" / "zezima2") are usually different
+    accounts, so those matches are never marked confident however close they are.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+        self.compact = [compact(name) for name in self.candidates]
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        for i, name in enumerate(self.candidates):
+            for gram in trigrams(name):
+                self.postings[gram].append(i)
+
+    def shortlist(self, name: str) -> list[int]:
+        shared = defaultdict(int)
+        for gram in trigrams(name):
+            for i in self.postings.get(gram, ()):
+                shared[i] += 1
+        return heapq.nlargest(SHORTLIST_SIZE, shared, key=shared.__getitem__)
+
+    def score(self, name: str, i: int) -> float:
+        return SequenceMatcher(None, compact(name), self.compact[i], autojunk=False).ratio()
+
+    def match(self, names, min_score: float = MIN_REPORT_SCORE) -> list[NameMatch]:
+        """
+        One-to-one matches for `names`, best scores first. Each candidate is given to
+        at most one name, so two sheet names can't both claim the same WOM player.
+        """
+        pairs = []
+        for name in names:
+            for i in self.shortlist(name):
+                score = self.score(name, i)
+                if score >= min_score:
+                    pairs.append((score, name, i))
+        pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+
+        matches = []
+        taken_names, taken_candidates = set(), set()
+        for score, name, i in pairs:
+            if name in taken_names or i in taken_candidates:
+                continue
+            taken_names.add(name)
+            taken_candidates.add(i)
+            candidate = self.candidates[i]
+            confident = score >= AUTO_ACCEPT_SCORE and _DIGITS.findall(name) == _DIGITS.findall(candidate)
+            matches.append(NameMatch(name=name, match=candidate, score=score, confident=confident))
+        return matches
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from operator import attrgetter
+from HuntMetrics import PlayerMetrics
+
+
+@dataclass(frozen=True, slots=True)
+class RateMetric:
+    """numerator / denominator per player, e.g. total_points / ehb. Fields are PlayerMetrics attribute paths."""
+    name: str
+    numerator: str
+    denominator: str
+
+
+# Adding a rate is one line here; RateEngine works out each player's value and HuntAggregator the rankings
+RATE_METRICS = [
+    RateMetric("points_per_ehb", "total_points", "ehb"),
+    RateMetric("coins_per_ehb", "total_coins", "ehb"),
+    RateMetric("drops_per_ehb", "total_drops", "ehb"),
+    RateMetric("raids_per_ehb", "wom.raids", "ehb"),
+    RateMetric("xp_per_ehb", "wom.xp_gained", "ehb"),
+]
+
+
+def field_reader(path: str):
+    """A getter for a dotted PlayerMetrics attribute path; missing WOM data reads as 0."""
+    get = attrgetter(path)
+
+    def read(player: PlayerMetrics) -> float:
+        try:
+            return get(player) or 0
+        except AttributeError:  # e.g. "wom.raids" on a player without WOM data
+            return 0
+    return read
+
+
+class RateEngine:
+    """
+    Computes every configured rate for a player, reading each of its fields once. A
+    rate with a zero (or negative) denominator is 0.0.
+    """
+
+    def __init__(self, rates: list[RateMetric] = RATE_METRICS):
+        self.rates = rates
+
+        fields = list(dict.fromkeys(f for rate in rates for f in (rate.numerator, rate.denominator)))
+        columns = {f: col for col, f in enumerate(fields)}
+        self.columns = [(rate.name, columns[rate.numerator], columns[rate.denominator]) for rate in rates]
+        self.readers = [field_reader(f) for f in fields]
+        # Every field of a player in one call; players without WOM data fall back to the readers
+        self.read_all = attrgetter(*fields) if len(fields) > 1 else (lambda player: (attrgetter(fields[0])(player),))
+
+    def read(self, player: PlayerMetrics) -> tuple:
+        try:
+            values = self.read_all(player)
+        except AttributeError:
+            return tuple(read(player) for read in self.readers)
+        if None in values:
+            return tuple(value or 0 for value in values)
+        return values
+
+    def player_rates(self, player: PlayerMetrics) -> dict[str, float]:
+        values = self.read(player)
+        return {name: values[n] / values[d] if values[d] > 0 else 0.0 for name, n, d in self.columns}
@@ -0,0 +1,60 @@
+import logging
+import threading
+import google_auth_httplib2
+import httplib2
+from googleapiclient.discovery import build
+from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CREDS_PATH = "src/conf/google_auth.json"
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
+]
+HTTP_TIMEOUT_SECONDS = 30
+
+
+class GDocClient:
+    """
+    Google API access shared by every GDocDataRetriever in the process.
+
+    The service-account credentials are loaded once, and their access token is
+    refreshed only when it has expired. The Sheets and Drive resources are built from
+    the discovery documents bundled with google-api-python-client (static_discovery),
+    so nothing is downloaded. httplib2 connections aren't thread-safe, so each thread
+    gets its own keep-alive connection, authorized with the shared credentials, and
+    reuses it across calls.
+    """
+
+    _shared: "GDocClient | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, creds_path: str = DEFAULT_CREDS_PATH):
+        self.credentials = service_account.Credentials.from_service_account_file(creds_path, scopes=SCOPES)
+        self._local = threading.local()
+        # Resources are only request builders; every request runs on the calling thread's connection
+        self.sheets = build("sheets", "v4", credentials=self.credentials, static_discovery=True).spreadsheets()
+        self.drive = build("drive", "v3", credentials=self.credentials, static_discovery=True).files()
+        logger.info("Google Sheets API client initialized successfully.")
+
+    @classmethod
+    def shared(cls, creds_path: str = DEFAULT_CREDS_PATH) -> "GDocClient":
+        """The process-wide client, created on first use."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls(creds_path)
+        return cls._shared
+
+    def http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """This thread's authorized connection."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+            )
+        return http
+
+    def execute(self, request):
+        return request.execute(http=self.http())
@@ -1,186 +1,403 @@
-import json
 import pandas as pd
-from parsers.GDoc.GDocDataRetriever import GDocDataRetriever
+from parsers.GDoc.GDocDataRetriever import GDocDataRetriever, to_grid, column_letter, a1_range
+from parsers.GDoc.GDocItemCatalog import GDocItemCatalog, DEFAULT_CATALOG_FP
+from HuntMetrics import HuntMetrics, TeamMetrics, PlayerMetrics, ItemRecord
+from PlayerNameIndex import PlayerNameIndex
+from HuntPaths import hunt_dir
+from dataclasses import asdict
+import hashlib
+import json
+import logging
+import numpy as np
 import os
 
+logger = logging.getLogger(__name__)
+
+# Item catalog categories that feed a PlayerMetrics field of their own; every other
+# category is counted in PlayerMetrics.item_counts
+CATEGORY_FIELDS = {"pets": "boss_pets", "jars": "jars", "mega_rares": "mega_rares"}
+# Items in this category don't count towards total_drops
+DROP_EXCLUSIONS = "drop_exclusions"
+
+# Each team's block on the Inputs sheet starts at a team label in the first row, with its
+# column headers in the second. These are the offsets within a block to keep (a block
+# A-F keeps A,B,C,E,F). Sheets without labels fall back to the original two-team layout.
+BLOCK_COLUMNS = {"Content": 0, "Item": 1, "Player": 2, "Coins": 4, "Points": 5}
+DEFAULT_TEAM_BLOCKS = {"Team Red": 0, "Team Gold": 9}
+BLOCK_WIDTH = 6
+HEADER_ROWS = 2  # team label + header
+
+# Rows just before each team's watermark that are re-fetched and hashed on an
+# incremental run, to catch edits to rows that were already ingested
+TAIL_ROWS = 20
+# Incremental runs in a row before the whole sheet is parsed again, which bounds how
+# long an edit above the tail rows can go unnoticed
+FULL_PARSE_EVERY = 10
+
+# Cells that count as blank when deciding whether a row is empty
+EMPTY_VALUES = ["", "nan"]
+
+
+def clean_text(column: pd.Series, remove_commas: bool = False) -> pd.Series:
+    """
+    Cells as stripped text (blank for missing), optionally without commas. Sheets
+    repeat the same few names and values down a column, so the string work runs once
+    per distinct value and the result is spread back over the rows.
+    """
+    codes, uniques = pd.factorize(column.fillna(""))
+    text = pd.Index(uniques).astype(str)
+    if remove_commas:
+        text = text.str.replace(",", "")
+    text = text.str.strip().to_numpy(dtype=object)
+    return pd.Series(text[codes] if len(text) else "", index=column.index, dtype=object)
+
+
+def block_cells(rows: np.ndarray) -> np.ndarray:
+    """A team block's kept columns as their own array, blank past the last column fetched."""
+    cells = np.full((len(rows), len(BLOCK_COLUMNS)), "", dtype=object)
+    for i, offset in enumerate(BLOCK_COLUMNS.values()):
+        if offset < rows.shape[1]:
+            cells[:, i] = rows[:, offset]
+    return cells
+
+
+def hash_rows(cells: np.ndarray) -> str:
+    return hashlib.sha256(json.dumps(cells.tolist(), default=str).encode()).hexdigest()
+
+
 class GDocDataParser:
-    def __init__(self, gdoc: GDocDataRetriever, hunt_edition: str, sheet_name: str = "Inputs"):
+    def __init__(self, gdoc: GDocDataRetriever, hunt_edition: str, sheet_name: str = "Inputs",
+                 name_index: PlayerNameIndex | None = None, base_dir: str | None = None):
         self.gdoc = gdoc
         self.sheet_name = sheet_name
         self.hunt_edition = hunt_edition
+        # Players are keyed by normalized name; the index remembers the sheet's spelling
+        self.name_index = name_index if name_index is not None else PlayerNameIndex()
 
-        # Output directory and file
-        self.base_dir = os.path.join("src", "hunt-stats", "data", f"Hunt-{self.hunt_edition}")
+        # Output directory and file; base_dir is the hunt's directory under HuntPaths.DATA_DIR by default
+        self.base_dir = base_dir or str(hunt_dir(self.hunt_edition))
         os.makedirs(self.base_dir, exist_ok=True)
         self.output_file = os.path.join(self.base_dir, "hunt_metrics.json")
-
-        # Canonical data store
-        self.team_players = {
-            "Team Red": {
-                "players": {},
-                "team_totals": {
-                    "total_drops": 0,
-                    "total_points": 0.0,  # Leave as 0 for now
-                    "total_coins": 0.0
-                }
-            },
-            "Team Gold": {
-                "players": {},
-                "team_totals": {
-                    "total_drops": 0,
-                    "total_points": 0.0,  # Leave as 0 for now
-                    "total_coins": 0.0
-                }
-            }
-        }
-
-    def run(self):
-        """Main method to fetch, parse, and write metrics."""
-        df_red, df_gold = self.get_team_dataframes(self.sheet_name)
-
-        df_red_clean = self.clean_team_dataframe(df_red)
-        df_gold_clean = self.clean_team_dataframe(df_gold)
-
-        self.ingest_team_dataframe(df_red_clean, "Team Red")
-        self.ingest_team_dataframe(df_gold_clean, "Team Gold")
-
-        self.write_metrics_to_file(self.output_file)
+        self.catalog_fp = os.path.join(self.base_dir, "item_catalog.json")
+        self.catalog: GDocItemCatalog | None = None
+        # Watermarks and the aggregates they cover, for incremental runs
+        self.state_fp = os.path.join(self.base_dir, "gdoc_state.json")
+
+        # Canonical data store, one entry per team block found on the sheet
+        self.team_players: dict[str, TeamMetrics] = {}
+        # Team name -> first column of its block
+        self.team_blocks: dict[str, int] = {}
+        # Team name -> {"row": data rows ingested, up to the last filled one, "tail_hash": ...}
+        self.watermarks: dict[str, dict] = {}
+        # The sheet revision the saved aggregates were read at, and incremental runs since a full parse
+        self.revision: str | None = None
+        self.incremental_runs = 0
+
+    def run(self, save: bool = True, incremental: bool = False) -> HuntMetrics:
+        """
+        Main method to fetch, parse, and write metrics. Returns the parsed metrics.
+
+        With incremental=True only the rows appended since the last run are fetched and
+        folded into the saved aggregates; see ingest_appended_rows for when the whole
+        sheet is parsed instead.
+        """
+        if not (incremental and self.ingest_appended_rows()):
+            self.team_players = {}
+            self.ingest_team_frames(self.get_team_dataframes(self.sheet_name))
+            self.revision, self.incremental_runs = self.gdoc.revision, 0
+        self.save_state()
+
+        output = self.build_metrics()
+        if save:
+            self.write_metrics_to_file(self.output_file, output)
         print("GDOC PARSING COMPLETED")
+        return output
 
     # ---------------------------------------------------------
     # Sheet parsing
     # ---------------------------------------------------------
-    def get_team_dataframes(self, sheet_name: str):
-        raw_data = self.gdoc.get_data_from_sheet(sheet_name)
-        if raw_data is None or raw_data.shape[0] < 3:
-            return pd.DataFrame(), pd.DataFrame()
+    def get_team_dataframes(self, sheet_name: str) -> dict[str, pd.DataFrame]:
+        """Team name -> that team's block of drop rows. Also resets the watermarks to this read."""
+        self.watermarks = {}
+        header = self.gdoc.get_data_from_range(a1_range(sheet_name, "1", str(HEADER_ROWS)))
+        if header is None or header.ndim != 2 or header.shape[0] < HEADER_ROWS:
+            self.team_blocks = dict(DEFAULT_TEAM_BLOCKS)
+            return {team_name: pd.DataFrame() for team_name in DEFAULT_TEAM_BLOCKS}
+
+        # Only each block's own columns are fetched, all in one round trip
+        self.team_blocks = self.detect_team_blocks(header)
+        ranges = [self.block_range(sheet_name, start, first_row=0) for start in self.team_blocks.values()]
+        frames = {}
+        for team_name, rows in zip(self.team_blocks, self.gdoc.get_data_from_ranges(ranges, [BLOCK_WIDTH] * len(ranges))):
+            if rows.ndim != 2:
+                rows = to_grid([], BLOCK_WIDTH)
+            self.advance_watermark(team_name, rows, first_row=0)
+            frames[team_name] = self.block_frame(rows)
+        return frames
+
+    @staticmethod
+    def block_range(sheet_name: str, start: int, first_row: int) -> str:
+        """A1 range for a team block's columns, from data row `first_row` to the end of the sheet."""
+        return a1_range(
+            sheet_name, f"{column_letter(start)}{HEADER_ROWS + first_row + 1}", column_letter(start + BLOCK_WIDTH - 1)
+        )
+
+    @staticmethod
+    def block_frame(rows: np.ndarray) -> pd.DataFrame:
+        """A fetched team block as a DataFrame."""
+        # Each column is a view into the block; columns past the last one fetched read as blank
+        width = rows.shape[1]
+        return pd.DataFrame({
+            name: rows[:, offset] if offset < width else ""
+            for name, offset in BLOCK_COLUMNS.items()
+        }, index=pd.RangeIndex(len(rows)), copy=False)
+
+    @staticmethod
+    def detect_team_blocks(grid) -> dict[str, int]:
+        """
+        Team name -> first column of its block. A block starts wherever the label row
+        has a name and the header row below it has BLOCK_COLUMNS' headers at their
+        offsets, so stray notes in the label row aren't mistaken for teams; labels
+        skipped for their headers are logged.
+        """
+        labels, headers = grid[0].tolist(), [str(cell or "").strip().lower() for cell in grid[1].tolist()]
+        blocks = {}
+        for col, label in enumerate(labels):
+            team_name = str(label or "").strip()
+            if not team_name or team_name in blocks:
+                continue
+            found = [headers[col + offset] if col + offset < len(headers) else "" for offset in BLOCK_COLUMNS.values()]
+            if found == [name.lower() for name in BLOCK_COLUMNS]:
+                blocks[team_name] = col
+            else:
+                logger.warning(f"Skipping '{team_name}' in column {column_letter(col)}: expected headers "
+                               f"{', '.join(BLOCK_COLUMNS)} under it, found {', '.join(cell or '(blank)' for cell in found)}")
+        return blocks or dict(DEFAULT_TEAM_BLOCKS)
 
-        rows = raw_data.tolist()[2:]  # skip team label + header
-
-        # Team Red (A-F → keep A,B,C,E,F)
-        red_rows = []
-        for r in rows:
-            r += [""] * (6 - len(r))
-            red_rows.append([r[0], r[1], r[2], r[4], r[5]])
-        df_red = pd.DataFrame(red_rows, columns=["Content", "Item", "Player", "Coins", "Points"])
-
-        # Team Gold (J-O → keep J,K,L,N,O)
-        gold_rows = []
-        for r in rows:
-            r += [""] * (15 - len(r))
-            gold_rows.append([r[9], r[10], r[11], r[13], r[14]])
-        df_gold = pd.DataFrame(gold_rows, columns=["Content", "Item", "Player", "Coins", "Points"])
+    # ---------------------------------------------------------
+    # Incremental ingestion
+    # ---------------------------------------------------------
+    def ingest_appended_rows(self) -> bool:
+        """
+        Fold the rows appended to each team block since the last run into the saved
+        aggregates. Only the header rows, and each block's own columns from its
+        watermark (less TAIL_ROWS) down, are fetched, in one batch.
+
+        Returns False, with nothing ingested, so the caller parses the whole sheet, when:
+        there is no usable saved state; the team layout changed; any of the last
+        TAIL_ROWS ingested rows of a block changed; the sheet's revision moved but no
+        rows were appended, so the edit must be somewhere else; or FULL_PARSE_EVERY
+        incremental runs have gone by. An edit further up than TAIL_ROWS made alongside
+        new rows is therefore only picked up by the next full parse.
+        """
+        state = self.load_state()
+        if state is None:
+            return False
+        if state.get("incremental_runs", 0) >= FULL_PARSE_EVERY:
+            print(f"GDOC: {FULL_PARSE_EVERY} incremental runs since the last full parse, parsing the whole sheet")
+            return False
+
+        blocks, watermarks = state["blocks"], state["watermarks"]
+        first_rows = {team_name: max(0, mark["row"] - TAIL_ROWS) for team_name, mark in watermarks.items()}
+
+        # The header rows and every block's new rows in one round trip
+        ranges = [a1_range(self.sheet_name, "1", str(HEADER_ROWS))]
+        ranges += [self.block_range(self.sheet_name, start, first_rows[team_name]) for team_name, start in blocks.items()]
+        header, *block_rows = self.gdoc.get_data_from_ranges(ranges, [0] + [BLOCK_WIDTH] * len(blocks))
+        if header.ndim != 2 or header.shape[0] < HEADER_ROWS or self.detect_team_blocks(header) != blocks:
+            print("GDOC: team layout changed, parsing the whole sheet")
+            return False
+
+        fetched = {}
+        for team_name, rows in zip(blocks, block_rows):
+            mark, first_row = watermarks[team_name]["row"], first_rows[team_name]
+            # Rows already ingested must still read the same
+            if rows.ndim != 2 or hash_rows(block_cells(rows[:mark - first_row])) != watermarks[team_name]["tail_hash"]:
+                print(f"GDOC: ingested rows changed for {team_name}, parsing the whole sheet")
+                return False
+            fetched[team_name] = (rows, first_row)
+
+        # Nothing appended yet the sheet changed: an edit above the tail rows, or elsewhere on the sheet
+        revision = self.gdoc.revision
+        if revision is not None and state.get("revision") not in (None, revision) and not any(
+            (np.char.strip(block_cells(rows[watermarks[team_name]["row"] - first_row:]).astype(str)) != "").any()
+            for team_name, (rows, first_row) in fetched.items()
+        ):
+            print("GDOC: sheet changed with no rows appended, parsing the whole sheet")
+            return False
+
+        self.team_players = {team_name: _team_from_state(team) for team_name, team in state["teams"].items()}
+        # Players with no new rows still need their sheet spelling when a fresh index is used
+        for gdoc_name in state.get("gdoc_names", []):
+            self.name_index.record(gdoc_name, gdoc_name=gdoc_name)
+        self.team_blocks, self.watermarks = blocks, watermarks
+        self.revision, self.incremental_runs = revision, state.get("incremental_runs", 0) + 1
+        appended = {
+            team_name: self.block_frame(rows[watermarks[team_name]["row"] - first_row:])
+            for team_name, (rows, first_row) in fetched.items()
+        }
+        self.ingest_team_frames(appended)
+        for team_name, (rows, first_row) in fetched.items():
+            self.advance_watermark(team_name, rows, first_row)
+        print(f"GDOC: folded in {sum(len(df) for df in appended.values())} rows past the watermarks")
+        return True
+
+    def advance_watermark(self, team_name: str, rows: np.ndarray, first_row: int) -> None:
+        """Move a team's watermark to its last filled row in `rows` (its block, from data row `first_row`)."""
+        cells = block_cells(rows)
+        filled = np.flatnonzero((np.char.strip(cells.astype(str)) != "").any(axis=1))
+        mark = self.watermarks.get(team_name, {}).get("row", 0)
+        if len(filled):
+            mark = max(mark, first_row + int(filled[-1]) + 1)
+        tail = cells[max(0, mark - TAIL_ROWS) - first_row:mark - first_row]
+        self.watermarks[team_name] = {"row": mark, "tail_hash": hash_rows(tail)}
+
+    def load_state(self) -> dict | None:
+        """The saved incremental state, or None if there isn't one that matches this sheet and catalog."""
+        if not os.path.isfile(self.state_fp):
+            return None
+        with open(self.state_fp, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("sheet_name") != self.sheet_name or state.get("catalog") != self.catalog_signature():
+            return None
+        if set(state.get("blocks", {})) != set(state.get("watermarks", {})):
+            return None
+        return state
+
+    def save_state(self) -> None:
+        state = {
+            "sheet_name": self.sheet_name,
+            "catalog": self.catalog_signature(),
+            "blocks": self.team_blocks,
+            "watermarks": self.watermarks,
+            "revision": self.revision,
+            "incremental_runs": self.incremental_runs,
+            "teams": {team_name: _team_to_state(team) for team_name, team in self.team_players.items()},
+            "gdoc_names": [
+                self.name_index.players[key]["gdoc_name"] for team in self.team_players.values() for key in team.players
+            ],
+        }
+        tmp_path = f"{self.state_fp}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_fp)
 
-        return df_red, df_gold
+    def catalog_signature(self) -> list:
+        # Saved aggregates only hold if items are still classified the same way
+        catalog = self.load_catalog()
+        return [catalog.categories, catalog.pattern.pattern]
 
     # ---------------------------------------------------------
     # Internal helpers
     # ---------------------------------------------------------
-    def _ensure_player(self, team_name: str, player: str):
-        players = self.team_players[team_name]["players"]
-        if player not in players:
-            players[player] = {
-                "total_drops": 0,
-                "total_points": 0.0,
-                "total_coins": 0.0,
-                "boss_pets": 0,
-                "jars": 0,
-                "mega_rares": 0,
-                "most_expensive_drop": {"item": None, "value": 0.0},
-                "most_points_item": {"item": None, "points": 0.0}
-            }
+    def _ensure_player(self, team_name: str, key: str) -> PlayerMetrics:
+        """The player stored under normalized name `key`, created on first sight."""
+        players = self.team_players.setdefault(team_name, TeamMetrics()).players
+        if key not in players:
+            players[key] = PlayerMetrics()
+        return players[key]
 
     # ---------------------------------------------------------
     # Core ingestion logic
     # ---------------------------------------------------------
+    def ingest_team_frames(self, team_frames: dict[str, pd.DataFrame]) -> None:
+        for team_name in team_frames:
+            self.team_players.setdefault(team_name, TeamMetrics())
+
+        # Every team's rows are stacked and cleaned in one pass, then split back out by team
+        df_all = self.clean_team_dataframe(pd.concat(team_frames, names=["Team", None]))
+        if not df_all.empty:
+            for team_name, df_team in df_all.groupby(level="Team", sort=False):
+                self.ingest_team_dataframe(df_team, team_name)
+
     def ingest_team_dataframe(self, df_team: pd.DataFrame, team_name: str):
         if df_team.empty:
             return
 
         df = df_team.copy()
         for col in ["Player", "Item", "Coins", "Points"]:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace(",", "").str.strip()
+            # Coins/Points are numeric already after clean_team_dataframe; skip the string round trip
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = clean_text(df[col], remove_commas=True)
 
         df["Coins"] = pd.to_numeric(df.get("Coins", 0), errors="coerce").fillna(0)
         df["Points"] = pd.to_numeric(df.get("Points", 0), errors="coerce").fillna(0)
 
-        df_valid = df[(df["Player"] != "") & (df["Item"] != "")]
-
-        mega_rares = [
-            "scythe of vitur", "twisted bow", "elder maul",
-            "kodai insignia", "tumeken's shadow"
-        ]
-
-        for _, row in df_valid.iterrows():
-            player = row["Player"]
-            item = row["Item"]
-            coins = float(row["Coins"])
-            points = float(row["Points"])
-
-            self._ensure_player(team_name, player)
-            pdata = self.team_players[team_name]["players"][player]
-            totals = self.team_players[team_name]["team_totals"]
-
-            # Drops (exclude bounty/challenge)
-            if not any(x in item.lower() for x in ["bounty daily", "challenge"]):
-                pdata["total_drops"] += 1
-                totals["total_drops"] += 1
-
-            pdata["total_points"] += points
-            pdata["total_coins"] += coins
-            totals["total_coins"] += coins
-
-            if points > pdata["most_points_item"]["points"]:
-                pdata["most_points_item"] = {"item": item, "points": points}
-
-            if "pet" in item.lower():
-                pdata["boss_pets"] += 1
-
-            if item.lower() == "jar":
-                pdata["jars"] += 1
-
-            if any(mr in item.lower() for mr in mega_rares):
-                pdata["mega_rares"] += 1
+        df_valid = df[(df["Player"] != "") & (df["Item"] != "")].reset_index(drop=True)
+        if df_valid.empty:
+            return
 
-            if coins > pdata["most_expensive_drop"]["value"]:
-                pdata["most_expensive_drop"] = {"item": item, "value": coins}
+        # Items are classified once per distinct name, then spread back over the rows
+        item_codes, item_uniques = pd.factorize(df_valid["Item"])
+        catalog = self.load_catalog()
+        categories = catalog.classify(item_uniques)[item_codes]
+        player_codes, player_uniques = pd.factorize(df_valid["Player"])
+        player_keys = [self.name_index.record(name, gdoc_name=name) for name in player_uniques]
+
+        slots = {name: slot for slot, name in enumerate(catalog.categories)}
+        excluded = slots.get(DROP_EXCLUSIONS)
+        flags = pd.DataFrame({
+            "Player": pd.Series(player_keys, dtype=object).to_numpy()[player_codes],
+            "Drops": ~categories[:, excluded] if excluded is not None else np.ones(len(df_valid), dtype=bool),
+            **{name: categories[:, slot] for name, slot in slots.items() if name != DROP_EXCLUSIONS},
+            "Coins": df_valid["Coins"].astype(float),
+            "Points": df_valid["Points"].astype(float),
+        })
+
+        grouped = flags.groupby("Player", sort=False)
+        sums = grouped[flags.columns[1:]].sum()
+        # idxmax keeps the first row holding the max, like the old strict ">" scan
+        top_points = grouped["Points"].idxmax().tolist()
+        top_coins = grouped["Coins"].idxmax().tolist()
+
+        item_names = df_valid["Item"].tolist()
+        coins = flags["Coins"].tolist()
+        points = flags["Points"].tolist()
+        columns = {col: sums[col].tolist() for col in sums.columns}
+        counted = [name for name in slots if name != DROP_EXCLUSIONS]
+        totals = self.team_players.setdefault(team_name, TeamMetrics()).totals
+
+        for i, key in enumerate(sums.index.tolist()):
+            pdata = self._ensure_player(team_name, key)
+            pdata.total_drops += columns["Drops"][i]
+            pdata.total_points += columns["Points"][i]
+            pdata.total_coins += columns["Coins"][i]
+            for name in counted:
+                field = CATEGORY_FIELDS.get(name)
+                if field is not None:
+                    setattr(pdata, field, getattr(pdata, field) + columns[name][i])
+                elif columns[name][i]:
+                    # Only categories the player actually has are stored
+                    pdata.item_counts[name] = pdata.item_counts.get(name, 0) + columns[name][i]
+
+            points_row, coins_row = top_points[i], top_coins[i]
+            if points[points_row] > pdata.most_points_item.value:
+                pdata.most_points_item = ItemRecord(item_names[points_row], points[points_row])
+
+            if coins[coins_row] > pdata.most_expensive_drop.value:
+                pdata.most_expensive_drop = ItemRecord(item_names[coins_row], coins[coins_row])
+
+        totals.total_drops += int(flags["Drops"].sum())
+        totals.total_points += float(flags["Points"].sum())
+        totals.total_coins += float(flags["Coins"].sum())
+
+    def load_catalog(self) -> GDocItemCatalog:
+        """The hunt's own item_catalog.json if it has one, otherwise the default catalog."""
+        if self.catalog is None:
+            fp = self.catalog_fp if os.path.isfile(self.catalog_fp) else DEFAULT_CATALOG_FP
+            self.catalog = GDocItemCatalog.load(fp)
+        return self.catalog
 
     # ---------------------------------------------------------
     # Output
     # ---------------------------------------------------------
-    def write_metrics_to_file(self, path: str):
-        output = {}
-        for team, data in self.team_players.items():
-            output[team] = {
-                "team_totals": {
-                    "total_drops": data["team_totals"]["total_drops"],
-                    "total_points": f'{data["team_totals"]["total_points"]:,.1f}',  # still 0 for now
-                    "total_coins": f'{data["team_totals"]["total_coins"]:,.0f}'
-                },
-                "players": {}
-            }
-
-            for player, pdata in data["players"].items():
-                output[team]["players"][player] = {
-                    "total_drops": pdata["total_drops"],
-                    "total_points": f'{pdata["total_points"]:,.1f}',
-                    "total_coins": f'{pdata["total_coins"]:,.0f}',
-                    "boss_pets": pdata["boss_pets"],
-                    "jars": pdata["jars"],
-                    "mega_rares": pdata["mega_rares"],
-                    "most_expensive_drop": {
-                        "item": pdata["most_expensive_drop"]["item"],
-                        "value": f'{pdata["most_expensive_drop"]["value"]:,.0f}'
-                    },
-                    "most_points_item": {
-                        "item": pdata["most_points_item"]["item"],
-                        "points": f'{pdata["most_points_item"]["points"]:,.1f}'
-                    }
-                }
-
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=2)
+    def build_metrics(self) -> HuntMetrics:
+        return HuntMetrics(teams=self.team_players)
+
+    def write_metrics_to_file(self, path: str, metrics: HuntMetrics | None = None):
+        if metrics is None:
+            metrics = self.build_metrics()
+        metrics.save(path, self.name_index.display_name)
 
     # ---------------------------------------------------------
     # Data cleaning
@@ -195,38 +412,56 @@ class GDocDataParser:
         # Normalize string columns
         for col in ["Content", "Item", "Player"]:
             if col in df.columns:
-                df[col] = df[col].fillna("").astype(str).str.strip()
+                df[col] = clean_text(df[col])
+
+        # Coins/Points as cleaned text first, so a blank cell can still be told apart from 0
+        for col in ["Coins", "Points"]:
+            if col in df.columns:
+                df[col] = clean_text(df[col], remove_commas=True)
+
+        # Drop rows where all columns except 'Points' are empty
+        cols_except_points = [col for col in df.columns if col != "Points"]
+        df = df.loc[~df[cols_except_points].isin(EMPTY_VALUES).all(axis=1)]
 
         # Normalize Coins
         if "Coins" in df.columns:
-            df["Coins"] = (
-                df["Coins"]
-                .fillna(0)
-                .astype(str)
-                .str.replace(",", "")
-                .str.strip()
-                .replace(["", "NULL", "None"], "0")
-            )
-            df["Coins"] = pd.to_numeric(df["Coins"], errors="coerce").fillna(0).astype(int)
+            coins = df["Coins"].replace(["", "NULL", "None"], "0")
+            df["Coins"] = pd.to_numeric(coins, errors="coerce").fillna(0).astype(int)
         else:
             df["Coins"] = 0
 
         # Normalize Points
         if "Points" in df.columns:
-            df["Points"] = (
-                df["Points"]
-                .fillna(0)
-                .astype(str)
-                .str.replace(",", "")
-                .str.strip()
-                .replace(["", "NULL", "None"], "0")
-            )
-            df["Points"] = pd.to_numeric(df["Points"], errors="coerce").fillna(0).astype(float)
+            points = df["Points"].replace(["", "NULL", "None"], "0")
+            df["Points"] = pd.to_numeric(points, errors="coerce").fillna(0).astype(float)
         else:
             df["Points"] = 0.0
 
-        # Drop rows where all columns except 'Points' are empty/NaN
-        cols_except_points = [col for col in df.columns if col != "Points"]
-        df = df.loc[~df[cols_except_points].apply(lambda x: all([v in [None, "", "nan"] for v in x]), axis=1)]
-
         return df
+
+
+# ---------------------------------------------------------
+# Incremental state helpers
+# ---------------------------------------------------------
+STATE_TOTALS = ("total_drops", "total_points", "total_coins")
+
+
+def _team_to_state(team: TeamMetrics) -> dict:
+    # Raw numbers, unlike hunt_metrics.json, so folding new rows in adds up exactly like a full parse
+    return {
+        "players": {name: asdict(player) for name, player in team.players.items()},
+        "totals": {key: getattr(team.totals, key) for key in STATE_TOTALS},
+    }
+
+
+def _team_from_state(data: dict) -> TeamMetrics:
+    team = TeamMetrics()
+    for name, player in data["players"].items():
+        team.players[name] = PlayerMetrics(**{
+            **player,
+            "most_expensive_drop": ItemRecord(**player["most_expensive_drop"]),
+            "most_points_item": ItemRecord(**player["most_points_item"]),
+        })
+    for key in STATE_TOTALS:
+        setattr(team.totals, key, data["totals"][key])
+    return team
@@ -1,57 +1,141 @@
 import os
 import logging
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
 import numpy as np
+from .GDocClient import GDocClient, DEFAULT_CREDS_PATH
+from .GDocResponseCache import GDocResponseCache
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+def to_grid(values: list[list], min_width: int = 0) -> np.ndarray:
+    """
+    Pad the ragged rows the Sheets API returns (trailing blank cells are omitted)
+    into one 2D object array, filled with "" in a single pass.
+    """
+    width = max([min_width, *(len(row) for row in values)])
+    grid = np.full((len(values), width), "", dtype=object)
+    for i, row in enumerate(values):
+        grid[i, :len(row)] = row
+    return grid
+
+
+def column_letter(index: int) -> str:
+    """A1-notation letters for a 0-based column index: 0 -> "A", 26 -> "AA"."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def a1_range(sheet_name: str, start: str = "", end: str = "") -> str:
+    """
+    A1 notation for cells start:end of a tab, e.g. ("Bot Config", "A2", "D") -> "'Bot Config'!A2:D".
+    The tab name is always quoted, so names with spaces or "!" work; no cells means the whole tab.
+    """
+    quoted = "'" + sheet_name.replace("'", "''") + "'"
+    return f"{quoted}!{start}:{end}" if start else quoted
+
+
 class GDocDataRetriever:
-    def __init__(self, sheet_id: str) -> None:
-        self.service = None
-        self.sheets = None
+    def __init__(self, sheet_id: str, sheets=None, drive=None, cache: GDocResponseCache | None = None) -> None:
+        # The process-wide API client; None when the resources are passed in
+        self.client: GDocClient | None = None
+        # Sheets API spreadsheets() resource
+        self.sheets = sheets
+        # Drive files() resource, only used to read the spreadsheet's revision
+        self.drive = drive
         self.sheet_id = sheet_id
-        self.creds_path = ""
-        self.credentials = None
-        self.on_startup()
+        self.creds_path = DEFAULT_CREDS_PATH
+        self.cache = cache if cache is not None else GDocResponseCache()
+        # The revision the last get_data_from_ranges result was read at; None if unknown
+        self.revision: str | None = None
+        if self.sheets is None:
+            self.on_startup()
 
     def on_startup(self) -> None:
-        """Initialize the Google Sheets API client."""
+        """Attach the shared Google API client, creating it on first use in this process."""
         try:
-            self.creds_path = "src/conf/google_auth.json"
-            logger.info(f"GOOGLE CREDS PATH: {self.creds_path}")
-
-            if not self.creds_path or not os.path.exists(self.creds_path):
-                logger.error("Missing or invalid GOOGLE_CREDENTIALS_PATH")
+            if not os.path.exists(self.creds_path):
+                logger.error(f"Missing or invalid Google credentials file: {self.creds_path}")
                 return
 
-            self.credentials = service_account.Credentials.from_service_account_file(
-                self.creds_path,
-                scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-            )
-
-            self.service = build("sheets", "v4", credentials=self.credentials)
-            self.sheets = self.service.spreadsheets()
-            logger.info("Google Sheets API client initialized successfully.")
+            self.client = GDocClient.shared(self.creds_path)
+            self.sheets = self.client.sheets
+            self.drive = self.client.drive
 
         except Exception as e:
             logger.error(f"Error during GDoc setup: {e}")
 
+    def execute(self, request):
+        """Run an API request, on this thread's reused connection when using the shared client."""
+        if self.client is not None:
+            return self.client.execute(request)
+        return request.execute()
+
     def set_sheet_id(self, sheet_id: str) -> None:
         """Set the target Google Sheet ID."""
         self.sheet_id = sheet_id
 
     def get_data_from_sheet(self, sheet_name: str) -> np.ndarray:
-        """Fetch data from a sheet and return as a NumPy array."""
-        logger.info(f"Retrieving data from sheet '{sheet_name}'...")
+        """Fetch data from a sheet and return it as a 2D object array, short rows padded with ""."""
+        return self.get_data_from_range(sheet_name)
+
+    def get_data_from_range(self, range_name: str, min_width: int = 0) -> np.ndarray:
+        """Fetch an A1-notation range (e.g. "Inputs!A120:O") as a 2D object array at least min_width wide."""
+        return self.get_data_from_ranges([range_name], [min_width])[0]
+
+    def get_data_from_ranges(self, ranges: list[str], min_widths: list[int] | None = None) -> list[np.ndarray]:
+        """
+        Fetch several A1 ranges, from any tabs, in one values.batchGet round trip.
+        Returns one padded 2D array per range, in the order asked for. Ranges the cache
+        can vouch for aren't fetched; if none are left, nothing is.
+        """
+        min_widths = min_widths or [0] * len(ranges)
+        revision = {}
+
+        def current_revision() -> str | None:
+            # One lightweight call at most per request, however many ranges need it
+            if "value" not in revision:
+                revision["value"] = self.get_revision()
+            return revision["value"]
+
+        values = self.cache.get(self.sheet_id, ranges, current_revision)
+        missing = [range_name for range_name in ranges if range_name not in values]
+        if missing:
+            logger.info(f"Retrieving {len(missing)} ranges: {', '.join(missing)}")
+            try:
+                # Read first, so a change made during the fetch can't be cached as the new revision
+                fetched_revision = current_revision()
+                result = self.execute(self.sheets.values().batchGet(spreadsheetId=self.sheet_id, ranges=missing))
+                fetched = {
+                    range_name: value_range.get("values", [])
+                    for range_name, value_range in zip(missing, result.get("valueRanges", []))
+                }
+            except Exception as e:
+                logger.error(f"Unable to fetch ranges {missing}: {e}")
+                fetched = {}
+            if fetched:
+                self.cache.put(self.sheet_id, fetched, fetched_revision)
+            values.update(fetched)
+            self.revision = fetched_revision if fetched else None
+        else:
+            self.revision = self.cache.revision_of(self.sheet_id, ranges[0]) if ranges else None
+
+        logger.info(f"Sheet ranges served: {self.cache.stats()}")
+        return [
+            to_grid(values[range_name], min_width) if range_name in values else np.array([], dtype=object)
+            for range_name, min_width in zip(ranges, min_widths)
+        ]
+
+    def get_revision(self) -> str | None:
+        """The spreadsheet's Drive version, which changes with every edit; None if it can't be read."""
+        if self.drive is None:
+            return None
         try:
-            result = self.sheets.values().get(spreadsheetId=self.sheet_id, range=sheet_name).execute()
-            values = result.get("values", [])
-            data_array = np.array(values, dtype=object)
-            logger.info(f"Retrieved {data_array.shape[0]} rows from '{sheet_name}'.")
-            return data_array
+            return str(self.execute(self.drive.get(fileId=self.sheet_id, fields="version"))["version"])
         except Exception as e:
-            logger.error(f"Unable to fetch data from '{sheet_name}': {e}")
-            return np.array([], dtype=object)
+            logger.warning(f"Unable to read the revision of sheet {self.sheet_id}: {e}")
+            return None
@@ -0,0 +1,49 @@
+import json
+import os
+import re
+import numpy as np
+
+DEFAULT_CATALOG_FP = os.path.join(os.path.dirname(__file__), "item_catalog.json")
+
+
+class GDocItemCatalog:
+    """
+    Item categories for drop-log rows, loaded from a data file shaped like
+
+        {category: {"contains": [text, ...], "exact": [item, ...]}}
+
+    e.g. {"jars": {"exact": ["jar"]}, "pets": {"contains": ["pet"]}}, matched against
+    the lowercased item name. The file is compiled once into a single regex with one
+    lookahead group per category, so one scan of an item name finds every category
+    it falls in, overlapping ones included.
+    """
+
+    def __init__(self, categories: dict[str, dict[str, list[str]]]):
+        self.categories = list(categories)
+
+        parts = []
+        # Regex group number -> category slot (categories with nothing to match get no group)
+        self.group_slots: list[int] = []
+        for slot, name in enumerate(self.categories):
+            spec = categories[name]
+            alternatives = [re.escape(text.lower()) for text in spec.get("contains", [])]
+            alternatives += [f"^{re.escape(item.lower())}$" for item in spec.get("exact", [])]
+            if alternatives:
+                parts.append(f"(?=({'|'.join(alternatives)}))?")
+                self.group_slots.append(slot)
+        self.pattern = re.compile("".join(parts))
+
+    @classmethod
+    def load(cls, filepath: str = DEFAULT_CATALOG_FP) -> "GDocItemCatalog":
+        with open(filepath, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def classify(self, item_names) -> np.ndarray:
+        """items x categories bool matrix. Callers pass distinct names and spread the rows back out."""
+        matrix = np.zeros((len(item_names), len(self.categories)), dtype=bool)
+        for row, name in enumerate(item_names):
+            for match in self.pattern.finditer(str(name).lower()):
+                for slot, hit in zip(self.group_slots, match.groups()):
+                    if hit is not None:
+                        matrix[row, slot] = True
+        return matrix
@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from HuntPaths import gdoc_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 60
+
+
+class GDocResponseCache:
+    """
+    On-disk cache of Sheets values responses, one JSON file per spreadsheet:
+
+        {"ranges": {"'Inputs'!A3:F": {"values": [[...], ...], "revision": "412", "fetched_at": 1730000000.0}}}
+
+    A request whose entries are all younger than the TTL is served without asking
+    Google anything. Otherwise the spreadsheet's revision (its Drive version, read by
+    the caller at most once per request) decides: entries fetched at that revision are
+    served, the rest are fetched again. Without a revision, entries only live for the
+    TTL.
+
+    hits / misses count ranges served from the cache vs fetched.
+    """
+
+    def __init__(self, cache_dir: str | None = None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.cache_dir = cache_dir or str(gdoc_cache_dir())
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.entries: dict[str, dict[str, dict]] = {}
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def get(self, sheet_id: str, ranges: list[str], current_revision) -> dict[str, list]:
+        """
+        Range -> cached rows, for every range in `ranges` that can be served.
+        current_revision() is only called when something has expired or is missing. A
+        request is served as one snapshot: once anything has to be fetched, cached
+        ranges are only served if they are from the revision being fetched.
+        """
+        entries = self._load(sheet_id)
+        now = time.time()
+        found = {range_name: entries[range_name] for range_name in ranges if range_name in entries}
+        expired = [range_name for range_name, entry in found.items() if now - entry["fetched_at"] >= self.ttl_seconds]
+
+        if expired or len(found) < len(set(ranges)):
+            revision = current_revision()
+            found = {
+                range_name: entry for range_name, entry in found.items()
+                if revision is not None and entry["revision"] == revision
+            }
+            # Unchanged since they were fetched, good for another TTL
+            renewed = [range_name for range_name in expired if range_name in found]
+            for range_name in renewed:
+                found[range_name]["fetched_at"] = now
+            if renewed:
+                self._save(sheet_id)
+
+        self.hits += len(found)
+        self.misses += len(set(ranges)) - len(found)
+        return {range_name: entry["values"] for range_name, entry in found.items()}
+
+    def revision_of(self, sheet_id: str, range_name: str) -> str | None:
+        """The revision a cached range was fetched at; every entry of a sheet shares it when it is known."""
+        entry = self._load(sheet_id).get(range_name)
+        return entry["revision"] if entry else None
+
+    def put(self, sheet_id: str, values: dict[str, list], revision: str | None) -> None:
+        """Store freshly fetched rows per range, read at `revision` (read before the fetch)."""
+        entries = self._load(sheet_id)
+        now = time.time()
+        # Entries from an older revision, or expired ones without one, can never be served again
+        for range_name in list(entries):
+            entry = entries[range_name]
+            if (revision is not None and entry["revision"] != revision) or \
+                    (entry["revision"] is None and now - entry["fetched_at"] >= self.ttl_seconds):
+                del entries[range_name]
+
+        for range_name, rows in values.items():
+            entries[range_name] = {"values": rows, "revision": revision, "fetched_at": now}
+        self._save(sheet_id)
+
+    # -------------------------
+    # Storage
+    # -------------------------
+    def _path(self, sheet_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{sheet_id}.json")
+
+    def _load(self, sheet_id: str) -> dict[str, dict]:
+        if sheet_id not in self.entries:
+            path = self._path(sheet_id)
+            entries = {}
+            if os.path.isfile(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        entries = json.load(f).get("ranges", {})
+                except (OSError, ValueError):
+                    # A damaged cache file only costs a refetch
+                    entries = {}
+            self.entries[sheet_id] = entries
+        return self.entries[sheet_id]
+
+    def _save(self, sheet_id: str) -> None:
+        """Write atomically through a temp file of our own, so concurrent writers can't collide."""
+        path = self._path(sheet_id)
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{sheet_id}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"ranges": self.entries[sheet_id]}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The cache only saves round trips; the values already fetched are still served
+            logger.warning(f"Unable to write the sheet cache {path}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
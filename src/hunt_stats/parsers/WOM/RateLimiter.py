@@ -0,0 +1,192 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by the blocking and asyncio request paths.
+
+    The bucket starts full, so up to `capacity` requests can go out back to back
+    before callers are paced at `rate` requests per second. Tokens are reserved
+    under a short lock and the wait happens outside it, which keeps
+    `acquire_async` safe to await from the bot's event loop.
+
+    A bucket alone lets the initial burst and the refill add up: `capacity` requests
+    at once, then `rate` more per second on top. With `window` set, the start times
+    of the last `capacity` requests are also kept, and no request starts until the
+    oldest of them is `window` seconds old, so no window ever sees more than
+    `capacity` requests.
+    """
+
+    def __init__(self, rate: float, capacity: int, window: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.window = window
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        # Start times of the last `capacity` reservations, oldest first
+        self.starts: deque[float] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # updated_at sits in the future while the bucket is paused
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, self.updated_at - now)
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            if self.window is not None:
+                # Starts never go backwards (e.g. after a rate increase), so starts[0] stays the oldest
+                if self.starts:
+                    wait = max(wait, self.starts[-1] - now)
+                if len(self.starts) == self.capacity:
+                    wait = max(wait, self.starts[0] + self.window - now)
+                self.starts.append(now + wait)
+            return wait
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def limit_tokens(self, tokens: float) -> None:
+        """Never hold more tokens than the server says are left."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`, then allow a single request through."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = min(self.tokens, 1.0)
+            self.updated_at = max(self.updated_at, now + seconds)
+
+    def acquire(self) -> None:
+        """Block the current thread until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _header(headers, *names: str) -> str | None:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_reset(value: str | None) -> float | None:
+    """Parse a rate-limit reset header as seconds from now (accepts deltas and epoch times)."""
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    # Anything this large is an epoch timestamp rather than a delta
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+class AdaptiveRateController:
+    """
+    Adjusts a TokenBucket from the WOM rate-limit headers and decides how long to
+    wait before retrying a failed request.
+
+    - RateLimit-Remaining caps the local bucket, and an exhausted window pauses it
+      until RateLimit-Reset.
+    - A 429 pauses every caller for Retry-After and halves the request rate; each
+      success then wins back a little of it, up to the configured base rate.
+    - Other transient failures are retried with exponential backoff and full
+      jitter, unless the server said exactly how long to wait.
+    """
+
+    RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+    def __init__(self, bucket: TokenBucket, max_attempts: int = 5, base_delay: float = 2.0,
+                 max_delay: float = 60.0) -> None:
+        self.bucket = bucket
+        self.base_rate = bucket.rate
+        self.min_rate = bucket.rate / 8
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def observe(self, status: int, headers) -> None:
+        """Feed one response's status and headers back into the limiter."""
+        remaining = _header(headers, "RateLimit-Remaining", "X-RateLimit-Remaining")
+        reset = parse_reset(_header(headers, "RateLimit-Reset", "X-RateLimit-Reset"))
+
+        if remaining is not None:
+            try:
+                remaining = float(remaining)
+            except ValueError:
+                remaining = None
+
+        if remaining is not None:
+            self.bucket.limit_tokens(remaining)
+            if remaining <= 0 and reset:
+                self.bucket.pause(reset)
+
+        if status == 429:
+            retry_after = parse_retry_after(_header(headers, "Retry-After"))
+            self.bucket.pause(retry_after if retry_after is not None else (reset or self.base_delay))
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+        elif status < 400 and self.bucket.rate < self.base_rate:
+            self.bucket.set_rate(min(self.base_rate, self.bucket.rate + self.base_rate / 10))
+
+    def retry_delay(self, attempt: int, status: int | None = None, headers=None) -> float | None:
+        """
+        Seconds to wait before retrying after a failed attempt (0-based), or None when the
+        request should not be retried. A status of None means a connection-level error.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if status is not None and status not in self.RETRYABLE_STATUSES:
+            return None
+
+        # observe() has already paused the shared bucket for a 429, so the retry just queues on it
+        if status == 429:
+            return 0.0
+
+        retry_after = parse_retry_after(_header(headers, "Retry-After")) if headers is not None else None
+        if retry_after is not None:
+            return retry_after
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
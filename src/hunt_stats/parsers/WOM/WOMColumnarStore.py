@@ -0,0 +1,128 @@
+import os
+import numpy as np
+from parsers.WOM.WOMMetrics import HUNT_METRICS
+from parsers.WOM.WOMGains import load_player_gains
+from HuntPaths import hunt_dir
+
+METRIC_TYPES = ("skills", "bosses", "activities")
+
+
+class WOMColumnarStore:
+    """
+    Columnar snapshot of a hunt's WOM gains: one dense players x metrics matrix per
+    metric group, plus the player and metric name tables that index them.
+
+    On disk every table is a plain .npy file, so a snapshot opens with mmap and is
+    read without decoding any JSON:
+
+        columnar/players.npy                     player names (row index)
+        columnar/{skills,bosses,activities}.npy  int64 gained matrices
+        columnar/{skills,bosses,activities}_metrics.npy  metric names (column index)
+    """
+
+    def __init__(self, players: np.ndarray, metrics: dict[str, np.ndarray], matrices: dict[str, np.ndarray]):
+        self.players = players
+        self.metrics = metrics
+        self.matrices = matrices
+        self.player_rows = {name: row for row, name in enumerate(players.tolist())}
+
+    # -------------------------
+    # Building
+    # -------------------------
+    @classmethod
+    def from_gains(cls, player_gains: dict[str, dict]) -> "WOMColumnarStore":
+        """Build a store from {player: projected gains} as returned by load_player_gains."""
+        players = list(player_gains)
+        metrics = {}
+        matrices = {}
+
+        for metric_type in METRIC_TYPES:
+            # HUNT_METRICS first so columns keep WOM's order, then anything else seen
+            names = {metric: None for metric in HUNT_METRICS.get(metric_type, [])}
+            for gains in player_gains.values():
+                names.update(dict.fromkeys(gains.get(metric_type, {})))
+            names = list(names)
+            columns = {metric: col for col, metric in enumerate(names)}
+
+            matrix = np.zeros((len(players), len(names)), dtype=np.int64)
+            for row, gains in enumerate(player_gains.values()):
+                for metric, gained in gains.get(metric_type, {}).items():
+                    matrix[row, columns[metric]] = gained
+
+            metrics[metric_type] = np.array(names, dtype=str)
+            matrices[metric_type] = matrix
+
+        return cls(np.array(players, dtype=str), metrics, matrices)
+
+    @classmethod
+    def from_players_dir(cls, players_dir: str) -> "WOMColumnarStore":
+        """One-shot conversion from a directory of per-player JSON files."""
+        player_gains = {}
+        with os.scandir(players_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json"):
+                    player_gains[entry.name.replace(".json", "")] = load_player_gains(entry.path)
+        return cls.from_gains(player_gains)
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "players.npy"), self.players)
+        for metric_type in METRIC_TYPES:
+            np.save(os.path.join(directory, f"{metric_type}.npy"), self.matrices[metric_type])
+            np.save(os.path.join(directory, f"{metric_type}_metrics.npy"), self.metrics[metric_type])
+
+    @staticmethod
+    def is_current(directory: str, source_dirs: list[str]) -> bool:
+        """Whether the snapshot in `directory` is newer than every file in `source_dirs`."""
+        with os.scandir(directory) as entries:
+            written = [entry.stat().st_mtime for entry in entries if entry.name.endswith(".npy")]
+        if not written:
+            return False
+        snapshot_time = min(written)
+
+        for source_dir in source_dirs:
+            if not os.path.isdir(source_dir):
+                continue
+            with os.scandir(source_dir) as entries:
+                if any(entry.name.endswith(".json") and entry.stat().st_mtime > snapshot_time for entry in entries):
+                    return False
+        return True
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str | None = "r") -> "WOMColumnarStore":
+        players = np.load(os.path.join(directory, "players.npy"))
+        metrics = {}
+        matrices = {}
+        for metric_type in METRIC_TYPES:
+            metrics[metric_type] = np.load(os.path.join(directory, f"{metric_type}_metrics.npy"))
+            matrices[metric_type] = np.load(os.path.join(directory, f"{metric_type}.npy"), mmap_mode=mmap_mode)
+        return cls(players, metrics, matrices)
+
+    # -------------------------
+    # Access
+    # -------------------------
+    def __contains__(self, player_name: str) -> bool:
+        return player_name in self.player_rows
+
+    def player_gains(self, player_name: str) -> dict:
+        """A player's non-zero gains in the same {group: {metric: gained}} shape as load_player_gains."""
+        row = self.player_rows[player_name]
+        gains = {}
+        for metric_type in METRIC_TYPES:
+            values = np.asarray(self.matrices[metric_type][row])
+            nonzero = np.flatnonzero(values)
+            gains[metric_type] = dict(zip(self.metrics[metric_type][nonzero].tolist(), values[nonzero].tolist()))
+        return gains
+
+
+# -------------------------
+# Example usage
+# -------------------------
+if __name__ == "__main__":
+    hunt_14_dir = hunt_dir("14")
+    store = WOMColumnarStore.from_players_dir(str(hunt_14_dir / "players"))
+    store.save(str(hunt_14_dir / "columnar"))
+    print(f"Converted {len(store.players)} players to {hunt_14_dir / 'columnar'}")
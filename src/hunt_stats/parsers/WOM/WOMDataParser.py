@@ -1,5 +1,18 @@
 import json
 import os
+import numpy as np
+from parsers.WOM.WOMMetrics import HUNT_METRICS
+from parsers.WOM.WOMColumnarStore import WOMColumnarStore
+from parsers.WOM.WOMMetricsEngine import WOMMetricsEngine
+from parsers.WOM.WOMMetricRegistry import WOMMetricRegistry, DEFAULT_REGISTRY_FP
+from HuntMetrics import HuntMetrics, PlayerMetrics, WOMMetrics, BossKills
+from PlayerNameIndex import PlayerNameIndex, normalize_name
+from HuntPaths import hunt_dir
+from PlayerNameMatcher import PlayerNameMatcher, NameMatch
+
+
+# hunt_metrics.json has always listed every clue tier, zeros included
+DENSE_GROUPS = ("clues",)
 
 
 def load_json_data(filepath) -> dict:
@@ -7,202 +20,199 @@ def load_json_data(filepath) -> dict:
         return json.load(f)
 
 
-def save_json_data(filepath: str, data: dict) -> None:
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-
 class WOMDataParser:
-    def __init__(self, hunt_edition: str):
+    def __init__(self, hunt_edition: str, hunt_metrics: HuntMetrics | None = None,
+                 name_index: PlayerNameIndex | None = None, base_dir: str | None = None):
         self.hunt_edition = hunt_edition
 
-        self.players_dir = os.path.join("src", "hunt-stats", "data", f"Hunt-{hunt_edition}", "players")
-        self.competition_fp = os.path.join("src", "hunt-stats", "data", f"Hunt-{hunt_edition}", "competition.json")
-        self.hunt_metrics_fp = os.path.join("src", "hunt-stats", "data", f"Hunt-{hunt_edition}", "hunt_metrics.json")
+        # base_dir is the hunt's directory under HuntPaths.DATA_DIR by default
+        self.base_dir = base_dir or str(hunt_dir(hunt_edition))
+        self.players_dir = os.path.join(self.base_dir, "players")
+        self.metrics_dir = os.path.join(self.base_dir, "metrics")
+        self.columnar_dir = os.path.join(self.base_dir, "columnar")
+        self.competition_fp = os.path.join(self.base_dir, "competition.json")
+        self.hunt_metrics_fp = os.path.join(self.base_dir, "hunt_metrics.json")
+        # A hunt can ship its own categories; otherwise the defaults next to this module are used
+        self.categories_fp = os.path.join(self.base_dir, "metric_categories.json")
+        self.name_index_fp = os.path.join(self.base_dir, "player_index.json")
 
         self.competition_data = load_json_data(self.competition_fp)
-        self.hunt_metrics_data = load_json_data(self.hunt_metrics_fp)
-
-        # Build player index (player name -> player object)
+        self.columnar_store: WOMColumnarStore | None = None
+        # Take the GDoc metrics in memory when the caller already has them
+        if hunt_metrics is None:
+            hunt_metrics = HuntMetrics.load(self.hunt_metrics_fp)
+        self.hunt_metrics = hunt_metrics
+
+        # Every name below is matched on its normalized form, so casing and separators don't matter
+        self.name_index = name_index if name_index is not None else PlayerNameIndex.load(self.name_index_fp)
+        participations = self.competition_data.get("participations", [])
+        self.name_index.add_participants(participations)
+        self.name_index.rekey_players(self.hunt_metrics)
+
+        # Build player index (WOM-side normalized name -> player object)
         self.player_index = self._build_player_index()
 
-        # Build EHB lookup (player name -> EHB)
+        # Build EHB lookup (normalized name -> EHB)
         self.ehb_by_player = {
-            p["player"]["displayName"]: p["progress"]["gained"]
-            for p in self.competition_data.get("participations", [])
+            normalize_name(p["player"]["displayName"]): p["progress"]["gained"]
+            for p in participations
             if p.get("player") and p["player"].get("displayName")
         }
 
     # -------------------------
     # Helpers
     # -------------------------
-    def _build_player_index(self) -> dict:
-        index = {}
-        for team_data in self.hunt_metrics_data.values():
-            for player_name, player_obj in team_data.get("players", {}).items():
-                index[player_name] = player_obj
-        return index
+    def _build_player_index(self) -> dict[str, PlayerMetrics]:
+        # Confirmed aliases point sheet spellings at the WOM name they belong to
+        return {
+            self.name_index.resolve(player_name): player_obj
+            for _, player_name, player_obj in self.hunt_metrics.players()
+        }
 
-    def _get_player_obj(self, player_name: str) -> dict | None:
-        return self.player_index.get(player_name)
+    def _get_player_obj(self, player_key: str) -> PlayerMetrics | None:
+        return self.player_index.get(player_key)
 
-    def _ensure_wom_bucket(self, player_obj: dict) -> dict:
-        if "wom" not in player_obj:
-            player_obj["wom"] = {}
-        return player_obj["wom"]
+    def _ensure_wom_bucket(self, player_obj: PlayerMetrics) -> WOMMetrics:
+        if player_obj.wom is None:
+            player_obj.wom = WOMMetrics()
+        return player_obj.wom
 
     # -------------------------
-    # Calculations
+    # Player data
     # -------------------------
-    def calculate_player_ehb(self) -> None:
-        for player_name, ehb in self.ehb_by_player.items():
-            player_obj = self._get_player_obj(player_name)
-            if not player_obj:
-                continue
-            wom = self._ensure_wom_bucket(player_obj)
-            wom["ehb"] = ehb
+    def load_store(self) -> WOMColumnarStore:
+        """
+        Every player's gains as a players x metrics store, decoding each source once.
+        Sources in order of preference: the columnar snapshot (only while nothing has
+        been fetched since it was written), the per-metric layout written by
+        WOMDataRetriever.run_bulk, then the per-player files (compact or full WOM
+        payloads).
+        """
+        if os.path.isdir(self.columnar_dir):
+            if WOMColumnarStore.is_current(self.columnar_dir, [self.players_dir, self.metrics_dir]):
+                return WOMColumnarStore.load(self.columnar_dir)
+            print("Columnar snapshot is older than the fetched gains; reading those instead")
+        if os.path.isdir(self.metrics_dir):
+            return WOMColumnarStore.from_gains(self.load_metric_data())
+        return WOMColumnarStore.from_players_dir(self.players_dir)
+
+    def load_metric_data(self) -> dict:
+        """Rebuild per-player gains from the per-metric files in one scan."""
+        player_data = {}
+        # Keep WOM's metric order so ties (e.g. most killed boss) break the same way as per-player files
+        metric_order = {metric: i for i, metric in enumerate(m for names in HUNT_METRICS.values() for m in names)}
+        with os.scandir(self.metrics_dir) as entries:
+            metric_names = [entry.name.replace(".json", "") for entry in entries if entry.name.endswith(".json")]
+        metric_names.sort(key=lambda metric: (metric_order.get(metric, len(metric_order)), metric))
+
+        for metric in metric_names:
+            metric_data = load_json_data(os.path.join(self.metrics_dir, f"{metric}.json"))
+            metric_type = metric_data["type"]
+
+            for player_name, gained in metric_data["gained"].items():
+                gains = player_data.setdefault(player_name, {"skills": {}, "bosses": {}, "activities": {}})
+                if gained:
+                    gains[metric_type][metric] = gained
+
+        return player_data
 
-    def calculate_total_bosses_killed(self) -> None:
-        for file in os.listdir(self.players_dir):
-            if not file.endswith(".json"):
-                continue
-            player_name = file.replace(".json", "")
-            player_obj = self._get_player_obj(player_name)
-            if not player_obj:
-                continue
-            wom = self._ensure_wom_bucket(player_obj)
-            wom["boss_kills"] = 0
-            player_data = load_json_data(os.path.join(self.players_dir, file))
-            for boss_info in player_data["data"]["bosses"].values():
-                wom["boss_kills"] += boss_info.get("kills", {}).get("gained", 0)
-
-    def calculate_total_raids_killed(self) -> None:
-        for file in os.listdir(self.players_dir):
-            if not file.endswith(".json"):
-                continue
-            player_name = file.replace(".json", "")
-            player_obj = self._get_player_obj(player_name)
-            if not player_obj:
-                continue
-            wom = self._ensure_wom_bucket(player_obj)
-            wom.update({"raids": 0, "cox": 0, "tob": 0, "toa": 0})
-            player_data = load_json_data(os.path.join(self.players_dir, file))
-            for boss_name, boss_info in player_data["data"]["bosses"].items():
-                kills = boss_info.get("kills", {}).get("gained", 0)
-                if "chambers_of_xeric" in boss_name:
-                    wom["cox"] += kills
-                    wom["raids"] += kills
-                elif "theatre_of_blood" in boss_name:
-                    wom["tob"] += kills
-                    wom["raids"] += kills
-                elif "tombs_of_amascut" in boss_name:
-                    wom["toa"] += kills
-                    wom["raids"] += kills
-
-    def calculate_total_barrows_killed(self) -> None:
-        for file in os.listdir(self.players_dir):
-            if not file.endswith(".json"):
-                continue
-            player_name = file.replace(".json", "")
-            player_obj = self._get_player_obj(player_name)
-            if not player_obj:
-                continue
-            wom = self._ensure_wom_bucket(player_obj)
-            wom["barrows"] = 0
-            player_data = load_json_data(os.path.join(self.players_dir, file))
-            for boss_name, boss_info in player_data["data"]["bosses"].items():
-                if "barrows_chests" in boss_name:
-                    wom["barrows"] += boss_info.get("kills", {}).get("gained", 0)
-
-    def calculate_total_clues_completed(self) -> None:
-        for file in os.listdir(self.players_dir):
-            if not file.endswith(".json"):
-                continue
-            player_name = file.replace(".json", "")
-            player_obj = self._get_player_obj(player_name)
-            if not player_obj:
-                continue
-            wom = self._ensure_wom_bucket(player_obj)
-            wom["clues"] = {"total": 0, "beginner": 0, "easy": 0, "medium": 0, "hard": 0, "elite": 0, "master": 0}
-            player_data = load_json_data(os.path.join(self.players_dir, file))
-            for activity_name, activity_info in player_data["data"]["activities"].items():
-                gained = activity_info.get("score", {}).get("gained", 0)
-                if "clue_scrolls_all" in activity_name:
-                    wom["clues"]["total"] += gained
-                elif "clue_scrolls_beginner" in activity_name:
-                    wom["clues"]["beginner"] += gained
-                elif "clue_scrolls_easy" in activity_name:
-                    wom["clues"]["easy"] += gained
-                elif "clue_scrolls_medium" in activity_name:
-                    wom["clues"]["medium"] += gained
-                elif "clue_scrolls_hard" in activity_name:
-                    wom["clues"]["hard"] += gained
-                elif "clue_scrolls_elite" in activity_name:
-                    wom["clues"]["elite"] += gained
-                elif "clue_scrolls_master" in activity_name:
-                    wom["clues"]["master"] += gained
-
-    def calculate_total_xp(self) -> None:
-        for file in os.listdir(self.players_dir):
-            if not file.endswith(".json"):
-                continue
-            player_name = file.replace(".json", "")
-            player_obj = self._get_player_obj(player_name)
-            if not player_obj:
-                continue
-            wom = self._ensure_wom_bucket(player_obj)
-            player_data = load_json_data(os.path.join(self.players_dir, file))
-            wom["xp_gained"] = player_data["data"]["skills"]["overall"]["experience"]["gained"]
-
-    def calculate_most_killed_boss(self) -> None:
-        for file in os.listdir(self.players_dir):
-            if not file.endswith(".json"):
+    # -------------------------
+    # Name matching
+    # -------------------------
+    def match_unmatched_players(self) -> list[NameMatch]:
+        """
+        Fuzzy-match sheet players that have no WOM participant to the participants
+        nobody has claimed. Every match is saved as pending, with its score, until it
+        is confirmed (scripts/player_aliases.py); confident ones are also applied to
+        this run. Rejected pairings are skipped.
+        """
+        unmatched = [key for key in self.player_index if key not in self.ehb_by_player]
+        unclaimed = [key for key in self.ehb_by_player if key not in self.player_index]
+        if not unmatched or not unclaimed:
+            return []
+
+        matches = PlayerNameMatcher(unclaimed).match(unmatched)
+        for m in matches:
+            if not self.name_index.propose_alias(m.name, m.match, m.score):
                 continue
+            if m.confident:
+                self.name_index.apply_for_run(m.name, m.match)
+                self.player_index[m.match] = self.player_index.pop(m.name)
+                print(f"Matched '{m.name}' to WOM player '{m.match}' ({m.score:.2f}) for this run, pending confirmation")
+            else:
+                print(f"Possible match '{m.name}' -> WOM player '{m.match}' ({m.score:.2f}), not applied")
+        return matches
 
-            player_name = file.replace(".json", "")
+    # -------------------------
+    # Calculations
+    # -------------------------
+    def calculate_player_ehb(self) -> None:
+        for player_name, ehb in self.ehb_by_player.items():
             player_obj = self._get_player_obj(player_name)
             if not player_obj:
                 continue
-
             wom = self._ensure_wom_bucket(player_obj)
-
-            player_data = load_json_data(os.path.join(self.players_dir, file))
-            bosses = player_data.get("data", {}).get("bosses", {})
-
-            most_killed_boss = None
-            most_kills = 0
-
-            for boss_name, boss_info in bosses.items():
-                kills = boss_info.get("kills", {}).get("gained", 0)
-
-                if kills > most_kills:
-                    most_kills = kills
-                    most_killed_boss = boss_name
-
-            # Store result in WOM bucket
-            if most_killed_boss is not None:
-                wom["most_killed_boss"] = {
-                    "boss": most_killed_boss,
-                    "kills": most_kills
-                }
-
+            wom.ehb = ehb
+
+    def calculate_player_metrics(self, engine: WOMMetricsEngine) -> None:
+        """Derive every WOM metric for all tracked players in one vectorized pass."""
+        # Player files keep whatever name they were saved under; the index maps them to players
+        file_keys = self.name_index.add_file_keys(engine.store.player_rows)
+        tracked = [
+            (file_keys[file_key], row)
+            for file_key, row in engine.store.player_rows.items()
+            if self._get_player_obj(file_keys[file_key])
+        ]
+        rows = np.array([row for _, row in tracked], dtype=np.int64)
+
+        for (player_key, _), metrics in zip(tracked, engine.player_metrics(rows, DENSE_GROUPS)):
+            wom = self._ensure_wom_bucket(self._get_player_obj(player_key))
+            wom.boss_kills = metrics["boss_kills"]
+            wom.xp_gained = metrics["xp_gained"]
+            if "most_killed_boss" in metrics:
+                wom.most_killed_boss = BossKills(**metrics["most_killed_boss"])
+
+            # The raids, barrows and clues groups keep their long-standing fields
+            categories = metrics["categories"]
+            raids = categories.pop("raids", {})
+            wom.raids = sum(raids.values())
+            wom.cox = raids.get("cox", 0)
+            wom.tob = raids.get("tob", 0)
+            wom.toa = raids.get("toa", 0)
+            wom.barrows = categories.pop("barrows", {}).get("barrows", 0)
+            wom.clues = categories.pop("clues", {})
+            wom.categories = categories or None
+
+    def load_registry(self) -> WOMMetricRegistry:
+        registry = WOMMetricRegistry.load(self.categories_fp if os.path.isfile(self.categories_fp) else DEFAULT_REGISTRY_FP)
+
+        # Compact and bulk fetches only keep HUNT_METRICS, so anything else would always read 0
+        known = {metric for names in HUNT_METRICS.values() for metric in names}
+        unknown = sorted(registry.metric_keys() - known)
+        if unknown:
+            print(f"WARNING: metric categories use WOM metrics outside HUNT_METRICS: {', '.join(unknown)}. "
+                  "Only full player payloads include them; add them to HUNT_METRICS to fetch them in compact or bulk mode.")
+        return registry
 
     # -------------------------
     # Save
     # -------------------------
     def save(self) -> None:
-        save_json_data(self.hunt_metrics_fp, self.hunt_metrics_data)
+        self.hunt_metrics.save(self.hunt_metrics_fp, self.name_index.display_name)
+        self.name_index.save()
 
     # -------------------------
     # Run all calculations
     # -------------------------
-    def run(self) -> None:
+    def run(self, save: bool = True) -> HuntMetrics:
+        self.match_unmatched_players()
         self.calculate_player_ehb()
-        self.calculate_total_bosses_killed()
-        self.calculate_total_raids_killed()
-        self.calculate_total_barrows_killed()
-        self.calculate_total_clues_completed()
-        self.calculate_total_xp()
-        self.calculate_most_killed_boss()
-        self.save()
+
+        # Each player's gains are decoded exactly once, into the store shared with HuntStats
+        self.columnar_store = self.load_store()
+        self.calculate_player_metrics(WOMMetricsEngine(self.columnar_store, self.load_registry()))
+
+        if save:
+            self.save()
         print("WOM PARSING COMPLETED")
+        return self.hunt_metrics
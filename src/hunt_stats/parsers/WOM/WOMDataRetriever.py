@@ -1,54 +1,295 @@
 import requests
+import aiohttp
+import asyncio
+import hashlib
 import json
 import os
+import threading
 import time
 import shutil
+from datetime import datetime, timezone
+from parsers.WOM.RateLimiter import TokenBucket, AdaptiveRateController
+from parsers.WOM.WOMMetrics import HUNT_METRICS
+from parsers.WOM.WOMGains import compact_record
+from HuntPaths import hunt_dir
+
+WOM_API_URL = "https://api.wiseoldman.net/v2"
 
 # Rate limit configuration (WOM is 20 req/min)
 RATE_LIMIT = 20
 WINDOW = 60
 DELAY = WINDOW / RATE_LIMIT  # 3 seconds/request
+# A hung connection fails the attempt (and is retried) instead of stalling the run
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Slack on top of WOM's window, so network jitter can't push a window's requests together
+WINDOW_MARGIN = 1.0
+
+# Shared by every retriever so the sync and async paths draw from one budget
+rate_limiter = TokenBucket(rate=RATE_LIMIT / WINDOW, capacity=RATE_LIMIT, window=WINDOW + WINDOW_MARGIN)
+rate_controller = AdaptiveRateController(rate_limiter)
 
-last_request_time = 0.0
+# Which players a rerun fetches:
+#   missing  - only players without a snapshot for the current startsAt/endsAt window
+#   stale    - also players whose snapshot was taken mid-hunt and whose participation
+#              has been updated by WOM since
+#   progress - also players whose participations[].progress differs from the snapshot's
+#   all      - every participant
+REFRESH_MODES = ("missing", "stale", "progress", "all")
 
 
 class WOMDataRetriever:
-    def __init__(self, comp_id: str, hunt_edition: str):
+    def __init__(self, comp_id: str, hunt_edition: str, compact: bool = False, keep_raw: bool = False,
+                 base_dir: str | None = None):
         self.comp_id = comp_id
         self.hunt_edition = hunt_edition
 
-        self.base_dir = os.path.join("Hunts", f"Hunt-{self.hunt_edition}")
+        # compact: save only the gained values HUNT_METRICS needs instead of the full payload
+        # keep_raw: with compact, also keep the full payload under raw/
+        self.compact = compact
+        self.keep_raw = keep_raw
+
+        # base_dir: the hunt's directory, where WOMDataParser reads the files from
+        self.base_dir = base_dir or str(hunt_dir(self.hunt_edition))
         self.players_dir = os.path.join(self.base_dir, "players")
+        self.raw_dir = os.path.join(self.base_dir, "raw")
+        self.metrics_dir = os.path.join(self.base_dir, "metrics")
+        self.manifest_fp = os.path.join(self.base_dir, "manifest.json")
 
         os.makedirs(self.players_dir, exist_ok=True)
 
+        self.manifest = self.load_manifest()
+        self._manifest_lock = threading.Lock()
+        self._manifest_version = 0
+        self._written_version = 0
+
+        # username -> last error, for players that never succeeded
+        self.failed_players: dict[str, str] = {}
+
     # -------------------------
     # Rate-limited requests
     # -------------------------
     @staticmethod
     def rate_limited_request(url: str):
-        global last_request_time
+        rate_limiter.acquire()
 
-        now = time.time()
-        elapsed = now - last_request_time
+        response = requests.get(url, timeout=REQUEST_TIMEOUT_SECONDS)
+        rate_controller.observe(response.status_code, response.headers)
+        response.raise_for_status()
+        return response
 
-        if elapsed < DELAY:
-            time.sleep(DELAY - elapsed)
+    @staticmethod
+    async def rate_limited_request_async(session: aiohttp.ClientSession, url: str) -> dict:
+        await rate_limiter.acquire_async()
+
+        async with session.get(url) as response:
+            rate_controller.observe(response.status, response.headers)
+            response.raise_for_status()
+            return await response.json()
+
+    def request_with_retries(self, url: str) -> dict:
+        """Fetch JSON, retrying rate limits and transient errors with backoff."""
+        attempt = 0
+        while True:
+            try:
+                return self.rate_limited_request(url).json()
+            except requests.HTTPError as e:
+                error = e
+                delay = rate_controller.retry_delay(attempt, e.response.status_code, e.response.headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                delay = rate_controller.retry_delay(attempt)
+
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    async def request_with_retries_async(self, session: aiohttp.ClientSession, url: str,
+                                         semaphore: asyncio.Semaphore) -> dict:
+        """
+        Async counterpart of `request_with_retries`. The semaphore is only held for each
+        attempt, so a player backing off does not occupy a request slot.
+        """
+        attempt = 0
+        while True:
+            async with semaphore:
+                try:
+                    return await self.rate_limited_request_async(session, url)
+                except aiohttp.ClientResponseError as e:
+                    error = e
+                    delay = rate_controller.retry_delay(attempt, e.status, e.headers)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    error = e
+                    delay = rate_controller.retry_delay(attempt)
+
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
 
-        response = requests.get(url)
-        last_request_time = time.time()
+    # -------------------------
+    # URLs
+    # -------------------------
+    def competition_url(self, metric: str | None = None) -> str:
+        url = f"{WOM_API_URL}/competitions/{self.comp_id}"
+        if metric:
+            url += f"?metric={metric}"
+        return url
 
-        response.raise_for_status()
-        return response
+    @staticmethod
+    def gains_url(username: str, start_time: str, end_time: str) -> str:
+        return f"{WOM_API_URL}/players/{username}/gained?startDate={start_time}&endDate={end_time}"
 
     # -------------------------
     # Save JSON helper
     # -------------------------
     @staticmethod
-    def save_pretty_json(filepath: str, data: dict):
+    def save_pretty_json(filepath: str, data: dict) -> str:
+        """Write data as indented JSON and return the SHA-256 of the written content."""
+        return WOMDataRetriever.write_json(filepath, json.dumps(data, indent=4, ensure_ascii=False))
+
+    @staticmethod
+    def save_compact_json(filepath: str, data: dict) -> str:
+        """Write data as minified JSON and return the SHA-256 of the written content."""
+        return WOMDataRetriever.write_json(filepath, json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+    @staticmethod
+    def write_json(filepath: str, content: str) -> str:
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.write(content)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def save_competition(self, comp_data: dict) -> None:
+        self.save_pretty_json(os.path.join(self.base_dir, "competition.json"), comp_data)
+
+    def save_metric_gains(self, metric_type: str, metric: str, comp_data: dict) -> None:
+        """Save every participant's gain in one metric, keyed by display name."""
+        gained = {
+            p["player"]["displayName"]: p.get("progress", {}).get("gained", 0)
+            for p in comp_data.get("participations", [])
+            if p.get("player") and p["player"].get("displayName")
+        }
+        self.save_pretty_json(os.path.join(self.metrics_dir, f"{metric}.json"), {
+            "metric": metric,
+            "type": metric_type,
+            "startsAt": comp_data.get("startsAt"),
+            "endsAt": comp_data.get("endsAt"),
+            "gained": gained,
+        })
+
+    def player_file(self, username: str, directory: str | None = None) -> str:
+        safe_name = username.replace("/", "_")
+        return os.path.join(directory or self.players_dir, f"{safe_name}.json")
+
+    def save_player_gains(self, username: str, gains_data: dict) -> str:
+        if not self.compact:
+            return self.save_pretty_json(self.player_file(username), gains_data)
+
+        if self.keep_raw:
+            self.save_pretty_json(self.player_file(username, self.raw_dir), gains_data)
+        return self.save_compact_json(self.player_file(username), compact_record(gains_data))
+
+    # -------------------------
+    # Checkpoint manifest
+    # -------------------------
+    def load_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_fp):
+            return {"players": {}}
+        with open(self.manifest_fp, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def write_manifest(self, snapshot: tuple[int, str]) -> None:
+        """
+        Atomically replace the manifest so a crash never leaves it half-written. Snapshots
+        older than the one already on disk are dropped, since concurrent fetches can
+        finish writing out of order.
+        """
+        version, content = snapshot
+        tmp_fp = f"{self.manifest_fp}.tmp"
+        with self._manifest_lock:
+            if version <= self._written_version:
+                return
+            with open(tmp_fp, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_fp, self.manifest_fp)
+            self._written_version = version
+
+    def record_fetch(self, username: str, participation: dict, start_time: str, end_time: str,
+                     content_hash: str) -> tuple[int, str]:
+        """Record a successful player fetch and return a versioned manifest snapshot to write."""
+        self.manifest["players"][username] = {
+            "player_id": participation.get("playerId"),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "startsAt": start_time,
+            "endsAt": end_time,
+            "sha256": content_hash,
+            "progress": participation.get("progress"),
+        }
+        self._manifest_version += 1
+        return self._manifest_version, json.dumps(self.manifest, indent=2)
+
+    def needs_fetch(self, username: str, participation: dict, start_time: str, end_time: str,
+                    refresh: str) -> bool:
+        entry = self.manifest["players"].get(username)
+
+        if refresh == "all" or not entry:
+            return True
+        if entry.get("startsAt") != start_time or entry.get("endsAt") != end_time:
+            return True
+        if not os.path.exists(self.player_file(username)):
+            return True
+
+        if refresh == "stale":
+            fetched_at = datetime.fromisoformat(entry["fetched_at"])
+            updated_at = participation.get("updatedAt")
+            taken_mid_hunt = fetched_at < datetime.fromisoformat(end_time)
+            return taken_mid_hunt and bool(updated_at) and datetime.fromisoformat(updated_at) > fetched_at
+
+        if refresh == "progress":
+            return entry.get("progress") != participation.get("progress")
+
+        return False
+
+    def select_participants(self, comp_data: dict, refresh: str) -> dict[str, dict]:
+        """Map the username of every participant that needs fetching to their participation."""
+        if refresh not in REFRESH_MODES:
+            raise ValueError(f"Unknown refresh mode '{refresh}', expected one of {REFRESH_MODES}")
+
+        start_time = comp_data["startsAt"]
+        end_time = comp_data["endsAt"]
+
+        participations = {
+            p["player"]["displayName"]: p
+            for p in comp_data.get("participations", [])
+            if p.get("player") and p["player"].get("displayName")
+        }
+        selected = {
+            username: participation
+            for username, participation in participations.items()
+            if self.needs_fetch(username, participation, start_time, end_time, refresh)
+        }
+
+        skipped = len(participations) - len(selected)
+        if skipped:
+            print(f"Skipping {skipped} players already fetched for this window (refresh={refresh}).")
+        return selected
+
+    # -------------------------
+    # Failure report
+    # -------------------------
+    def report_failures(self) -> None:
+        """Print and save the players whose gains could not be fetched after all retries."""
+        self.save_pretty_json(os.path.join(self.base_dir, "failed_players.json"), self.failed_players)
+
+        if not self.failed_players:
+            print("All fetches succeeded.")
+            return
+
+        print(f"{len(self.failed_players)} fetches never succeeded:")
+        for name, error in self.failed_players.items():
+            print(f"  {name}: {error}")
 
     # -------------------------
     # Progress bar
@@ -82,16 +323,13 @@ class WOMDataRetriever:
     # -------------------------
     # Main runner
     # -------------------------
-    def run(self):
+    def run(self, refresh: str = "missing"):
         print("\nFetching competition data...\n")
 
-        comp_url = f"https://api.wiseoldman.net/v2/competitions/{self.comp_id}"
-
         try:
-            comp_res = self.rate_limited_request(comp_url)
-            comp_data = comp_res.json()
+            comp_data = self.request_with_retries(self.competition_url())
 
-            self.save_pretty_json(os.path.join(self.base_dir, "competition.json"), comp_data)
+            self.save_competition(comp_data)
 
             start_time = comp_data.get("startsAt")
             end_time = comp_data.get("endsAt")
@@ -103,42 +341,136 @@ class WOMDataRetriever:
             print(f"Failed to fetch competition data: {e}")
             return
 
-        # extract usernames
-        participants = comp_data.get("participations", [])
-        usernames = [
-            p["player"]["displayName"]
-            for p in participants
-            if p.get("player") and p["player"].get("displayName")
-        ]
+        participants = self.select_participants(comp_data, refresh)
 
-        total = len(usernames)
-        print(f"Found {total} participants.\n")
+        total = len(participants)
+        print(f"Found {total} participants to fetch.\n")
         print("Fetching player gains...")
 
         start_time_global = time.time()
+        self.failed_players = {}
 
         # get stats for each player
-        for i, username in enumerate(usernames, start=1):
-            gains_url = (
-                f"https://api.wiseoldman.net/v2/players/{username}/gained"
-                f"?startDate={start_time}&endDate={end_time}"
-            )
-
+        for i, (username, participation) in enumerate(participants.items(), start=1):
             try:
-                gains_res = self.rate_limited_request(gains_url)
-                gains_data = gains_res.json()
+                gains_data = self.request_with_retries(self.gains_url(username, start_time, end_time))
+                content_hash = self.save_player_gains(username, gains_data)
+                self.write_manifest(self.record_fetch(username, participation, start_time, end_time, content_hash))
 
-                safe_name = username.replace("/", "_")
-                file_path = os.path.join(self.players_dir, f"{safe_name}.json")
+            except Exception as e:
+                self.failed_players[username] = str(e)
 
-                self.save_pretty_json(file_path, gains_data)
+            self.print_progress(i, total, start_time_global)
+
+        print("\n\nDone! Player data saved.\n")
+        self.report_failures()
+
+    # -------------------------
+    # Bulk runner
+    # -------------------------
+    def run_bulk(self, metrics: dict[str, list[str]] = HUNT_METRICS):
+        """
+        Fetch per-metric gains for every participant from the competition endpoint.
+
+        One request per metric replaces one /gained request per player, so the fetch
+        scales with the metric set instead of headcount. Results go to metrics/, which
+        WOMDataParser reads in place of players/.
+        """
+        print("\nFetching competition data...\n")
+
+        try:
+            comp_data = self.request_with_retries(self.competition_url())
+            self.save_competition(comp_data)
+        except Exception as e:
+            print(f"Failed to fetch competition data: {e}")
+            return
 
-            except Exception:
-                pass
+        jobs = [(metric_type, metric) for metric_type, names in metrics.items() for metric in names]
+        total = len(jobs)
+        print(f"Found {len(comp_data.get('participations', []))} participants.\n")
+        print(f"Fetching {total} metrics...")
+
+        start_time_global = time.time()
+        self.failed_players = {}
+
+        for i, (metric_type, metric) in enumerate(jobs, start=1):
+            try:
+                metric_data = self.request_with_retries(self.competition_url(metric))
+                self.save_metric_gains(metric_type, metric, metric_data)
+
+            except Exception as e:
+                self.failed_players[f"metric:{metric}"] = str(e)
 
             self.print_progress(i, total, start_time_global)
 
-        print("\n\nDone! All player data saved.\n")
+        print("\n\nDone! Metric data saved.\n")
+        self.report_failures()
+
+    # -------------------------
+    # Async runner
+    # -------------------------
+    async def run_async(self, max_concurrency: int = 5, refresh: str = "missing"):
+        """
+        Fetch the competition and every participant's gains over one pooled aiohttp session.
+
+        Requests are paced by the shared token bucket rather than a fixed delay, so the
+        full per-minute budget (including the initial burst) is used, and awaiting it
+        never blocks the event loop the bot is running on.
+        """
+        print("\nFetching competition data...\n")
+
+        connector = aiohttp.TCPConnector(limit=max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            try:
+                comp_data = await self.request_with_retries_async(session, self.competition_url(), semaphore)
+                await asyncio.to_thread(self.save_competition, comp_data)
+
+                start_time = comp_data.get("startsAt")
+                end_time = comp_data.get("endsAt")
+
+                if not start_time or not end_time:
+                    raise ValueError("Competition response missing timestamps.")
+
+            except Exception as e:
+                print(f"Failed to fetch competition data: {e}")
+                return
+
+            participants = self.select_participants(comp_data, refresh)
+
+            total = len(participants)
+            print(f"Found {total} participants to fetch.\n")
+            print("Fetching player gains...")
+
+            start_time_global = time.time()
+            self.failed_players = {}
+            completed = 0
+
+            async def fetch_player(username: str, participation: dict) -> None:
+                nonlocal completed
+                try:
+                    gains_url = self.gains_url(username, start_time, end_time)
+                    gains_data = await self.request_with_retries_async(session, gains_url, semaphore)
+                    content_hash = await asyncio.to_thread(self.save_player_gains, username, gains_data)
+                    manifest = self.record_fetch(username, participation, start_time, end_time, content_hash)
+                    await asyncio.to_thread(self.write_manifest, manifest)
+
+                except Exception as e:
+                    self.failed_players[username] = str(e)
+
+                completed += 1
+                self.print_progress(completed, total, start_time_global)
+
+            await asyncio.gather(*(fetch_player(username, p) for username, p in participants.items()))
+
+        print("\n\nDone! Player data saved.\n")
+        await asyncio.to_thread(self.report_failures)
+
+    def start_background(self, max_concurrency: int = 5, refresh: str = "missing") -> asyncio.Task:
+        """Schedule `run_async` on the running event loop and return its task."""
+        return asyncio.create_task(self.run_async(max_concurrency=max_concurrency, refresh=refresh))
 
 
 # -------------------------
@@ -147,3 +479,5 @@ class WOMDataRetriever:
 if __name__ == "__main__":
     retriever = WOMDataRetriever(comp_id="100262", hunt_edition="14")
     retriever.run()
+    # asyncio.run(retriever.run_async())
+    # retriever.run_bulk()
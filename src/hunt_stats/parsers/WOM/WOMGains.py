@@ -0,0 +1,51 @@
+import json
+from parsers.WOM.WOMMetrics import GAINED_FIELD, HUNT_METRICS
+
+
+def project_gains(payload: dict, metrics: dict[str, list[str]] | None = HUNT_METRICS) -> dict:
+    """
+    Reduce a WOM /gained payload to its non-zero gained values:
+
+    {
+        "skills": {"overall": <xp>},
+        "bosses": {<boss>: <kills>},
+        "activities": {<activity>: <score>}
+    }
+
+    Only the metrics listed in `metrics` are kept; pass None to keep every metric in
+    the payload. WOM's metric order is preserved.
+    """
+    data = payload.get("data", {})
+    gains = {}
+
+    for metric_type, field in GAINED_FIELD.items():
+        wanted = None if metrics is None else set(metrics.get(metric_type, []))
+        group = gains[metric_type] = {}
+
+        for metric, info in data.get(metric_type, {}).items():
+            if wanted is not None and metric not in wanted:
+                continue
+            gained = info.get(field, {}).get("gained", 0)
+            if gained:
+                group[metric] = gained
+
+    return gains
+
+
+def compact_record(payload: dict, metrics: dict[str, list[str]] | None = HUNT_METRICS) -> dict:
+    """The compact per-player record saved in place of the full /gained payload."""
+    return {
+        "startsAt": payload.get("startsAt"),
+        "endsAt": payload.get("endsAt"),
+        "gains": project_gains(payload, metrics),
+    }
+
+
+def load_player_gains(filepath: str) -> dict:
+    """Load a player file in either the compact or the full WOM layout as projected gains."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        record = json.load(f)
+
+    if "gains" in record:
+        return record["gains"]
+    return project_gains(record, metrics=None)
@@ -0,0 +1,82 @@
+import json
+import os
+import numpy as np
+
+DEFAULT_REGISTRY_FP = os.path.join(os.path.dirname(__file__), "metric_categories.json")
+
+
+class WOMMetricRegistry:
+    """
+    Derived WOM categories, loaded from a data file shaped like
+
+        {group: {category: [wom_metric_key, ...]}}
+
+    e.g. {"raids": {"cox": ["chambers_of_xeric", "chambers_of_xeric_challenge_mode"]}}.
+    The file is compiled once into an exact-key table (metric key -> category slots),
+    so classifying a metric is a dict lookup. A key may sit in several groups, but
+    only in one category per group.
+    """
+
+    def __init__(self, groups: dict[str, dict[str, list[str]]]):
+        self.groups = groups
+
+        # Flat slot per (group, category), in file order
+        self.slots = [(group, category) for group, categories in groups.items() for category in categories]
+        # group -> [(category, slot), ...], for rebuilding the nested shape from slot totals
+        self.layout = {group: [] for group in groups}
+        for slot, (group, category) in enumerate(self.slots):
+            self.layout[group].append((category, slot))
+        self.lookup: dict[str, list[int]] = {}
+        for slot, (group, category) in enumerate(self.slots):
+            for metric in groups[group][category]:
+                taken = self.lookup.setdefault(metric, [])
+                if any(self.slots[other][0] == group for other in taken):
+                    raise ValueError(f"WOM metric '{metric}' is in more than one '{group}' category")
+                taken.append(slot)
+
+    @classmethod
+    def load(cls, filepath: str = DEFAULT_REGISTRY_FP) -> "WOMMetricRegistry":
+        with open(filepath, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def indicator(self, metric_names: np.ndarray) -> np.ndarray:
+        """metrics x slots 0/1 matrix, so gains @ indicator gives every category total at once."""
+        matrix = np.zeros((len(metric_names), len(self.slots)), dtype=np.int64)
+        for col, metric in enumerate(metric_names.tolist()):
+            for slot in self.lookup.get(metric, ()):
+                matrix[col, slot] = 1
+        return matrix
+
+    def metric_keys(self) -> set[str]:
+        return set(self.lookup)
+
+    def split(self, totals: np.ndarray, dense_groups: tuple[str, ...] = ()) -> list[dict[str, dict[str, int]]]:
+        """
+        Turn a rows x slots matrix of totals into one {group: {category: total}} per row.
+        Groups in dense_groups list every category; the others only their non-zero
+        ones, and are left out when they have none.
+        """
+        columns = totals.T.tolist()
+        dense = [
+            (group, [(category, columns[slot]) for category, slot in categories])
+            for group, categories in self.layout.items() if group in dense_groups
+        ]
+        results = [
+            {group: {category: column[row] for category, column in categories} for group, categories in dense}
+            for row in range(len(totals))
+        ]
+
+        for group, categories in self.layout.items():
+            if group in dense_groups:
+                continue
+            names = [category for category, _ in categories]
+            group_totals = totals[:, [slot for _, slot in categories]]
+            # Row-major, so each row's categories come out in file order
+            rows, cols = np.nonzero(group_totals)
+            current_row, entries = -1, None
+            for row, col, value in zip(rows.tolist(), cols.tolist(), group_totals[rows, cols].tolist()):
+                if row != current_row:
+                    current_row, entries = row, {}
+                    results[row][group] = entries
+                entries[names[col]] = value
+        return results
@@ -0,0 +1,35 @@
+# WOM metrics the hunt stats are derived from, grouped the way WOM nests them in
+# /players/{username}/gained payloads. Boss order matches WOM's own ordering.
+BOSS_METRICS = [
+    "abyssal_sire", "alchemical_hydra", "amoxliatl", "araxxor", "artio", "barrows_chests",
+    "bryophyta", "callisto", "calvarion", "cerberus", "chambers_of_xeric",
+    "chambers_of_xeric_challenge_mode", "chaos_elemental", "chaos_fanatic", "commander_zilyana",
+    "corporeal_beast", "crazy_archaeologist", "dagannoth_prime", "dagannoth_rex",
+    "dagannoth_supreme", "deranged_archaeologist", "doom_of_mokhaiotl", "duke_sucellus",
+    "general_graardor", "giant_mole", "grotesque_guardians", "hespori", "kalphite_queen",
+    "king_black_dragon", "kraken", "kreearra", "kril_tsutsaroth", "lunar_chests", "mimic", "nex",
+    "nightmare", "phosanis_nightmare", "obor", "phantom_muspah", "sarachnis", "scorpia",
+    "scurrius", "shellbane_gryphon", "skotizo", "sol_heredit", "spindel", "tempoross",
+    "the_gauntlet", "the_corrupted_gauntlet", "the_hueycoatl", "the_leviathan", "the_royal_titans",
+    "the_whisperer", "theatre_of_blood", "theatre_of_blood_hard_mode", "thermonuclear_smoke_devil",
+    "tombs_of_amascut", "tombs_of_amascut_expert", "tzkal_zuk", "tztok_jad", "vardorvis",
+    "venenatis", "vetion", "vorkath", "wintertodt", "yama", "zalcano", "zulrah"
+]
+
+CLUE_METRICS = [
+    "clue_scrolls_all", "clue_scrolls_beginner", "clue_scrolls_easy", "clue_scrolls_medium",
+    "clue_scrolls_hard", "clue_scrolls_elite", "clue_scrolls_master"
+]
+
+HUNT_METRICS = {
+    "skills": ["overall"],
+    "bosses": BOSS_METRICS,
+    "activities": CLUE_METRICS,
+}
+
+# Field holding the gained value for each metric group
+GAINED_FIELD = {
+    "skills": "experience",
+    "bosses": "kills",
+    "activities": "score",
+}
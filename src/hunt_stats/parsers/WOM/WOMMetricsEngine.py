@@ -0,0 +1,111 @@
+import numpy as np
+from parsers.WOM.WOMColumnarStore import METRIC_TYPES, WOMColumnarStore
+from parsers.WOM.WOMMetricRegistry import WOMMetricRegistry
+
+
+class WOMMetricsEngine:
+    """
+    Vectorized WOM metric aggregation over a WOMColumnarStore's players x metrics
+    matrices. Category totals (from a WOMMetricRegistry) are one matrix product per
+    metric group, the most killed boss is a per-row argmax, and team totals are a
+    single group-by over team ids.
+    """
+
+    def __init__(self, store: WOMColumnarStore, registry: WOMMetricRegistry | None = None):
+        self.store = store
+        self.registry = registry if registry is not None else WOMMetricRegistry.load()
+        self.bosses = np.asarray(store.matrices["bosses"])
+        self.skills = np.asarray(store.matrices["skills"])
+
+        self.boss_names = store.metrics["bosses"]
+        # Compiled once: metric group -> (categorised columns, columns x category-slots indicator)
+        self.indicators = {}
+        for metric_type in METRIC_TYPES:
+            indicator = self.registry.indicator(store.metrics[metric_type])
+            columns = np.flatnonzero(indicator.any(axis=1))
+            if len(columns):
+                self.indicators[metric_type] = (columns, indicator[columns])
+        self.overall_col = np.flatnonzero(store.metrics["skills"] == "overall")
+
+    # -------------------------
+    # Per-player metrics
+    # -------------------------
+    def player_metrics(self, rows: np.ndarray, dense_groups: tuple[str, ...] = ()) -> list[dict]:
+        """
+        Per store row in `rows` (same order): boss_kills, xp_gained, most_killed_boss
+        when any boss has kills, and categories as {group: {category: total}}, with
+        zero totals left out except in dense_groups.
+        """
+        bosses = self.bosses[rows]
+
+        boss_kills = bosses.sum(axis=1)
+        categories = np.zeros((len(rows), len(self.registry.slots)), dtype=np.int64)
+        for metric_type, (columns, indicator) in self.indicators.items():
+            categories += np.asarray(self.store.matrices[metric_type])[np.ix_(rows, columns)] @ indicator
+
+        if len(self.overall_col):
+            xp_gained = self.skills[rows, self.overall_col[0]]
+        else:
+            xp_gained = np.zeros(len(rows), dtype=np.int64)
+
+        # argmax takes the first maximum, matching a strict ">" scan in WOM's metric order
+        if bosses.shape[1]:
+            top_col = bosses.argmax(axis=1)
+            top_kills = bosses[np.arange(len(rows)), top_col]
+        else:
+            top_col = np.zeros(len(rows), dtype=np.int64)
+            top_kills = np.zeros(len(rows), dtype=np.int64)
+
+        boss_kills = boss_kills.tolist()
+        categories = self.registry.split(categories, dense_groups)
+        xp_gained = xp_gained.tolist()
+        top_boss = self.boss_names[top_col].tolist()
+        top_kills = top_kills.tolist()
+
+        results = []
+        for i in range(len(rows)):
+            metrics = {
+                "boss_kills": boss_kills[i],
+                "xp_gained": xp_gained[i],
+                "categories": categories[i],
+            }
+            if top_kills[i] > 0:
+                metrics["most_killed_boss"] = {"boss": top_boss[i], "kills": top_kills[i]}
+            results.append(metrics)
+        return results
+
+    # -------------------------
+    # Per-team metrics
+    # -------------------------
+    def team_most_killed_boss(self, team_rows: list[list[int]]) -> list[dict | None]:
+        """
+        Most killed boss per team, given each team's store rows in roster order. Only
+        positive kills count towards team totals. Ties go to the boss that first showed
+        up with kills when walking the roster, as the dict-based version did.
+        """
+        if not team_rows or not any(team_rows):
+            return [None] * len(team_rows)
+
+        rows = np.concatenate([np.asarray(r, dtype=np.int64) for r in team_rows])
+        team_ids = np.repeat(np.arange(len(team_rows)), [len(r) for r in team_rows])
+
+        positive = np.clip(self.bosses[rows], 0, None)
+        totals = np.zeros((len(team_rows), self.bosses.shape[1]), dtype=np.int64)
+        np.add.at(totals, team_ids, positive)
+
+        results = []
+        for team_id, team_totals in enumerate(totals):
+            best = team_totals.max(initial=0)
+            if best <= 0:
+                results.append(None)
+                continue
+
+            candidates = np.flatnonzero(team_totals == best)
+            if len(candidates) > 1:
+                team_positive = positive[team_ids == team_id][:, candidates] > 0
+                first_seen = team_positive.argmax(axis=0)
+                candidates = candidates[np.lexsort((candidates, first_seen))]
+
+            col = candidates[0]
+            results.append({"boss": self.boss_names[col].item(), "kills": int(best)})
+        return results
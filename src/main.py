@@ -4,6 +4,7 @@ import discord
 from discord.ext import commands, tasks
 import logging
 import os
+import sys
 
 from commands.role_commands import register_role_commands
 from commands.message_commands import register_message_commands
@@ -40,6 +41,23 @@ intents.members = True
 
 bot = commands.Bot(command_prefix='!', intents=intents)
 
+# Live hunt stats are only refreshed while a hunt is configured
+HUNT_EDITION = os.getenv("HUNT_EDITION")
+HUNT_REFRESH_MINUTES = float(os.getenv("HUNT_REFRESH_MINUTES", "10"))
+hunt_stats = None
+if HUNT_EDITION:
+    # hunt_stats modules import each other from their own directory
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "hunt_stats"))
+    from HuntStats import HuntStats
+    from HuntPaths import DATA_DIR
+    # The bot runs from src/, so the hunt files are found from the package, not the working directory
+    hunt_stats = HuntStats(
+        hunt_edition=HUNT_EDITION,
+        gdoc_sheet_id=os.getenv("HUNT_GDOC_SHEET_ID", ""),
+        wom_comp_id=os.getenv("HUNT_WOM_COMP_ID", ""),
+        data_dir=DATA_DIR
+    )
+
 
 async def sync_commands(test: bool = False):
     try:
@@ -63,6 +81,16 @@ async def list_commands():
         logger.info(f"[Main Task Loop] Command Name: {command.name}, Description: {command.description}")
 
 
+@tasks.loop(minutes=HUNT_REFRESH_MINUTES)
+async def refresh_hunt_stats():
+    try:
+        # Parsing is blocking; keep it off the event loop
+        changed = await asyncio.to_thread(hunt_stats.refresh)
+        logger.info(f"[Hunt Stats] Refreshed Hunt {HUNT_EDITION} in {hunt_stats.hunt_dir}: {changed} players changed.")
+    except Exception as e:
+        logger.error(f"[Hunt Stats] Error refreshing Hunt {HUNT_EDITION}: {e}")
+
+
 @bot.event
 async def on_ready():
     logger.info("[Main Task Loop] Loading Assets...")
@@ -81,6 +109,10 @@ async def on_ready():
     await sync_commands(test=True)
     await list_commands()
 
+    if hunt_stats is not None and not refresh_hunt_stats.is_running():
+        refresh_hunt_stats.start()
+        logger.info(f"[Main Task Loop] Hunt {HUNT_EDITION} stats refresh started (every {HUNT_REFRESH_MINUTES:g} minutes).")
+
 
 async def main():
     await bot.start(TOKEN)
@@ -0,0 +1,29 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The bot imports from the repo root (src.commands...), hunt_stats from its own directory
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src", "hunt_stats")]
+
+import HuntPaths
+
+HUNT_14_DIR = os.path.join(ROOT, "src", "hunt_stats", "data", "Hunt-14")
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory, with HuntPaths.DATA_DIR pointed at data/ inside it."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(HuntPaths, "DATA_DIR", tmp_path / "data")
+    return tmp_path
+
+
+@pytest.fixture
+def hunt_14(workdir):
+    """A copy of the Hunt-14 data where the parsers look for hunt edition "test"."""
+    hunt_dir = workdir / "data" / "Hunt-test"
+    shutil.copytree(HUNT_14_DIR, hunt_dir)
+    return hunt_dir
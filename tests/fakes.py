@@ -0,0 +1,222 @@
+"""
+Offline stand-ins for the external services the bot talks to, for the tests.
+"""
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import aiohttp
+import requests
+from multidict import CIMultiDict
+from yarl import URL
+
+
+class FakeWOM:
+    """
+    The Wise Old Man endpoints WOMDataRetriever uses, served from memory:
+
+        /competitions/{id}[?metric=...]  -> competition (per-metric progress if asked)
+        /players/{name}/gained?...       -> gains[name]
+
+    `failures` maps a URL substring to the statuses returned, in order, before the
+    request succeeds. install() routes requests.get and aiohttp.ClientSession here.
+    """
+
+    def __init__(self, competition: dict, gains: dict[str, dict], metric_gains: dict[str, dict] | None = None,
+                 failures: dict[str, list[int]] | None = None):
+        self.competition = competition
+        self.gains = gains
+        # metric -> display name -> gained, for ?metric= requests
+        self.metric_gains = metric_gains or {}
+        self.failures = {key: list(statuses) for key, statuses in (failures or {}).items()}
+        self.urls: list[str] = []
+        self.timeouts: list = []
+
+    def respond(self, url: str) -> tuple[int, dict, dict | None]:
+        self.urls.append(url)
+        for key, statuses in self.failures.items():
+            if key in url and statuses:
+                status = statuses.pop(0)
+                return status, {"Retry-After": "0"} if status == 429 else {}, None
+
+        parts = urlsplit(url)
+        path = parts.path.split("/")
+        if "competitions" in path:
+            metric = parse_qs(parts.query).get("metric", [None])[0]
+            if metric is None:
+                return 200, {}, self.competition
+            gained = self.metric_gains.get(metric, {})
+            return 200, {}, {
+                **self.competition,
+                "participations": [
+                    {**p, "progress": {"gained": gained.get(p["player"]["displayName"], 0)}}
+                    for p in self.competition["participations"]
+                ],
+            }
+        if "players" in path:
+            name = path[path.index("players") + 1]
+            if name in self.gains:
+                return 200, {}, self.gains[name]
+        return 404, {}, None
+
+    def install(self, monkeypatch, module) -> "FakeWOM":
+        """Route `module`'s requests and aiohttp calls here."""
+        wom = self
+
+        def get(url, timeout=None):
+            wom.timeouts.append(timeout)
+            return FakeResponse(url, *wom.respond(url))
+
+        class Session:
+            def __init__(self, connector=None, timeout=None):
+                wom.timeouts.append(timeout)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def get(self, url):
+                return FakeAioResponse(url, *wom.respond(url))
+
+        monkeypatch.setattr(module.requests, "get", get)
+        monkeypatch.setattr(module.aiohttp, "ClientSession", Session)
+        monkeypatch.setattr(module.aiohttp, "TCPConnector", lambda **kwargs: None)
+        return self
+
+
+class FakeResponse:
+    def __init__(self, url: str, status: int, headers: dict, body: dict | None):
+        self.url, self.status_code, self.headers, self.body = url, status, headers, body
+
+    def json(self) -> dict:
+        return json.loads(json.dumps(self.body))
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+
+class FakeAioResponse:
+    def __init__(self, url: str, status: int, headers: dict, body: dict | None):
+        self.url, self.status, self.headers, self.body = url, status, CIMultiDict(headers), body
+
+    async def __aenter__(self):
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self) -> dict:
+        return json.loads(json.dumps(self.body))
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(URL(self.url), "GET", CIMultiDict(), URL(self.url))
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status, headers=self.headers)
+
+
+_A1_CELLS = re.compile(r"^[A-Z]*\d*(?::[A-Z]*\d*)?$")
+_A1_CELL = re.compile(r"^(?P<column>[A-Z]*)(?P<row>\d*)$")
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def _trim(rows: list[list]) -> list[list]:
+    """Drop trailing blank cells and rows, as the Sheets API does."""
+    trimmed = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] in ("", None):
+            row.pop()
+        trimmed.append(row)
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+
+class _Request:
+    def __init__(self, response: dict):
+        self.response = response
+
+    def execute(self, http=None) -> dict:
+        return self.response
+
+
+class _Files:
+    """The Drive files() resource: only the spreadsheet's version, for revision checks."""
+
+    def __init__(self, sheets: "FakeSheets"):
+        self.sheets = sheets
+
+    def get(self, fileId: str, fields: str) -> _Request:
+        self.sheets.version_checks += 1
+        return _Request({"version": str(self.sheets.version)})
+
+
+class FakeSheets:
+    """
+    The Sheets API spreadsheets() resource, backed by {tab name: [[cell, ...], ...]}.
+    values().get and values().batchGet take A1 ranges like "Inputs", "'Bot Config'!A2:D",
+    "Inputs!J3:O" and "Inputs!1:2" and return values trimmed the way the real API does.
+    Every round trip is recorded in `requests`; set_tab replaces a tab like an edit
+    would, bumping the Drive version files() reports.
+    """
+
+    def __init__(self, tabs: dict[str, list[list]], version: int = 1):
+        self.tabs = tabs
+        self.version = version
+        self.version_checks = 0
+        self.requests: list[list[str]] = []
+
+    def values(self) -> "FakeSheets":
+        return self
+
+    def files(self) -> _Files:
+        return _Files(self)
+
+    def set_tab(self, sheet_name: str, rows: list[list]) -> None:
+        self.tabs[sheet_name] = rows
+        self.version += 1
+
+    def get(self, spreadsheetId: str, range: str) -> _Request:
+        self.requests.append([range])
+        return _Request(self.read(range))
+
+    def batchGet(self, spreadsheetId: str, ranges: list[str]) -> _Request:
+        self.requests.append(list(ranges))
+        return _Request({"spreadsheetId": spreadsheetId, "valueRanges": [self.read(r) for r in ranges]})
+
+    def read(self, range_name: str) -> dict:
+        sheet, bang, cells = range_name.rpartition("!")
+        if not bang:
+            # A bare name is a whole tab
+            sheet, cells = cells, ""
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+        if sheet not in self.tabs or not _A1_CELLS.match(cells):
+            raise ValueError(f"Unable to parse range: {range_name}")
+        rows = self.tabs[sheet]
+
+        if cells:
+            start, _, end = cells.partition(":")
+            start, end = _A1_CELL.match(start), _A1_CELL.match(end or start)
+            first_column = _column_index(start.group("column")) if start.group("column") else 0
+            last_column = _column_index(end.group("column")) + 1 if end.group("column") else None
+            first_row = int(start.group("row")) - 1 if start.group("row") else 0
+            last_row = int(end.group("row")) if end.group("row") else None
+            rows = [row[first_column:last_column] for row in rows[first_row:last_row]]
+
+        values = _trim(rows)
+        response = {"range": range_name, "majorDimension": "ROWS"}
+        if values:
+            response["values"] = values
+        return response
@@ -0,0 +1,404 @@
+"""
+The original, unoptimized hunt-stats calculations, kept as the reference the parity
+tests compare the current code against. Copied from the code as it was before the
+rewrites; only the file locations are passed in instead of being derived from the
+hunt edition, and nothing is written back to disk.
+"""
+import json
+import os
+
+import pandas as pd
+
+
+def load_json_data(filepath) -> dict:
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LegacyWOMDataParser:
+    """WOMDataParser as it was: every metric re-reads and re-decodes every player file."""
+
+    def __init__(self, players_dir: str, competition_data: dict, hunt_metrics_data: dict):
+        self.players_dir = players_dir
+        self.competition_data = competition_data
+        self.hunt_metrics_data = hunt_metrics_data
+
+        # Build player index (player name -> player object)
+        self.player_index = self._build_player_index()
+
+        # Build EHB lookup (player name -> EHB)
+        self.ehb_by_player = {
+            p["player"]["displayName"]: p["progress"]["gained"]
+            for p in self.competition_data.get("participations", [])
+            if p.get("player") and p["player"].get("displayName")
+        }
+
+    def _build_player_index(self) -> dict:
+        index = {}
+        for team_data in self.hunt_metrics_data.values():
+            for player_name, player_obj in team_data.get("players", {}).items():
+                index[player_name] = player_obj
+        return index
+
+    def _get_player_obj(self, player_name: str) -> dict | None:
+        return self.player_index.get(player_name)
+
+    def _ensure_wom_bucket(self, player_obj: dict) -> dict:
+        if "wom" not in player_obj:
+            player_obj["wom"] = {}
+        return player_obj["wom"]
+
+    def _player_files(self):
+        for file in os.listdir(self.players_dir):
+            if not file.endswith(".json"):
+                continue
+            player_obj = self._get_player_obj(file.replace(".json", ""))
+            if not player_obj:
+                continue
+            yield self._ensure_wom_bucket(player_obj), load_json_data(os.path.join(self.players_dir, file))
+
+    def calculate_player_ehb(self) -> None:
+        for player_name, ehb in self.ehb_by_player.items():
+            player_obj = self._get_player_obj(player_name)
+            if not player_obj:
+                continue
+            wom = self._ensure_wom_bucket(player_obj)
+            wom["ehb"] = ehb
+
+    def calculate_total_bosses_killed(self) -> None:
+        for wom, player_data in self._player_files():
+            wom["boss_kills"] = 0
+            for boss_info in player_data["data"]["bosses"].values():
+                wom["boss_kills"] += boss_info.get("kills", {}).get("gained", 0)
+
+    def calculate_total_raids_killed(self) -> None:
+        for wom, player_data in self._player_files():
+            wom.update({"raids": 0, "cox": 0, "tob": 0, "toa": 0})
+            for boss_name, boss_info in player_data["data"]["bosses"].items():
+                kills = boss_info.get("kills", {}).get("gained", 0)
+                if "chambers_of_xeric" in boss_name:
+                    wom["cox"] += kills
+                    wom["raids"] += kills
+                elif "theatre_of_blood" in boss_name:
+                    wom["tob"] += kills
+                    wom["raids"] += kills
+                elif "tombs_of_amascut" in boss_name:
+                    wom["toa"] += kills
+                    wom["raids"] += kills
+
+    def calculate_total_barrows_killed(self) -> None:
+        for wom, player_data in self._player_files():
+            wom["barrows"] = 0
+            for boss_name, boss_info in player_data["data"]["bosses"].items():
+                if "barrows_chests" in boss_name:
+                    wom["barrows"] += boss_info.get("kills", {}).get("gained", 0)
+
+    def calculate_total_clues_completed(self) -> None:
+        for wom, player_data in self._player_files():
+            wom["clues"] = {"total": 0, "beginner": 0, "easy": 0, "medium": 0, "hard": 0, "elite": 0, "master": 0}
+            for activity_name, activity_info in player_data["data"]["activities"].items():
+                gained = activity_info.get("score", {}).get("gained", 0)
+                if "clue_scrolls_all" in activity_name:
+                    wom["clues"]["total"] += gained
+                elif "clue_scrolls_beginner" in activity_name:
+                    wom["clues"]["beginner"] += gained
+                elif "clue_scrolls_easy" in activity_name:
+                    wom["clues"]["easy"] += gained
+                elif "clue_scrolls_medium" in activity_name:
+                    wom["clues"]["medium"] += gained
+                elif "clue_scrolls_hard" in activity_name:
+                    wom["clues"]["hard"] += gained
+                elif "clue_scrolls_elite" in activity_name:
+                    wom["clues"]["elite"] += gained
+                elif "clue_scrolls_master" in activity_name:
+                    wom["clues"]["master"] += gained
+
+    def calculate_total_xp(self) -> None:
+        for wom, player_data in self._player_files():
+            wom["xp_gained"] = player_data["data"]["skills"]["overall"]["experience"]["gained"]
+
+    def calculate_most_killed_boss(self) -> None:
+        for wom, player_data in self._player_files():
+            bosses = player_data.get("data", {}).get("bosses", {})
+            most_killed_boss = None
+            most_kills = 0
+            for boss_name, boss_info in bosses.items():
+                kills = boss_info.get("kills", {}).get("gained", 0)
+                if kills > most_kills:
+                    most_kills = kills
+                    most_killed_boss = boss_name
+            if most_killed_boss is not None:
+                wom["most_killed_boss"] = {"boss": most_killed_boss, "kills": most_kills}
+
+    def run(self) -> dict:
+        self.calculate_player_ehb()
+        self.calculate_total_bosses_killed()
+        self.calculate_total_raids_killed()
+        self.calculate_total_barrows_killed()
+        self.calculate_total_clues_completed()
+        self.calculate_total_xp()
+        self.calculate_most_killed_boss()
+        return self.hunt_metrics_data
+
+
+def legacy_team_most_killed_boss(data: dict, players_dir: str) -> dict:
+    """HuntStats.calculate_team_most_killed_boss as it was, re-reading every player file."""
+    for team_data in data.values():
+        players = team_data.get("players", {})
+        team_totals = team_data.setdefault("team_totals", {})
+
+        boss_kill_totals = {}
+
+        for player_name in players.keys():
+            player_file = os.path.join(players_dir, f"{player_name}.json")
+
+            if not os.path.exists(player_file):
+                continue
+
+            player_data = load_json_data(player_file)
+            bosses = player_data.get("data", {}).get("bosses", {})
+
+            for boss_name, boss_info in bosses.items():
+                kills = boss_info.get("kills", {}).get("gained", 0)
+
+                if kills <= 0:
+                    continue
+
+                boss_kill_totals[boss_name] = (
+                    boss_kill_totals.get(boss_name, 0) + kills
+                )
+
+        if not boss_kill_totals:
+            continue
+
+        most_killed_boss, total_kills = max(
+            boss_kill_totals.items(),
+            key=lambda item: item[1]
+        )
+
+        team_totals["most_killed_boss"] = {
+            "boss": most_killed_boss,
+            "kills": total_kills
+        }
+    return data
+
+
+class LegacyGDocDataParser:
+    """GDocDataParser as it was: one iterrows pass over each team's drop log."""
+
+    def __init__(self, gdoc=None):
+        self.gdoc = gdoc
+
+        # Canonical data store
+        self.team_players = {
+            "Team Red": {
+                "players": {},
+                "team_totals": {
+                    "total_drops": 0,
+                    "total_points": 0.0,  # Leave as 0 for now
+                    "total_coins": 0.0
+                }
+            },
+            "Team Gold": {
+                "players": {},
+                "team_totals": {
+                    "total_drops": 0,
+                    "total_points": 0.0,  # Leave as 0 for now
+                    "total_coins": 0.0
+                }
+            }
+        }
+
+    def run(self, sheet_name: str = "Inputs") -> dict:
+        df_red, df_gold = self.get_team_dataframes(sheet_name)
+
+        df_red_clean = self.clean_team_dataframe(df_red)
+        df_gold_clean = self.clean_team_dataframe(df_gold)
+
+        self.ingest_team_dataframe(df_red_clean, "Team Red")
+        self.ingest_team_dataframe(df_gold_clean, "Team Gold")
+
+        return self.metrics()
+
+    # ---------------------------------------------------------
+    # Sheet parsing
+    # ---------------------------------------------------------
+    def get_team_dataframes(self, sheet_name: str):
+        raw_data = self.gdoc.get_data_from_sheet(sheet_name)
+        if raw_data is None or raw_data.shape[0] < 3:
+            return pd.DataFrame(), pd.DataFrame()
+
+        rows = raw_data.tolist()[2:]  # skip team label + header
+
+        # Team Red (A-F → keep A,B,C,E,F)
+        red_rows = []
+        for r in rows:
+            r += [""] * (6 - len(r))
+            red_rows.append([r[0], r[1], r[2], r[4], r[5]])
+        df_red = pd.DataFrame(red_rows, columns=["Content", "Item", "Player", "Coins", "Points"])
+
+        # Team Gold (J-O → keep J,K,L,N,O)
+        gold_rows = []
+        for r in rows:
+            r += [""] * (15 - len(r))
+            gold_rows.append([r[9], r[10], r[11], r[13], r[14]])
+        df_gold = pd.DataFrame(gold_rows, columns=["Content", "Item", "Player", "Coins", "Points"])
+
+        return df_red, df_gold
+
+    # ---------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------
+    def _ensure_player(self, team_name: str, player: str):
+        players = self.team_players[team_name]["players"]
+        if player not in players:
+            players[player] = {
+                "total_drops": 0,
+                "total_points": 0.0,
+                "total_coins": 0.0,
+                "boss_pets": 0,
+                "jars": 0,
+                "mega_rares": 0,
+                "most_expensive_drop": {"item": None, "value": 0.0},
+                "most_points_item": {"item": None, "points": 0.0}
+            }
+
+    # ---------------------------------------------------------
+    # Core ingestion logic
+    # ---------------------------------------------------------
+    def ingest_team_dataframe(self, df_team: pd.DataFrame, team_name: str):
+        if df_team.empty:
+            return
+
+        df = df_team.copy()
+        for col in ["Player", "Item", "Coins", "Points"]:
+            if col in df.columns:
+                df[col] = df[col].astype(str).str.replace(",", "").str.strip()
+
+        df["Coins"] = pd.to_numeric(df.get("Coins", 0), errors="coerce").fillna(0)
+        df["Points"] = pd.to_numeric(df.get("Points", 0), errors="coerce").fillna(0)
+
+        df_valid = df[(df["Player"] != "") & (df["Item"] != "")]
+
+        mega_rares = [
+            "scythe of vitur", "twisted bow", "elder maul",
+            "kodai insignia", "tumeken's shadow"
+        ]
+
+        for _, row in df_valid.iterrows():
+            player = row["Player"]
+            item = row["Item"]
+            coins = float(row["Coins"])
+            points = float(row["Points"])
+
+            self._ensure_player(team_name, player)
+            pdata = self.team_players[team_name]["players"][player]
+            totals = self.team_players[team_name]["team_totals"]
+
+            # Drops (exclude bounty/challenge)
+            if not any(x in item.lower() for x in ["bounty daily", "challenge"]):
+                pdata["total_drops"] += 1
+                totals["total_drops"] += 1
+
+            pdata["total_points"] += points
+            pdata["total_coins"] += coins
+            totals["total_coins"] += coins
+
+            if points > pdata["most_points_item"]["points"]:
+                pdata["most_points_item"] = {"item": item, "points": points}
+
+            if "pet" in item.lower():
+                pdata["boss_pets"] += 1
+
+            if item.lower() == "jar":
+                pdata["jars"] += 1
+
+            if any(mr in item.lower() for mr in mega_rares):
+                pdata["mega_rares"] += 1
+
+            if coins > pdata["most_expensive_drop"]["value"]:
+                pdata["most_expensive_drop"] = {"item": item, "value": coins}
+
+    # ---------------------------------------------------------
+    # Output
+    # ---------------------------------------------------------
+    def metrics(self) -> dict:
+        output = {}
+        for team, data in self.team_players.items():
+            output[team] = {
+                "team_totals": {
+                    "total_drops": data["team_totals"]["total_drops"],
+                    "total_points": f'{data["team_totals"]["total_points"]:,.1f}',  # still 0 for now
+                    "total_coins": f'{data["team_totals"]["total_coins"]:,.0f}'
+                },
+                "players": {}
+            }
+
+            for player, pdata in data["players"].items():
+                output[team]["players"][player] = {
+                    "total_drops": pdata["total_drops"],
+                    "total_points": f'{pdata["total_points"]:,.1f}',
+                    "total_coins": f'{pdata["total_coins"]:,.0f}',
+                    "boss_pets": pdata["boss_pets"],
+                    "jars": pdata["jars"],
+                    "mega_rares": pdata["mega_rares"],
+                    "most_expensive_drop": {
+                        "item": pdata["most_expensive_drop"]["item"],
+                        "value": f'{pdata["most_expensive_drop"]["value"]:,.0f}'
+                    },
+                    "most_points_item": {
+                        "item": pdata["most_points_item"]["item"],
+                        "points": f'{pdata["most_points_item"]["points"]:,.1f}'
+                    }
+                }
+
+        return output
+
+    # ---------------------------------------------------------
+    # Data cleaning
+    # ---------------------------------------------------------
+    def clean_team_dataframe(self, df_team: pd.DataFrame) -> pd.DataFrame:
+        """Normalize and clean a team dataframe."""
+        if df_team is None or df_team.empty:
+            return pd.DataFrame()
+
+        df = df_team.copy()
+
+        # Normalize string columns
+        for col in ["Content", "Item", "Player"]:
+            if col in df.columns:
+                df[col] = df[col].fillna("").astype(str).str.strip()
+
+        # Normalize Coins
+        if "Coins" in df.columns:
+            df["Coins"] = (
+                df["Coins"]
+                .fillna(0)
+                .astype(str)
+                .str.replace(",", "")
+                .str.strip()
+                .replace(["", "NULL", "None"], "0")
+            )
+            df["Coins"] = pd.to_numeric(df["Coins"], errors="coerce").fillna(0).astype(int)
+        else:
+            df["Coins"] = 0
+
+        # Normalize Points
+        if "Points" in df.columns:
+            df["Points"] = (
+                df["Points"]
+                .fillna(0)
+                .astype(str)
+                .str.replace(",", "")
+                .str.strip()
+                .replace(["", "NULL", "None"], "0")
+            )
+            df["Points"] = pd.to_numeric(df["Points"], errors="coerce").fillna(0).astype(float)
+        else:
+            df["Points"] = 0.0
+
+        # Drop rows where all columns except 'Points' are empty/NaN
+        cols_except_points = [col for col in df.columns if col != "Points"]
+        df = df.loc[~df[cols_except_points].apply(lambda x: all([v in [None, "", "nan"] for v in x]), axis=1)]
+
+        return df
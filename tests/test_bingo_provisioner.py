@@ -0,0 +1,137 @@
+import asyncio
+import re
+
+import discord
+
+from src.commands.BingoProvisioner import BingoProvisioner, BINGO_ROLE
+
+
+# -------------------------
+# A guild that records calls and stores names the way Discord does
+# -------------------------
+class FakeRole:
+    def __init__(self, guild, name, color=None):
+        self.guild, self.name = guild, name
+        self.color = color or discord.Color.default()
+
+    async def edit(self, color, reason):
+        self.guild.calls.append(("edit_role", self.name))
+        self.color = color
+        return self
+
+
+class FakeChannel:
+    def __init__(self, guild, name, overwrites):
+        self.guild, self.name, self.overwrites = guild, name, dict(overwrites)
+
+    async def edit(self, overwrites, reason):
+        self.guild.calls.append(("edit_channel", self.name))
+        self.overwrites = dict(overwrites)
+
+
+class FakeMember:
+    def __init__(self, guild):
+        self.guild, self.roles = guild, []
+
+    async def add_roles(self, *roles, reason):
+        self.guild.calls.append(("add_roles", tuple(role.name for role in roles)))
+        self.roles += roles
+
+
+class FakeGuild:
+    def __init__(self, member_ids):
+        self.calls = []
+        self.default_role = FakeRole(self, "@everyone")
+        self.me = FakeRole(self, "bot")
+        self.roles = [self.default_role, FakeRole(self, "General"), FakeRole(self, "Captain")]
+        self.text_channels, self.voice_channels = [], []
+        self.members = {member_id: FakeMember(self) for member_id in member_ids}
+
+    def get_member(self, member_id):
+        return self.members.get(member_id)
+
+    async def create_role(self, name, color, mentionable, reason):
+        self.calls.append(("create_role", name))
+        role = FakeRole(self, name, color)
+        self.roles.append(role)
+        return role
+
+    async def create_text_channel(self, name, overwrites, reason):
+        self.calls.append(("create_text_channel", name))
+        # Discord lowercases text channel names, turns spaces into dashes and drops punctuation
+        self.text_channels.append(FakeChannel(self, re.sub(r"[^\w-]", "", name.lower().replace(" ", "-")), overwrites))
+
+    async def create_voice_channel(self, name, overwrites, reason):
+        self.calls.append(("create_voice_channel", name))
+        self.voice_channels.append(FakeChannel(self, name, overwrites))
+
+
+class FakeParser:
+    def __init__(self, config):
+        self.config = config
+
+
+def config(players: int, teams: list[str], colors: list[str]) -> dict:
+    return {
+        f"player{i}": {"discord_id": str(1000 + i), "role_name": teams[i % len(teams)], "color": colors[i % len(teams)]}
+        for i in range(players)
+    }
+
+
+def provision(guild, parser, channels=True):
+    provisioner = BingoProvisioner(guild, parser, channels=channels)
+    plan = provisioner.plan()
+    failed = asyncio.run(provisioner.apply(plan))
+    return plan, failed
+
+
+TEAMS = ["O'Neil's Crew", "Team Gold"]
+COLORS = ["#ff0000", "#ffd700"]
+
+
+def test_rerun_plans_zero_calls():
+    guild = FakeGuild(range(1000, 1010))
+    parser = FakeParser(config(10, TEAMS, COLORS))
+
+    plan, failed = provision(guild, parser)
+    assert failed == []
+    # Bingo + 2 team roles, a text and voice channel per team, one add_roles per member
+    assert len(plan.actions) == len(guild.calls) == 3 + 4 + 10
+    assert sorted(channel.name for channel in guild.text_channels) == ["oneils-crew-chat", "team-gold-chat"]
+
+    guild.calls.clear()
+    plan, _ = provision(guild, parser)
+    assert not plan
+    assert guild.calls == []
+
+
+def test_rerun_plans_only_the_difference():
+    guild = FakeGuild(range(1000, 1012))
+    provision(guild, FakeParser(config(10, TEAMS, COLORS)))
+    guild.calls.clear()
+
+    # Two new players, a new team color, and a channel whose permissions were reset
+    guild.text_channels[0].overwrites = {}
+    plan, failed = provision(guild, FakeParser(config(12, TEAMS, ["#ff0000", "#123456"])))
+
+    assert failed == []
+    assert sorted(action.kind for action in plan.actions) == ["add_roles", "add_roles", "edit_role", "edit_text_channel"]
+    assert not provision(guild, FakeParser(config(12, TEAMS, ["#ff0000", "#123456"])))[0]
+
+
+def test_members_get_missing_roles_in_one_call():
+    guild = FakeGuild([1000])
+    member = guild.members[1000]
+    member.roles.append(FakeRole(guild, BINGO_ROLE))
+
+    provision(guild, FakeParser(config(1, ["Team Red"], ["#ff0000"])), channels=False)
+
+    assert ("add_roles", ("Team Red",)) in guild.calls
+    assert [call for call in guild.calls if call[0] == "add_roles"] == [("add_roles", ("Team Red",))]
+
+
+def test_unknown_members_are_skipped():
+    guild = FakeGuild([])
+    plan, failed = provision(guild, FakeParser(config(3, ["Team Red"], ["#ff0000"])), channels=False)
+    assert [action.kind for action in plan.actions] == ["create_role", "create_role"]
+    assert failed == []
@@ -0,0 +1,62 @@
+import json
+import threading
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from parsers.GDoc import GDocClient as client_module
+from parsers.GDoc.GDocClient import GDocClient
+from parsers.GDoc.GDocDataRetriever import GDocDataRetriever
+
+
+@pytest.fixture
+def creds_path(workdir, monkeypatch):
+    """A generated service-account key where the retriever looks for one, and no shared client yet."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    path = workdir / "src" / "conf" / "google_auth.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "test",
+        "private_key_id": "1",
+        "private_key": pem,
+        "client_email": "bot@test.iam.gserviceaccount.com",
+        "client_id": "1",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }), encoding="utf-8")
+    monkeypatch.setattr(GDocClient, "_shared", None)
+    return path
+
+
+def test_retrievers_share_one_client(creds_path, monkeypatch):
+    builds = []
+    build = client_module.build
+    monkeypatch.setattr(client_module, "build", lambda *args, **kwargs: builds.append(args) or build(*args, **kwargs))
+
+    retrievers = [GDocDataRetriever(f"sheet {i}") for i in range(5)]
+
+    assert all(retriever.client is GDocClient.shared() for retriever in retrievers)
+    assert all(retriever.sheets is retrievers[0].sheets for retriever in retrievers)
+    assert builds == [("sheets", "v4"), ("drive", "v3")]
+
+
+def test_each_thread_reuses_its_own_connection(creds_path):
+    client = GDocClient.shared()
+    other = []
+    thread = threading.Thread(target=lambda: other.extend([client.http(), client.http()]))
+    thread.start()
+    thread.join()
+
+    assert client.http() is client.http()
+    assert other[0] is other[1]
+    assert other[0] is not client.http()
+
+
+def test_missing_key_leaves_the_retriever_without_a_client(workdir, monkeypatch):
+    monkeypatch.setattr(GDocClient, "_shared", None)
+    retriever = GDocDataRetriever("sheet")
+    assert retriever.client is None and retriever.sheets is None
+    assert GDocClient._shared is None
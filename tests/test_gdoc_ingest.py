@@ -0,0 +1,252 @@
+import random
+import threading
+
+from fakes import FakeSheets
+from parsers.GDoc.GDocDataParser import GDocDataParser, FULL_PARSE_EVERY, HEADER_ROWS, TAIL_ROWS
+from parsers.GDoc.GDocDataRetriever import GDocDataRetriever, a1_range
+from parsers.GDoc.GDocResponseCache import GDocResponseCache
+
+ITEMS = ["Dragon bones", "Pet snakeling", "Jar", "Twisted bow", "Bounty Daily", "Dragon claws", "Rune, full helm"]
+TEAMS = {"Team Red": 0, "Team Gold": 9}
+
+
+def drop_row(rng: random.Random, team_name: str) -> list:
+    player = rng.choice([f"{team_name} {i}" for i in range(8)] + [f"{team_name.lower()}_1"])
+    return ["Boss", rng.choice(ITEMS), player, "", f"{rng.randint(0, 2_000_000):,}", str(rng.choice([0, 0.5, 2.5]))]
+
+
+def inputs_tab(rows_per_team: dict[str, int], seed: int = 0) -> list[list]:
+    """An Inputs tab with a labelled block per team, each block its own number of drop rows."""
+    rng = random.Random(seed)
+    width = max(TEAMS.values()) + 6
+    rows = [[""] * width, [""] * width]
+    for team_name, start in TEAMS.items():
+        rows[0][start] = team_name
+        rows[1][start:start + 6] = ["Content", "Item", "Player", "", "Coins", "Points"]
+    for i in range(max(rows_per_team.values())):
+        row = [""] * width
+        for team_name, start in TEAMS.items():
+            if i < rows_per_team[team_name]:
+                row[start:start + 6] = drop_row(rng, team_name)
+        rows.append(row)
+    return rows
+
+
+def append_rows(tab: list[list], rows_per_team: dict[str, int], seed: int) -> list[list]:
+    """`tab` with more drop rows under each team's last filled row."""
+    rng = random.Random(seed)
+    tab = [list(row) for row in tab]
+    for team_name, count in rows_per_team.items():
+        start = TEAMS[team_name]
+        last = max(i for i, row in enumerate(tab) if any(row[start:start + 6]))
+        for i in range(last + 1, last + 1 + count):
+            if i == len(tab):
+                tab.append([""] * len(tab[0]))
+            tab[i][start:start + 6] = drop_row(rng, team_name)
+    return tab
+
+
+def retriever(sheets: FakeSheets, cache_dir: str = "cache", ttl_seconds: float = 0) -> GDocDataRetriever:
+    """A retriever over `sheets`; with the default TTL of 0 every read checks the revision."""
+    cache = GDocResponseCache(cache_dir, ttl_seconds=ttl_seconds)
+    return GDocDataRetriever("local", sheets=sheets, drive=sheets.files(), cache=cache)
+
+
+def parse(sheets: FakeSheets, incremental: bool = False, cache_dir: str = "cache") -> dict:
+    """A run with a fresh name index, written out with the sheet's spellings."""
+    parser = GDocDataParser(retriever(sheets, cache_dir), hunt_edition="test")
+    return parser.run(save=False, incremental=incremental).to_json(parser.name_index.display_name)
+
+
+def full_parse(tab: list[list]) -> dict:
+    # Its own cache, so nothing cached from the sheet under test is served
+    return parse(FakeSheets({"Inputs": tab}), cache_dir="full-cache")
+
+
+def test_incremental_ingest_matches_full_parse(workdir):
+    sheets = FakeSheets({"Inputs": inputs_tab({"Team Red": 120, "Team Gold": 80})})
+    parse(sheets)
+
+    sheets.set_tab("Inputs", append_rows(sheets.tabs["Inputs"], {"Team Red": 15, "Team Gold": 40}, seed=1))
+    requests_before = len(sheets.requests)
+    incremental = parse(sheets, incremental=True)
+
+    # One round trip: the header rows, then each block from a little above its watermark
+    assert sheets.requests[requests_before:] == [["'Inputs'!1:2", f"'Inputs'!A{HEADER_ROWS + 121 - TAIL_ROWS}:F",
+                                                  f"'Inputs'!J{HEADER_ROWS + 81 - TAIL_ROWS}:O"]]
+    assert incremental == full_parse(sheets.tabs["Inputs"])
+
+
+def test_incremental_ingest_after_edit_matches_full_parse(workdir):
+    sheets = FakeSheets({"Inputs": inputs_tab({"Team Red": 60, "Team Gold": 60})})
+    parse(sheets)
+
+    # An already-ingested row inside the tail changes, so the saved aggregates no longer hold
+    tab = append_rows(sheets.tabs["Inputs"], {"Team Red": 5, "Team Gold": 5}, seed=2)
+    tab[HEADER_ROWS + 50][1] = "Twisted bow"
+    sheets.set_tab("Inputs", tab)
+
+    assert parse(sheets, incremental=True) == full_parse(tab)
+
+
+def test_edit_above_the_tail_rows_forces_a_full_parse(workdir):
+    sheets = FakeSheets({"Inputs": inputs_tab({"Team Red": 60, "Team Gold": 60})})
+    parse(sheets)
+
+    # Out of the hashed tail, so only the sheet's revision gives it away
+    tab = [list(row) for row in sheets.tabs["Inputs"]]
+    tab[HEADER_ROWS + 5][1] = "Twisted bow"
+    sheets.set_tab("Inputs", tab)
+
+    assert parse(sheets, incremental=True) == full_parse(tab)
+
+
+def test_edit_above_the_tail_rows_with_new_rows_waits_for_the_next_full_parse(workdir):
+    sheets = FakeSheets({"Inputs": inputs_tab({"Team Red": 60, "Team Gold": 60})})
+    parse(sheets)
+
+    tab = append_rows(sheets.tabs["Inputs"], {"Team Red": 5, "Team Gold": 5}, seed=3)
+    tab[HEADER_ROWS + 5][1] = "Twisted bow"
+    sheets.set_tab("Inputs", tab)
+    runs = [parse(sheets, incremental=True) for _ in range(FULL_PARSE_EVERY + 1)]
+
+    # The appended rows explain the new revision, so the edit is missed until runs run out
+    assert runs[0] != full_parse(tab)
+    assert runs[-1] == full_parse(tab)
+
+
+def test_incremental_ingest_without_changes_is_unchanged(workdir):
+    sheets = FakeSheets({"Inputs": inputs_tab({"Team Red": 30, "Team Gold": 10})})
+    first = parse(sheets)
+    assert parse(sheets, incremental=True) == first
+    assert "Team Red 3" in first["Team Red"]["players"]
+
+
+def test_full_parse_fetches_only_the_team_blocks(workdir):
+    sheets = FakeSheets({"Inputs": inputs_tab({"Team Red": 40, "Team Gold": 25})})
+    parse(sheets)
+
+    # The header rows, then every block's six columns in one batch
+    assert sheets.requests == [["'Inputs'!1:2"], ["'Inputs'!A3:F", "'Inputs'!J3:O"]]
+
+
+def test_batch_get_reads_ranges_from_several_tabs(workdir):
+    sheets = FakeSheets({
+        "Inputs": inputs_tab({"Team Red": 3, "Team Gold": 1}),
+        "Bot Config": [["key", "value"], ["guild", "123"], ["channel"]],
+    })
+    gdoc = retriever(sheets)
+
+    config, labels = gdoc.get_data_from_ranges([a1_range("Bot Config", "A2", "B"), a1_range("Inputs", "A1", "O1")], [2, 0])
+
+    assert sheets.requests == [["'Bot Config'!A2:B", "'Inputs'!A1:O1"]]
+    assert config.tolist() == [["guild", "123"], ["channel", ""]]
+    assert labels[0, 0] == "Team Red" and labels[0, 9] == "Team Gold"
+
+
+# -------------------------
+# Response cache
+# -------------------------
+RANGES = ["'Inputs'!A1:F", "'Bot Config'!A1:B"]
+
+
+def config_sheets() -> FakeSheets:
+    return FakeSheets({"Inputs": inputs_tab({"Team Red": 5, "Team Gold": 5}), "Bot Config": [["guild", "123"]]})
+
+
+def test_unchanged_sheet_is_served_after_one_version_check(workdir):
+    sheets = config_sheets()
+    gdoc = retriever(sheets)
+    first = gdoc.get_data_from_ranges(RANGES)
+
+    second = gdoc.get_data_from_ranges(RANGES)
+
+    assert len(sheets.requests) == 1
+    assert sheets.version_checks == 2
+    assert [grid.tolist() for grid in second] == [grid.tolist() for grid in first]
+    assert gdoc.cache.stats() == {"hits": 2, "misses": 2}
+
+
+def test_fresh_entries_are_served_without_asking_google(workdir):
+    sheets = config_sheets()
+    gdoc = retriever(sheets, ttl_seconds=60)
+    gdoc.get_data_from_ranges(RANGES)
+
+    gdoc.get_data_from_ranges(RANGES)
+
+    assert len(sheets.requests) == 1
+    assert sheets.version_checks == 1
+
+
+def test_edited_sheet_is_refetched(workdir):
+    sheets = config_sheets()
+    gdoc = retriever(sheets)
+    gdoc.get_data_from_ranges(RANGES)
+
+    sheets.set_tab("Bot Config", [["guild", "456"]])
+    _, config = gdoc.get_data_from_ranges(RANGES)
+
+    assert sheets.requests[-1] == RANGES
+    assert config.tolist() == [["guild", "456"]]
+
+
+def test_a_request_never_mixes_revisions(workdir):
+    sheets = config_sheets()
+    gdoc = retriever(sheets, ttl_seconds=60)
+    gdoc.get_data_from_ranges(RANGES[:1])
+
+    # The cached Inputs range is still fresh, but Bot Config has to be fetched at the new revision
+    sheets.set_tab("Inputs", inputs_tab({"Team Red": 1, "Team Gold": 1}, seed=1))
+    inputs, _ = gdoc.get_data_from_ranges(RANGES)
+
+    assert sheets.requests[-1] == RANGES
+    assert inputs.tolist()[2][:3] == sheets.tabs["Inputs"][2][:3]
+
+
+def test_cache_is_shared_through_the_cache_file(workdir):
+    sheets = config_sheets()
+    retriever(sheets).get_data_from_ranges(RANGES)
+
+    retriever(sheets).get_data_from_ranges(RANGES)
+    assert len(sheets.requests) == 1
+
+
+def test_damaged_cache_file_only_costs_a_refetch(workdir):
+    sheets = config_sheets()
+    retriever(sheets).get_data_from_ranges(RANGES)
+    (workdir / "cache" / "local.json").write_text("{not json", encoding="utf-8")
+
+    inputs, config = retriever(sheets).get_data_from_ranges(RANGES)
+
+    assert len(sheets.requests) == 2
+    assert config.tolist() == [["guild", "123"]]
+
+
+def test_concurrent_cache_writers_do_not_collide(workdir):
+    errors = []
+
+    def write(thread: int):
+        cache = GDocResponseCache("cache")
+        for i in range(300):
+            try:
+                cache.put("local", {f"'Inputs'!A{i}:F": [[str(thread)]]}, revision="1")
+            except OSError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(thread,)) for thread in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(path.name for path in (workdir / "cache").iterdir()) == ["local.json"]
+
+
+def test_unwritable_cache_still_serves_the_fetched_values(workdir):
+    # A file where the cache directory should be
+    (workdir / "cache").write_text("", encoding="utf-8")
+    sheets = config_sheets()
+
+    _, config = retriever(sheets).get_data_from_ranges(RANGES)
+    assert config.tolist() == [["guild", "123"]]
@@ -0,0 +1,159 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakes import FakeSheets
+from parsers.GDoc.GDocDataParser import GDocDataParser
+from parsers.GDoc.GDocDataRetriever import GDocDataRetriever
+from parsers.GDoc.GDocItemCatalog import GDocItemCatalog
+from legacy import LegacyGDocDataParser
+
+HEADER = ["Content", "Item", "Player", "Date", "Coins", "Points"]
+ITEMS = ["Dragon bones", "Pet snakeling", "Jar", "jar of dirt", "Twisted bow", "Bounty Daily", "Challenge 3",
+         "Abyssal whip", "Tumeken's shadow", "Scythe of Vitur (uncharged)", "Elder maul", "Kodai insignia",
+         "Petal garland", "Rune, full helm"]
+
+
+def retriever(sheet: list[list[str]]) -> GDocDataRetriever:
+    """A retriever that reads `sheet` as the Inputs tab instead of calling the Sheets API."""
+    return GDocDataRetriever("local", sheets=FakeSheets({"Inputs": sheet}))
+
+
+def random_drop(rng: random.Random, players: list[str]) -> list[str]:
+    """One drop-log row: Content, Item, Player, Date, Coins, Points, with blanks and ties."""
+    return [
+        rng.choice(["Zulrah", "CoX", ""]),
+        rng.choice(ITEMS + [""]),
+        rng.choice(players + [""]),
+        "1/8/2025",
+        rng.choice(["", "NULL", "0", "1,000", "250,000", f"{rng.randint(0, 5_000_000):,}"]),
+        rng.choice(["", "0", "1.5", "10", str(rng.randint(0, 200) / 10)]),
+    ]
+
+
+def random_sheet(seed: int, rows: int = 400) -> list[list[str]]:
+    """The Inputs tab: team labels, headers, then Team Red in A-F and Team Gold in J-O."""
+    rng = random.Random(seed)
+    players = [f"player {i}" for i in range(25)]
+    sheet = [["Team Red"] + [""] * 8 + ["Team Gold"] + [""] * 5, HEADER + [""] * 3 + HEADER]
+    for _ in range(rows):
+        red = random_drop(rng, players) if rng.random() > 0.1 else [""] * 6
+        gold = random_drop(rng, players) if rng.random() > 0.3 else [""] * 6
+        sheet.append(red + [""] * 3 + gold)
+    return sheet
+
+
+def without_item_counts(output: dict) -> dict:
+    """Drop item_counts (raid uniques), which the legacy parser never produced."""
+    for team in output.values():
+        for player in team["players"].values():
+            player.pop("item_counts", None)
+    return output
+
+
+def legacy_output(sheet: list[list[str]]) -> dict:
+    """The legacy parser's output, plus the intended change: team total_points is summed from the players."""
+    legacy = LegacyGDocDataParser(retriever(sheet))
+    output = legacy.run()
+    for team_name, team in legacy.team_players.items():
+        points = sum(player["total_points"] for player in team["players"].values())
+        output[team_name]["team_totals"]["total_points"] = f"{points:,.1f}"
+    return output
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_parse_matches_legacy_on_random_sheets(workdir, seed):
+    sheet = random_sheet(seed)
+    expected = legacy_output(sheet)
+
+    output = GDocDataParser(retriever(sheet), hunt_edition="test").run(save=False).to_json()
+    assert without_item_counts(output) == expected
+
+
+def test_ingest_matches_legacy_iterrows_on_one_drop_log(workdir):
+    rng = random.Random(16)
+    players = [f"player {i}" for i in range(40)]
+    log = pd.DataFrame([random_drop(rng, players) for _ in range(5000)], columns=HEADER).drop(columns="Date")
+
+    legacy = LegacyGDocDataParser()
+    legacy.ingest_team_dataframe(legacy.clean_team_dataframe(log), "Team Red")
+    expected = legacy.metrics()["Team Red"]["players"]
+
+    parser = GDocDataParser(gdoc=None, hunt_edition="test")
+    parser.ingest_team_dataframe(parser.clean_team_dataframe(log), "Team Red")
+    assert without_item_counts(parser.build_metrics().to_json())["Team Red"]["players"] == expected
+
+
+def test_detect_team_blocks_reads_the_label_row():
+    grid = np.array([
+        ["Team Red", "", "", "", "", "", "note", "Team Blue", "", "", "", "", "", "Team Gold", "", "", "", "", ""],
+        HEADER + [""] + HEADER + HEADER,
+    ], dtype=object)
+    assert GDocDataParser.detect_team_blocks(grid) == {"Team Red": 0, "Team Blue": 7, "Team Gold": 13}
+
+
+def test_labels_without_block_headers_are_skipped_and_logged(caplog):
+    grid = np.array([
+        ["Team Red", "", "", "", "", "", "Signups", "", "", "", "", "", "Team Gold", "", "", "", "", ""],
+        HEADER + ["Name", "RSN", "Team", "Date", "Coins", "Points"] + HEADER,
+    ], dtype=object)
+
+    assert GDocDataParser.detect_team_blocks(grid) == {"Team Red": 0, "Team Gold": 12}
+    assert [record.levelname for record in caplog.records] == ["WARNING"]
+    assert "'Signups' in column G" in caplog.text
+
+
+def test_block_headers_are_matched_at_their_offsets():
+    shifted = ["", "Content", "Item", "Player", "Date", "Coins", "Points"]
+    grid = np.array([["Team Red", "", "", "", "", "", "", "Team Gold"] + [""] * 5, shifted + HEADER], dtype=object)
+    assert GDocDataParser.detect_team_blocks(grid) == {"Team Gold": 7}
+
+
+def test_unlabelled_sheet_falls_back_to_red_and_gold():
+    grid = np.array([[""] * 15, HEADER + [""] * 3 + HEADER], dtype=object)
+    assert GDocDataParser.detect_team_blocks(grid) == {"Team Red": 0, "Team Gold": 9}
+
+
+def test_every_detected_team_is_parsed(workdir):
+    rng = random.Random(18)
+    teams = ["Team Red", "Team Blue", "Team Gold"]
+    sheet = [sum(([team] + [""] * 6 for team in teams), []), sum((HEADER + [""] for _ in teams), [])]
+    drops = {team: 0 for team in teams}
+    for _ in range(300):
+        row = []
+        for team in teams:
+            item = rng.choice(["Dragon bones", "Bounty Daily", ""])
+            row += ["Zulrah", item, f"{team.lower()} {rng.randint(0, 4)}", "", "1,000", "1"] + [""]
+            drops[team] += item == "Dragon bones"
+        sheet.append(row)
+
+    output = GDocDataParser(retriever(sheet), hunt_edition="test").run(save=False)
+
+    assert list(output.teams) == teams
+    assert {team: output.teams[team].totals.total_drops for team in teams} == drops
+    assert all(player.startswith(team.lower()) for team in teams for player in output.teams[team].players)
+
+
+def test_catalog_finds_every_category_an_item_is_in():
+    catalog = GDocItemCatalog.load()
+    names = ["Twisted bow", "Jar", "jar of dirt", "Pet snakeling", "Dragon bones"]
+    matrix = catalog.classify(names)
+
+    hits = {name: {catalog.categories[slot] for slot in row.nonzero()[0]} for name, row in zip(names, matrix)}
+    assert hits == {
+        "Twisted bow": {"mega_rares", "cox_uniques"},
+        "Jar": {"jars"},
+        "jar of dirt": set(),
+        "Pet snakeling": {"pets"},
+        "Dragon bones": set(),
+    }
+
+
+def test_item_counts_only_list_categories_a_player_has(workdir):
+    output = GDocDataParser(retriever(random_sheet(19)), hunt_edition="test").run(save=False).to_json()
+
+    counts = [player.get("item_counts", {}) for team in output.values() for player in team["players"].values()]
+    assert any(counts)
+    assert all(count > 0 for player_counts in counts for count in player_counts.values())
@@ -0,0 +1,79 @@
+import copy
+import random
+
+from HuntAggregator import HuntAggregator
+from HuntMetrics import HuntMetrics, PlayerMetrics, TeamMetrics, WOMMetrics
+
+
+def make_player(rng: random.Random) -> PlayerMetrics:
+    # Halves add up exactly, so incremental and rebuilt totals can be compared as-is
+    wom = None
+    if rng.random() < 0.8:
+        wom = WOMMetrics(
+            ehb=rng.randint(0, 40) / 2, raids=rng.randint(0, 30), cox=rng.randint(0, 10), tob=rng.randint(0, 10),
+            toa=rng.randint(0, 10), xp_gained=rng.randint(0, 10 ** 6),
+            clues={"total": 6, "beginner": 1, "easy": 1, "medium": 1, "hard": 1, "elite": 1, "master": 1},
+        )
+    return PlayerMetrics(
+        total_drops=rng.randint(0, 50), total_points=rng.randint(0, 200) / 2, total_coins=rng.randint(0, 10 ** 7),
+        boss_pets=rng.randint(0, 2), jars=rng.randint(0, 1), mega_rares=rng.randint(0, 1), wom=wom,
+    )
+
+
+def make_hunt(rng: random.Random, teams: int = 3, players: int = 12) -> HuntMetrics:
+    return HuntMetrics(teams={
+        f"Team {t}": TeamMetrics(players={f"player {t}-{p}": make_player(rng) for p in range(players)})
+        for t in range(teams)
+    })
+
+
+def rebuilt(hunt: HuntMetrics) -> dict:
+    return HuntAggregator(copy.deepcopy(hunt)).hunt.to_json()
+
+
+def test_apply_matches_rebuild():
+    rng = random.Random(0)
+    aggregator = HuntAggregator(make_hunt(rng))
+
+    for _ in range(5):
+        latest = copy.deepcopy(aggregator.hunt)
+        for team in latest.teams.values():
+            for player_name in rng.sample(list(team.players), min(3, len(team.players))):
+                team.players[player_name] = make_player(rng)
+            if len(team.players) > 1:
+                del team.players[rng.choice(list(team.players))]
+            team.players[f"new {rng.random()}"] = make_player(rng)
+        latest.teams[f"Team {rng.random()}"] = TeamMetrics(players={"solo": make_player(rng)})
+
+        expected = rebuilt(latest)
+        aggregator.apply(copy.deepcopy(latest))
+        assert aggregator.hunt.to_json() == expected
+
+
+def test_apply_only_touches_changed_players():
+    rng = random.Random(1)
+    aggregator = HuntAggregator(make_hunt(rng))
+    latest = copy.deepcopy(aggregator.hunt)
+
+    assert aggregator.apply(copy.deepcopy(latest)) == []
+
+    latest.teams["Team 1"].players["player 1-4"].total_drops += 1
+    del latest.teams["Team 2"].players["player 2-0"]
+    changed = aggregator.apply(copy.deepcopy(latest))
+
+    assert sorted(changed) == [("Team 1", "player 1-4"), ("Team 2", "player 2-0")]
+    assert aggregator.hunt.to_json() == rebuilt(latest)
+
+
+def test_team_bests_follow_updates():
+    hunt = HuntMetrics(teams={"Team": TeamMetrics(players={
+        "a": PlayerMetrics(total_points=10, wom=WOMMetrics(ehb=1)),
+        "b": PlayerMetrics(total_points=30, wom=WOMMetrics(ehb=2)),
+    })})
+    aggregator = HuntAggregator(hunt)
+    assert aggregator.hunt.teams["Team"].totals.bests["points_per_ehb"][0].player == "b"
+
+    aggregator.update_player("Team", "a", PlayerMetrics(total_points=40, wom=WOMMetrics(ehb=1)))
+    best = aggregator.hunt.teams["Team"].totals.bests["points_per_ehb"][0]
+    assert (best.player, best.value) == ("a", 40)
+    assert aggregator.hunt.teams["Team"].totals.total_points == 70
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from fakes import FakeWOM
+from HuntStats import HuntStats
+from parsers.WOM import WOMDataRetriever as retriever_module
+from parsers.WOM.RateLimiter import AdaptiveRateController, TokenBucket
+
+
+@pytest.fixture
+def wom(hunt_14, monkeypatch):
+    """WOM serving Hunt-14's competition and gains, with no pacing."""
+    bucket = TokenBucket(rate=10 ** 6, capacity=10 ** 6)
+    monkeypatch.setattr(retriever_module, "rate_limiter", bucket)
+    monkeypatch.setattr(retriever_module, "rate_controller", AdaptiveRateController(bucket, base_delay=0))
+    competition = json.loads((hunt_14 / "competition.json").read_text(encoding="utf-8"))
+    gains = {path.stem: json.loads(path.read_text(encoding="utf-8")) for path in hunt_14.joinpath("players").glob("*.json")}
+    return FakeWOM(competition, gains).install(monkeypatch, retriever_module)
+
+
+def test_refresh_reads_and_writes_the_data_dir_from_any_working_directory(wom, hunt_14, tmp_path, monkeypatch):
+    # The bot runs from src/, not the repo root; nothing may land relative to it
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    data_dir = hunt_14.parent
+    # Only the sheet's totals, so the team totals below must have been written by this refresh
+    sheet_metrics = json.loads((hunt_14 / "hunt_metrics.json").read_text(encoding="utf-8"))
+    for team in sheet_metrics.values():
+        team["team_totals"] = {key: team["team_totals"][key] for key in ("total_drops", "total_points", "total_coins")}
+    (hunt_14 / "hunt_metrics.json").write_text(json.dumps(sheet_metrics), encoding="utf-8")
+
+    stats = HuntStats(hunt_edition="test", gdoc_sheet_id="sheet", wom_comp_id="1", data_dir=data_dir)
+    changed = stats.refresh()
+
+    assert changed == sum(len(team.players) for team in stats.data.teams.values()) > 0
+    saved = json.loads((hunt_14 / "hunt_metrics.json").read_text(encoding="utf-8"))
+    assert all("total_ehb" in team["team_totals"] for team in saved.values())
+    assert (hunt_14 / "manifest.json").exists()
+    assert stats.gdoc_retriever.cache.cache_dir == str(data_dir / "gdoc_cache")
+    assert list(elsewhere.iterdir()) == []
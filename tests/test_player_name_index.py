@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+
+from PlayerNameIndex import PlayerNameIndex, normalize_name
+from parsers.WOM.WOMDataParser import WOMDataParser
+
+
+def sheet_player(drops: int, points: float) -> dict:
+    return {
+        "total_drops": drops, "total_points": f"{points:,.1f}", "total_coins": "1,000", "boss_pets": 0, "jars": 0,
+        "mega_rares": 0, "most_expensive_drop": {"item": "Bones", "value": "1,000"},
+        "most_points_item": {"item": "Bones", "points": f"{points:,.1f}"},
+    }
+
+
+def gains(kills: int) -> dict:
+    return {"data": {
+        "skills": {"overall": {"metric": "overall", "experience": {"gained": kills * 100}}},
+        "bosses": {"zulrah": {"metric": "zulrah", "kills": {"gained": kills}}},
+        "activities": {},
+    }}
+
+
+@pytest.fixture
+def mixed_case_hunt(workdir):
+    """Sheet, competition and player files that each spell the same players differently."""
+    hunt_dir = workdir / "data" / "Hunt-test"
+    (hunt_dir / "players").mkdir(parents=True)
+    hunt_dir.joinpath("hunt_metrics.json").write_text(json.dumps({"Team": {
+        "team_totals": {"total_drops": 0, "total_points": "0.0", "total_coins": "0"},
+        "players": {"Air Xiron": sheet_player(3, 10), "air-xiron": sheet_player(2, 5), "Player One": sheet_player(1, 1)},
+    }}))
+    hunt_dir.joinpath("competition.json").write_text(json.dumps({"participations": [
+        {"player": {"id": 1, "displayName": "AIR_XIRON"}, "progress": {"gained": 12.5}},
+        {"player": {"id": 2, "displayName": "player one"}, "progress": {"gained": 4.0}},
+    ]}))
+    hunt_dir.joinpath("players", "Air_Xiron.json").write_text(json.dumps(gains(7)))
+    hunt_dir.joinpath("players", "PLAYER-ONE.json").write_text(json.dumps(gains(3)))
+    return hunt_dir
+
+
+def test_normalize_name():
+    assert normalize_name("Air_Xiron") == normalize_name(" air-xiron ") == normalize_name("AIR  XIRON") == "air xiron"
+
+
+def test_first_spelling_sticks_and_unchanged_index_is_not_rewritten(tmp_path):
+    index = PlayerNameIndex(str(tmp_path / "player_index.json"))
+    assert index.record("Air Xiron", gdoc_name="Air Xiron") == "air xiron"
+    index.record("air_xiron", gdoc_name="air_xiron", file_key="air_xiron")
+    index.save()
+
+    loaded = PlayerNameIndex.load(str(tmp_path / "player_index.json"))
+    assert loaded.get("AIR-XIRON") == {"wom_id": None, "display_name": None, "gdoc_name": "Air Xiron",
+                                       "file_key": "air_xiron"}
+
+    loaded.record("Air Xiron", gdoc_name="Air Xiron")
+    assert not loaded.dirty
+
+
+def test_parser_matches_every_spelling_without_renaming_files(mixed_case_hunt):
+    files_before = sorted(os.listdir(mixed_case_hunt / "players"))
+
+    hunt = WOMDataParser(hunt_edition="test").run(save=False)
+
+    players = hunt.teams["Team"].players
+    assert set(players) == {"air xiron", "player one"}
+    # Both sheet spellings of Air Xiron are one player
+    assert (players["air xiron"].total_drops, players["air xiron"].total_points) == (5, 15)
+    assert (players["air xiron"].wom.ehb, players["air xiron"].wom.boss_kills) == (12.5, 7)
+    assert (players["player one"].wom.ehb, players["player one"].wom.boss_kills) == (4.0, 3)
+    assert sorted(os.listdir(mixed_case_hunt / "players")) == files_before
+
+
+def test_saved_metrics_keep_the_sheet_spelling(mixed_case_hunt):
+    WOMDataParser(hunt_edition="test").run()
+
+    players = json.loads(mixed_case_hunt.joinpath("hunt_metrics.json").read_text())["Team"]["players"]
+    assert set(players) == {"Air Xiron", "Player One"}
+
+
+def test_lowercase_sheet_names_are_not_recapitalized_from_wom(mixed_case_hunt):
+    # Already-normalized sheet spellings, as in Hunt-14, with WOM capitalizing them
+    hunt_metrics = mixed_case_hunt / "hunt_metrics.json"
+    hunt_metrics.write_text(json.dumps({"Team": {
+        "team_totals": {"total_drops": 0, "total_points": "0.0", "total_coins": "0"},
+        "players": {"air xiron": sheet_player(3, 10), "player one": sheet_player(1, 1)},
+    }}))
+    competition = json.loads(mixed_case_hunt.joinpath("competition.json").read_text())
+    competition["participations"][1]["player"]["displayName"] = "Player One"
+    mixed_case_hunt.joinpath("competition.json").write_text(json.dumps(competition))
+
+    WOMDataParser(hunt_edition="test").run()
+
+    assert set(json.loads(hunt_metrics.read_text())["Team"]["players"]) == {"air xiron", "player one"}
+
+
+def test_wom_spelling_is_only_used_for_players_not_on_the_sheet():
+    index = PlayerNameIndex()
+    index.add_participants([{"player": {"id": 1, "displayName": "Air_Xiron"}},
+                            {"player": {"id": 2, "displayName": "Wom Only"}}])
+    index.record("AIR XIRON", gdoc_name="AIR XIRON")
+
+    assert index.display_name("air xiron") == "AIR XIRON"
+    assert index.display_name("wom only") == "Wom Only"
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from HuntMetrics import HuntMetrics
+from PlayerNameIndex import PlayerNameIndex
+from PlayerNameMatcher import PlayerNameMatcher
+from parsers.WOM.WOMDataParser import WOMDataParser
+
+
+def test_typos_match_their_participant():
+    matcher = PlayerNameMatcher(["zezima", "air xiron", "lynx titan", "b0aty"])
+    matches = {m.name: m for m in matcher.match(["air xirn", "lynxtitan", "someone else"])}
+
+    assert (matches["air xirn"].match, matches["air xirn"].confident) == ("air xiron", True)
+    assert (matches["lynxtitan"].match, matches["lynxtitan"].score) == ("lynx titan", 1.0)
+    assert "someone else" not in matches
+
+
+def test_each_participant_is_claimed_once():
+    matches = PlayerNameMatcher(["air xiron"]).match(["air xirn", "air xiron1"])
+    assert [(m.name, m.match) for m in matches] == [("air xiron1", "air xiron")]
+
+
+def test_names_with_different_digits_are_never_confident():
+    [match] = PlayerNameMatcher(["zezima2"]).match(["zezima1"])
+    assert match.match == "zezima2"
+    assert not match.confident
+
+
+@pytest.fixture
+def misspelled_hunt(workdir):
+    """A sheet that spells one participant with a typo."""
+    hunt_dir = workdir / "data" / "Hunt-test"
+    (hunt_dir / "players").mkdir(parents=True)
+    hunt_dir.joinpath("hunt_metrics.json").write_text(json.dumps({"Team": {
+        "team_totals": {"total_drops": 0, "total_points": "0.0", "total_coins": "0"},
+        "players": {"air xirn": {"total_drops": 1}, "zezima1": {"total_drops": 2}},
+    }}))
+    hunt_dir.joinpath("competition.json").write_text(json.dumps({"participations": [
+        {"player": {"id": 1, "displayName": "Air Xiron"}, "progress": {"gained": 12.5}},
+        {"player": {"id": 2, "displayName": "Zezima2"}, "progress": {"gained": 4.0}},
+    ]}))
+    return hunt_dir
+
+
+def load_index(hunt_dir) -> PlayerNameIndex:
+    return PlayerNameIndex.load(str(hunt_dir / "player_index.json"))
+
+
+def test_parser_applies_confident_matches_only(misspelled_hunt):
+    WOMDataParser(hunt_edition="test").run()
+
+    hunt = HuntMetrics.load(str(misspelled_hunt / "hunt_metrics.json"))
+    players = hunt.teams["Team"].players
+    assert players["air xirn"].wom.ehb == 12.5
+    assert players["zezima1"].wom is None
+
+
+def test_matches_are_saved_as_pending_not_as_aliases(misspelled_hunt):
+    WOMDataParser(hunt_edition="test").run()
+
+    index = load_index(misspelled_hunt)
+    assert index.aliases == {}
+    assert index.resolve("air xirn") == "air xirn"
+    assert {name: proposal["match"] for name, proposal in index.pending.items()} == {
+        "air xirn": "air xiron", "zezima1": "zezima2",
+    }
+    assert index.pending["air xirn"]["score"] >= 0.85
+
+
+def test_confirmed_match_becomes_an_alias(misspelled_hunt):
+    sheet = (misspelled_hunt / "hunt_metrics.json").read_text()
+    WOMDataParser(hunt_edition="test").run()
+    index = load_index(misspelled_hunt)
+    assert index.confirm_alias("Air Xirn") == "air xiron"
+    index.save()
+
+    index = load_index(misspelled_hunt)
+    assert index.resolve("air xirn") == "air xiron"
+    assert "air xirn" not in index.pending
+    (misspelled_hunt / "hunt_metrics.json").write_text(sheet)
+    WOMDataParser(hunt_edition="test").run()
+    assert HuntMetrics.load(str(misspelled_hunt / "hunt_metrics.json")).teams["Team"].players["air xirn"].wom.ehb == 12.5
+
+
+def test_rejected_match_is_not_applied_again(misspelled_hunt):
+    # Each run starts from the sheet's metrics, as it does after a GDoc parse
+    sheet = (misspelled_hunt / "hunt_metrics.json").read_text()
+    WOMDataParser(hunt_edition="test").run()
+    index = load_index(misspelled_hunt)
+    index.reject_alias("air xirn")
+    index.save()
+    (misspelled_hunt / "hunt_metrics.json").write_text(sheet)
+
+    WOMDataParser(hunt_edition="test").run()
+
+    assert HuntMetrics.load(str(misspelled_hunt / "hunt_metrics.json")).teams["Team"].players["air xirn"].wom is None
+    assert "air xirn" not in load_index(misspelled_hunt).pending
@@ -0,0 +1,104 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from parsers.WOM import RateLimiter
+from parsers.WOM.RateLimiter import AdaptiveRateController, TokenBucket, parse_reset, parse_retry_after
+
+
+class FakeClock:
+    """Stands in for the time module inside RateLimiter; sleeping is just moving the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return time.time()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(RateLimiter, "time", clock)
+    return clock
+
+
+def request_starts(bucket: TokenBucket, clock: FakeClock, requests: int) -> list[float]:
+    """Start times of back-to-back callers that each wait as long as the bucket says."""
+    starts = []
+    for _ in range(requests):
+        start = clock.now + bucket.reserve()
+        starts.append(start)
+        clock.now = start
+    return starts
+
+
+def busiest_window(starts: list[float], window: float) -> int:
+    return max(sum(1 for other in starts if start <= other < start + window) for start in starts)
+
+
+def test_bucket_starts_full_then_paces_at_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    starts = request_starts(bucket, clock, 5)
+    assert starts[:3] == [1000.0] * 3
+    assert starts[3:] == pytest.approx([1000.5, 1001.0])
+
+
+def test_window_caps_requests_per_window(clock):
+    bucket = TokenBucket(rate=20 / 60, capacity=20, window=61)
+    assert busiest_window(request_starts(bucket, clock, 100), 60) <= 20
+
+
+def test_bucket_alone_lets_burst_and_refill_add_up(clock):
+    bucket = TokenBucket(rate=20 / 60, capacity=20)
+    assert busiest_window(request_starts(bucket, clock, 100), 60) > 20
+
+
+def test_starts_never_go_backwards_after_a_rate_increase(clock):
+    bucket = TokenBucket(rate=1, capacity=2, window=10)
+    request_starts(bucket, clock, 5)
+    bucket.set_rate(100)
+    starts = request_starts(bucket, clock, 5)
+    assert starts == sorted(starts)
+
+
+def test_429_pauses_and_halves_the_rate_then_recovers(clock):
+    bucket = TokenBucket(rate=1, capacity=5)
+    controller = AdaptiveRateController(bucket)
+
+    controller.observe(429, {"Retry-After": "7"})
+    assert bucket.rate == 0.5
+    assert bucket.reserve() == pytest.approx(7)
+    assert controller.retry_delay(0, 429, {"Retry-After": "7"}) == 0.0
+
+    for _ in range(10):
+        controller.observe(200, {})
+    assert bucket.rate == 1
+
+
+def test_exhausted_window_pauses_until_reset(clock):
+    bucket = TokenBucket(rate=1, capacity=5)
+    AdaptiveRateController(bucket).observe(200, {"RateLimit-Remaining": "0", "RateLimit-Reset": "12"})
+    assert bucket.reserve() >= 12
+
+
+def test_retry_delay():
+    controller = AdaptiveRateController(TokenBucket(rate=1, capacity=5), max_attempts=3, base_delay=2, max_delay=5)
+
+    assert controller.retry_delay(0, 404) is None
+    assert controller.retry_delay(2, 503) is None
+    assert controller.retry_delay(0, 503, {"Retry-After": "4"}) == 4
+    for attempt in range(2):
+        assert 0 <= controller.retry_delay(attempt, None) <= min(5, 2 * 2 ** attempt)
+
+
+def test_header_parsing():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+    assert parse_retry_after("soon") is None
+    assert parse_reset("15") == 15
+    assert parse_reset(str(time.time() + 20)) == pytest.approx(20, abs=1)
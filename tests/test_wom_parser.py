@@ -0,0 +1,211 @@
+import copy
+import json
+import os
+import random
+import shutil
+
+import pytest
+
+from HuntMetrics import HuntMetrics
+from HuntStats import HuntStats
+from PlayerNameIndex import normalize_name
+from parsers.WOM.WOMColumnarStore import WOMColumnarStore
+from parsers.WOM.WOMDataParser import WOMDataParser
+from parsers.WOM.WOMDataRetriever import WOMDataRetriever
+from parsers.WOM.WOMGains import compact_record
+from parsers.WOM.WOMMetrics import GAINED_FIELD, HUNT_METRICS
+from legacy import LegacyWOMDataParser, legacy_team_most_killed_boss, load_json_data
+
+HUNT_WINDOW = {"startsAt": "2025-08-01T12:00:00.000Z", "endsAt": "2025-08-17T12:00:00.000Z"}
+
+
+def legacy_output(hunt_dir) -> dict:
+    """
+    The legacy parser's output, plus the one intended difference: EHB is matched on the
+    normalized name, so competition displayNames cased differently from the sheet
+    now get their EHB too.
+    """
+    competition = load_json_data(hunt_dir / "competition.json")
+    hunt_metrics = load_json_data(hunt_dir / "hunt_metrics.json")
+    output = LegacyWOMDataParser(str(hunt_dir / "players"), competition, hunt_metrics).run()
+
+    ehb = {normalize_name(p["player"]["displayName"]): p["progress"]["gained"] for p in competition["participations"]}
+    for team in output.values():
+        for player_name, player in team["players"].items():
+            if normalize_name(player_name) in ehb:
+                player.setdefault("wom", {}).setdefault("ehb", ehb[normalize_name(player_name)])
+    return output
+
+
+def without_new_keys(output: dict) -> dict:
+    """Drop what the legacy parser never produced: wom.categories (gwd, wildy and slayer bosses)."""
+    for team in output.values():
+        for player in team["players"].values():
+            player.get("wom", {}).pop("categories", None)
+    return output
+
+
+def parse(hunt_dir) -> dict:
+    WOMDataParser(hunt_edition="test").run()
+    return without_new_keys(load_json_data(hunt_dir / "hunt_metrics.json"))
+
+
+def random_gains(rng: random.Random, template: dict) -> dict:
+    """A WOM payload shaped like `template` with random gains, including ties and all-zero players."""
+    scale = rng.choice([0, 1, 5, 500])
+    data = {
+        "bosses": {name: {"metric": name, "kills": {"gained": rng.randint(0, scale)}} for name in template["bosses"]},
+        "activities": {name: {"metric": name, "score": {"gained": rng.randint(0, scale)}} for name in template["activities"]},
+        "skills": {name: {"metric": name, "experience": {"gained": rng.randint(0, scale * 1000)}} for name in template["skills"]},
+    }
+    return {**HUNT_WINDOW, "data": data}
+
+
+def to_metric_layout(hunt_dir) -> None:
+    """Replace players/ with the metrics/ files run_bulk would save for the same gains."""
+    players = {path.stem: load_json_data(path) for path in hunt_dir.joinpath("players").glob("*.json")}
+    retriever = WOMDataRetriever(comp_id="1", hunt_edition="test")
+    retriever.metrics_dir = str(hunt_dir / "metrics")
+
+    for metric_type, metrics in HUNT_METRICS.items():
+        field = GAINED_FIELD[metric_type]
+        for metric in metrics:
+            retriever.save_metric_gains(metric_type, metric, {**HUNT_WINDOW, "participations": [
+                {"player": {"displayName": name}, "progress": {"gained": data["data"][metric_type][metric][field]["gained"]}}
+                for name, data in players.items()
+            ]})
+    shutil.rmtree(hunt_dir / "players")
+
+
+def to_compact_layout(hunt_dir) -> None:
+    """Rewrite every player file as the compact record WOMDataRetriever(compact=True) saves."""
+    for path in hunt_dir.joinpath("players").glob("*.json"):
+        path.write_text(json.dumps(compact_record(load_json_data(path))), encoding="utf-8")
+
+
+def sheet_player(rng: random.Random, drops: int) -> dict:
+    """A player as the GDoc stage writes them to hunt_metrics.json."""
+    return {
+        "total_drops": drops,
+        "total_points": f"{rng.randint(0, 20000) / 2:,.1f}",
+        "total_coins": f"{rng.randint(0, 10 ** 9):,.0f}",
+        "boss_pets": rng.randint(0, 2),
+        "jars": rng.randint(0, 1),
+        "mega_rares": rng.randint(0, 1),
+        "most_expensive_drop": {"item": "Ultor vestige", "value": "116,084,434"},
+        "most_points_item": {"item": "Virtus mask", "points": "380.0"},
+    }
+
+
+@pytest.fixture
+def random_hunt(hunt_14):
+    """Hunt-14's layout with random players: some without WOM data, some without EHB, some untracked."""
+    rng = random.Random(14)
+    template = load_json_data(next(hunt_14.joinpath("players").glob("*.json")))["data"]
+    for path in hunt_14.joinpath("players").glob("*.json"):
+        path.unlink()
+
+    teams = {team: {"team_totals": {"total_drops": 0, "total_points": "0.0", "total_coins": "0"}, "players": {}}
+             for team in ("Team Red", "Team Gold")}
+    participations = []
+    for i in range(60):
+        name = f"player {i}"
+        if i % 10:
+            teams["Team Red" if i % 2 else "Team Gold"]["players"][name] = sheet_player(rng, i)
+        if i % 7:
+            with open(hunt_14 / "players" / f"{name}.json", "w", encoding="utf-8") as f:
+                json.dump(random_gains(rng, template), f)
+        if i % 5:
+            participations.append({"player": {"displayName": name}, "progress": {"gained": rng.random() * 50}})
+
+    with open(hunt_14 / "hunt_metrics.json", "w", encoding="utf-8") as f:
+        json.dump(teams, f)
+    with open(hunt_14 / "competition.json", "w", encoding="utf-8") as f:
+        json.dump({"participations": participations}, f)
+    return hunt_14
+
+
+def test_parse_matches_legacy_on_hunt_14(hunt_14):
+    expected = legacy_output(hunt_14)
+    assert parse(hunt_14) == expected
+
+
+def test_parse_matches_legacy_on_random_players(random_hunt):
+    expected = legacy_output(random_hunt)
+    assert parse(random_hunt) == expected
+
+
+@pytest.mark.parametrize("hunt", ["hunt_14", "random_hunt"])
+def test_metric_layout_parses_the_same_as_player_files(hunt, request):
+    hunt_dir = request.getfixturevalue(hunt)
+    expected = legacy_output(hunt_dir)
+    to_metric_layout(hunt_dir)
+    assert parse(hunt_dir) == expected
+
+
+@pytest.mark.parametrize("hunt", ["hunt_14", "random_hunt"])
+def test_compact_files_parse_the_same_as_full_payloads(hunt, request):
+    hunt_dir = request.getfixturevalue(hunt)
+    expected = legacy_output(hunt_dir)
+    to_compact_layout(hunt_dir)
+    assert parse(hunt_dir) == expected
+
+
+@pytest.mark.parametrize("hunt", ["hunt_14", "random_hunt"])
+def test_columnar_snapshot_parses_the_same_as_player_files(hunt, request):
+    hunt_dir = request.getfixturevalue(hunt)
+    expected = legacy_output(hunt_dir)
+    WOMColumnarStore.from_players_dir(str(hunt_dir / "players")).save(str(hunt_dir / "columnar"))
+    assert parse(hunt_dir) == expected
+
+
+def test_stale_columnar_snapshot_falls_back_to_player_files(random_hunt):
+    WOMColumnarStore.from_players_dir(str(random_hunt / "players")).save(str(random_hunt / "columnar"))
+
+    # A refetch after the snapshot was written
+    player_fp = random_hunt / "players" / "player 1.json"
+    gains = load_json_data(player_fp)
+    gains["data"]["bosses"]["zulrah"]["kills"]["gained"] += 1000
+    player_fp.write_text(json.dumps(gains), encoding="utf-8")
+    snapshot_time = os.stat(random_hunt / "columnar" / "players.npy").st_mtime
+    os.utime(player_fp, (snapshot_time + 10, snapshot_time + 10))
+
+    expected = legacy_output(random_hunt)
+    assert expected["Team Red"]["players"]["player 1"]["wom"]["most_killed_boss"]["boss"] == "zulrah"
+    assert parse(random_hunt) == expected
+
+
+@pytest.mark.parametrize("hunt", ["hunt_14", "random_hunt"])
+def test_team_most_killed_boss_matches_legacy(hunt, request):
+    hunt_dir = request.getfixturevalue(hunt)
+    metrics = load_json_data(hunt_dir / "hunt_metrics.json")
+    for team in metrics.values():
+        team["team_totals"].pop("most_killed_boss", None)
+    expected = legacy_team_most_killed_boss(copy.deepcopy(metrics), str(hunt_dir / "players"))
+
+    stats = HuntStats(hunt_edition="test", gdoc_sheet_id="", wom_comp_id="")
+    stats.data = HuntMetrics.from_json(metrics)
+    store = WOMColumnarStore.from_players_dir(str(hunt_dir / "players"))
+    stats.name_index.add_file_keys(store.players.tolist())
+    stats.calculate_team_most_killed_boss(store)
+
+    assert stats.data.to_json() == expected
+
+
+def test_in_memory_run_returns_the_output_without_writing(hunt_14):
+    expected = legacy_output(hunt_14)
+    before = (hunt_14 / "hunt_metrics.json").read_bytes()
+
+    assert without_new_keys(WOMDataParser(hunt_edition="test").run(save=False).to_json()) == expected
+    assert (hunt_14 / "hunt_metrics.json").read_bytes() == before
+
+
+def test_categories_total_the_listed_metrics(random_hunt):
+    output = WOMDataParser(hunt_edition="test").run(save=False)
+    player = output.teams["Team Red"].players["player 1"]
+    bosses = load_json_data(random_hunt / "players" / "player 1.json")["data"]["bosses"]
+    kills = {name: info["kills"]["gained"] for name, info in bosses.items()}
+
+    assert player.wom.categories["gwd"]["bandos"] == kills["general_graardor"]
+    assert player.wom.categories["wildy_bosses"]["callisto"] == kills["callisto"] + kills["artio"]
+    assert player.wom.raids == sum(kills[boss] for boss in kills if boss.startswith(("chambers", "theatre", "tombs")))
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from fakes import FakeWOM
+from parsers.WOM import WOMDataRetriever as retriever_module
+from parsers.WOM.RateLimiter import AdaptiveRateController, TokenBucket
+from parsers.WOM.WOMDataRetriever import WOMDataRetriever
+
+PLAYERS = ["Alpha", "Bravo", "Charlie", "Delta", "Echo"]
+
+
+WINDOW = {"startsAt": "2025-01-01T00:00:00.000Z", "endsAt": "2025-01-08T00:00:00.000Z"}
+
+
+def competition() -> dict:
+    return {
+        "id": 1,
+        **WINDOW,
+        "participations": [
+            {"player": {"displayName": name}, "progress": {"gained": i}} for i, name in enumerate(PLAYERS)
+        ],
+    }
+
+
+def gains(name: str) -> dict:
+    skills = {"overall": {"metric": "overall", "experience": {"gained": len(name) * 1000}}}
+    return {**WINDOW, "data": {"skills": skills, "bosses": {}, "activities": {}}}
+
+
+@pytest.fixture
+def wom(workdir, monkeypatch):
+    # No pacing or backoff in tests; the limiter has its own tests
+    bucket = TokenBucket(rate=1000, capacity=1000)
+    monkeypatch.setattr(retriever_module, "rate_limiter", bucket)
+    monkeypatch.setattr(retriever_module, "rate_controller", AdaptiveRateController(bucket, base_delay=0))
+    return FakeWOM(competition(), {name: gains(name) for name in PLAYERS}).install(monkeypatch, retriever_module)
+
+
+def saved_players(workdir) -> dict[str, dict]:
+    players_dir = workdir / "data" / "Hunt-test" / "players"
+    return {path.stem: json.loads(path.read_text()) for path in players_dir.glob("*.json")}
+
+
+def test_run_saves_competition_and_every_player(wom, workdir):
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run()
+
+    assert json.loads((workdir / "data" / "Hunt-test" / "competition.json").read_text()) == competition()
+    assert saved_players(workdir) == {name: gains(name) for name in PLAYERS}
+
+
+def test_run_async_saves_the_same_files_as_run(wom, workdir):
+    asyncio.run(WOMDataRetriever(comp_id="1", hunt_edition="test").run_async(max_concurrency=3))
+
+    assert saved_players(workdir) == {name: gains(name) for name in PLAYERS}
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_transient_failures_are_retried(wom, workdir, use_async):
+    wom.failures = {"/players/Bravo/": [429, 503], "/players/Delta/": [502]}
+    retriever = WOMDataRetriever(comp_id="1", hunt_edition="test")
+
+    if use_async:
+        asyncio.run(retriever.run_async())
+    else:
+        retriever.run()
+
+    assert saved_players(workdir) == {name: gains(name) for name in PLAYERS}
+    assert sum("/players/Bravo/" in url for url in wom.urls) == 3
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_permanent_failures_are_reported_not_retried(wom, workdir, use_async):
+    del wom.gains["Charlie"]
+    retriever = WOMDataRetriever(comp_id="1", hunt_edition="test")
+
+    if use_async:
+        asyncio.run(retriever.run_async())
+    else:
+        retriever.run()
+
+    assert set(saved_players(workdir)) == set(PLAYERS) - {"Charlie"}
+    assert sum("/players/Charlie/" in url for url in wom.urls) == 1
+    failed = json.loads((workdir / "data" / "Hunt-test" / "failed_players.json").read_text())
+    assert list(failed) == ["Charlie"]
+
+
+def test_requests_carry_a_timeout(wom, workdir):
+    retriever = WOMDataRetriever(comp_id="1", hunt_edition="test")
+    retriever.run()
+    asyncio.run(retriever.run_async())
+
+    assert wom.timeouts[0] == retriever_module.REQUEST_TIMEOUT_SECONDS
+    assert isinstance(wom.timeouts[-1], aiohttp.ClientTimeout)
+    assert None not in wom.timeouts
+
+
+def player_requests(wom: FakeWOM) -> list[str]:
+    return [url.split("/players/")[1].split("/")[0] for url in wom.urls if "/players/" in url]
+
+
+def test_rerun_only_fetches_players_missing_from_the_manifest(wom, workdir):
+    wom.failures = {"/players/Charlie/": [404]}
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run()
+    wom.urls.clear()
+
+    asyncio.run(WOMDataRetriever(comp_id="1", hunt_edition="test").run_async())
+
+    assert player_requests(wom) == ["Charlie"]
+    manifest = json.loads((workdir / "data" / "Hunt-test" / "manifest.json").read_text())
+    assert set(manifest["players"]) == set(PLAYERS)
+
+
+def test_a_new_window_refetches_everyone(wom, workdir):
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run()
+    wom.urls.clear()
+    wom.competition["endsAt"] = "2025-01-15T00:00:00.000Z"
+
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run()
+
+    assert sorted(player_requests(wom)) == PLAYERS
+
+
+def test_progress_refresh_only_refetches_changed_players(wom, workdir):
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run()
+    wom.urls.clear()
+    wom.competition["participations"][1]["progress"] = {"gained": 99}
+
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run(refresh="missing")
+    assert player_requests(wom) == []
+
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run(refresh="progress")
+    assert player_requests(wom) == ["Bravo"]
+
+    wom.urls.clear()
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run(refresh="all")
+    assert sorted(player_requests(wom)) == PLAYERS
+
+
+def test_stale_refresh_refetches_snapshots_wom_has_updated_since(wom, workdir):
+    wom.competition["endsAt"] = "2999-01-01T00:00:00.000Z"
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run()
+    wom.urls.clear()
+    wom.competition["participations"][3]["updatedAt"] = "2998-01-01T00:00:00.000Z"
+    wom.competition["participations"][4]["updatedAt"] = "2000-01-01T00:00:00.000Z"
+
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run(refresh="stale")
+
+    assert player_requests(wom) == ["Delta"]
+
+
+def test_unknown_refresh_mode_is_rejected(wom):
+    with pytest.raises(ValueError):
+        WOMDataRetriever(comp_id="1", hunt_edition="test").select_participants(competition(), "sometimes")
+
+
+def test_run_bulk_saves_one_file_per_metric(wom, workdir):
+    wom.metric_gains = {"overall": {"Alpha": 5000, "Echo": 7}, "zulrah": {"Bravo": 3}}
+
+    WOMDataRetriever(comp_id="1", hunt_edition="test").run_bulk({"skills": ["overall"], "bosses": ["zulrah"]})
+
+    metrics_dir = workdir / "data" / "Hunt-test" / "metrics"
+    overall = json.loads((metrics_dir / "overall.json").read_text())
+    assert overall["type"] == "skills"
+    assert overall["gained"] == {"Alpha": 5000, "Bravo": 0, "Charlie": 0, "Delta": 0, "Echo": 7}
+    assert json.loads((metrics_dir / "zulrah.json").read_text())["gained"]["Bravo"] == 3
+    assert player_requests(wom) == []
+
+
+def test_compact_run_saves_projected_gains_and_raw_payloads(wom, workdir):
+    WOMDataRetriever(comp_id="1", hunt_edition="test", compact=True, keep_raw=True).run()
+
+    hunt_dir = workdir / "data" / "Hunt-test"
+    alpha = json.loads((hunt_dir / "players" / "Alpha.json").read_text())
+    assert alpha == {**WINDOW, "gains": {"skills": {"overall": 5000}, "bosses": {}, "activities": {}}}
+    assert json.loads((hunt_dir / "raw" / "Alpha.json").read_text()) == gains("Alpha")